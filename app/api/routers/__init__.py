@@ -2,11 +2,14 @@
 
 from fastapi import APIRouter
 
-from . import health, measurement_results
+from . import health, measurement_queries, measurement_results, metrics, trends
 
 
 router = APIRouter()
 router.include_router(health.router)
 router.include_router(measurement_results.router)
+router.include_router(measurement_queries.router)
+router.include_router(trends.router)
+router.include_router(metrics.router)
 
 __all__ = ["router"]
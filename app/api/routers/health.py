@@ -1,11 +1,36 @@
 """Health check route."""
 
+from typing import Any
+
 from fastapi import APIRouter
 
+from ...core import JSONRoute, dimension_cache, engine, file_locks, pool_stats, read_engine
+
 
-router = APIRouter(tags=["health"])
+router = APIRouter(tags=["health"], route_class=JSONRoute)
 
 
 @router.get("/health")
 async def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/dimension-cache")
+async def dimension_cache_stats() -> dict[str, Any]:
+    """Report hit/miss counters of the shared dimension cache."""
+
+    return dimension_cache.stats()
+
+
+@router.get("/health/locks")
+async def file_lock_stats() -> dict[str, Any]:
+    """Report acquisition and wait-time counters of the file ingestion locks."""
+
+    return file_locks.stats()
+
+
+@router.get("/health/db-pool")
+async def db_pool_stats() -> dict[str, Any]:
+    """Report checkout latency and saturation of the ingest and read pools."""
+
+    return {"ingest": pool_stats(engine), "read": pool_stats(read_engine)}
@@ -0,0 +1,706 @@
+"""Read endpoints for stored measurement data."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import csv
+import io
+import math
+import sys
+from array import array
+from collections import namedtuple
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Float, Row, Select, func, select, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core import (
+    JSONRoute,
+    ReadSessionMaker,
+    RawBlobColumns,
+    decode_raw_blob,
+    get_read_session,
+    json_dumps_line,
+    settings,
+)
+from ...models import (
+    FileItemSummary,
+    FileStatus,
+    FileSummary,
+    MeasurementDirectory,
+    MeasurementDirectoryClosure,
+    MeasurementFile,
+    MeasurementItem,
+    MeasurementMetricType,
+    MeasurementModule,
+    MeasurementNode,
+    MeasurementVersion,
+    RawMeasurementBlob,
+    RawMeasurementRecord,
+    RawStorage,
+)
+from ...schemas import (
+    FileItemSummaryRead,
+    FileOverviewPage,
+    FileOverviewRead,
+    MeasurementFileListItem,
+    MeasurementFilePage,
+    RawMeasurementPage,
+    RawMeasurementPoint,
+)
+
+
+router = APIRouter(prefix="/measurement-results", tags=["measurement-results"], route_class=JSONRoute)
+
+RawKey = tuple[int, int, int]
+
+
+def _as_float(column: Any) -> Any:
+    # MySQL DOUBLE columns come back as Decimal unless asdecimal=False; blob
+    # reads yield floats, so both storage modes render identically.
+    return type_coerce(column, Float(asdecimal=False)).label(column.key)
+
+
+_RAW_POINT_COLUMNS = (
+    RawMeasurementRecord.item_id,
+    MeasurementItem.class_name,
+    MeasurementItem.measure_item_key,
+    MeasurementMetricType.name.label("metric_name"),
+    MeasurementMetricType.unit.label("metric_unit"),
+    RawMeasurementRecord.measurable,
+    RawMeasurementRecord.x_index,
+    RawMeasurementRecord.y_index,
+    _as_float(RawMeasurementRecord.x_0),
+    _as_float(RawMeasurementRecord.y_0),
+    _as_float(RawMeasurementRecord.x_1),
+    _as_float(RawMeasurementRecord.y_1),
+    _as_float(RawMeasurementRecord.value),
+)
+_RAW_POINT_FIELDS = [column.key for column in _RAW_POINT_COLUMNS]
+
+# Points decoded from raw_measurement_blobs, shaped like rows of _RAW_POINT_COLUMNS.
+RawPoint = namedtuple("RawPoint", _RAW_POINT_FIELDS)
+
+_RAW_BLOB_COLUMNS = (
+    RawMeasurementBlob.item_id,
+    MeasurementItem.class_name,
+    MeasurementItem.measure_item_key,
+    MeasurementMetricType.name.label("metric_name"),
+    MeasurementMetricType.unit.label("metric_unit"),
+    RawMeasurementBlob.codec,
+    RawMeasurementBlob.point_count,
+    RawMeasurementBlob.payload,
+)
+# Blobs can be large; fetch a few per round trip when streaming.
+_BLOB_FETCH_SIZE = 8
+
+# Same column order as uk_raw_file_item_xy, so pages are index range scans.
+_RAW_KEY_COLUMNS = (
+    RawMeasurementRecord.item_id,
+    RawMeasurementRecord.x_index,
+    RawMeasurementRecord.y_index,
+)
+
+
+def _encode_cursor(*parts: object) -> str:
+    text = "|".join(part.isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> tuple[Any, ...]:
+    """Decode an opaque keyset cursor, parsing each part with its ``parsers`` entry."""
+
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        parts = decoded.split("|")
+        if len(parts) != len(parsers):
+            raise ValueError(cursor)
+        return tuple(parse(part) for parse, part in zip(parsers, parts))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+@dataclass(slots=True)
+class RawPointFilter:
+    """Point-level filters of the raw read API."""
+
+    measurable: bool | None = None
+    min_value: float | None = None
+    max_value: float | None = None
+    after: RawKey | None = None
+
+    def apply_blobs(self, blobs: Sequence[Row[Any]]) -> Iterator[RawPoint]:
+        """Decode blob rows and yield the points that pass, in key order."""
+
+        for blob in blobs:
+            prefix = (blob.item_id, blob.class_name, blob.measure_item_key, blob.metric_name, blob.metric_unit)
+            columns = decode_raw_blob(blob.payload, blob.codec, blob.point_count)
+            for point in columns.points():
+                is_measurable, x_index, y_index = point[:3]
+                value = point[-1]
+                if self.after is not None and (blob.item_id, x_index, y_index) <= self.after:
+                    continue
+                if self.measurable is not None and is_measurable != self.measurable:
+                    continue
+                if self.min_value is not None and value < self.min_value:
+                    continue
+                if self.max_value is not None and value > self.max_value:
+                    continue
+                yield RawPoint(*prefix, *point)
+
+
+def _filter_items(
+    stmt: Select[Any],
+    item_column: Any,
+    *,
+    item_ids: Sequence[int] | None,
+    class_name: str | None,
+    measure_item_key: str | None,
+    metric: str | None,
+) -> Select[Any]:
+    stmt = stmt.join(MeasurementItem, MeasurementItem.id == item_column).join(
+        MeasurementMetricType, MeasurementMetricType.id == MeasurementItem.metric_type_id
+    )
+    if item_ids:
+        stmt = stmt.where(item_column.in_(item_ids))
+    if class_name is not None:
+        stmt = stmt.where(MeasurementItem.class_name == class_name)
+    if measure_item_key is not None:
+        stmt = stmt.where(MeasurementItem.measure_item_key == measure_item_key)
+    if metric is not None:
+        stmt = stmt.where(MeasurementMetricType.name == metric)
+    return stmt
+
+
+def _build_raw_query(
+    file_id: int,
+    post_date: date,
+    points: RawPointFilter,
+    **item_filters: Any,
+) -> Select[Any]:
+    stmt = _filter_items(
+        select(*_RAW_POINT_COLUMNS), RawMeasurementRecord.item_id, **item_filters
+    ).where(
+        RawMeasurementRecord.file_id == file_id,
+        RawMeasurementRecord.post_date == post_date,
+    )
+    if points.measurable is not None:
+        stmt = stmt.where(RawMeasurementRecord.measurable.is_(points.measurable))
+    if points.min_value is not None:
+        stmt = stmt.where(RawMeasurementRecord.value >= points.min_value)
+    if points.max_value is not None:
+        stmt = stmt.where(RawMeasurementRecord.value <= points.max_value)
+    if points.after is not None:
+        stmt = stmt.where(tuple_(*_RAW_KEY_COLUMNS) > tuple_(*points.after))
+    return stmt.order_by(*_RAW_KEY_COLUMNS)
+
+
+def _build_raw_blob_query(file_id: int, points: RawPointFilter, **item_filters: Any) -> Select[Any]:
+    """Select the file's blobs whose metadata can contain a matching point."""
+
+    stmt = _filter_items(
+        select(*_RAW_BLOB_COLUMNS), RawMeasurementBlob.item_id, **item_filters
+    ).where(RawMeasurementBlob.file_id == file_id)
+    if points.measurable is True:
+        stmt = stmt.where(RawMeasurementBlob.measurable_count > 0)
+    elif points.measurable is False:
+        stmt = stmt.where(RawMeasurementBlob.measurable_count < RawMeasurementBlob.point_count)
+    if points.min_value is not None:
+        stmt = stmt.where(RawMeasurementBlob.value_max >= points.min_value)
+    if points.max_value is not None:
+        stmt = stmt.where(RawMeasurementBlob.value_min <= points.max_value)
+    if points.after is not None:
+        stmt = stmt.where(RawMeasurementBlob.item_id >= points.after[0])
+    return stmt.order_by(RawMeasurementBlob.item_id)
+
+
+async def _load_raw_location(session: AsyncSession, file_id: int) -> tuple[date, RawStorage]:
+    """Return where the file's raw points live: its post_date partition and storage mode."""
+
+    found = await session.execute(
+        select(MeasurementFile.post_date, MeasurementFile.raw_storage).where(
+            MeasurementFile.id == file_id
+        )
+    )
+    location = found.one_or_none()
+    if location is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Measurement file not found")
+    return location.post_date, location.raw_storage
+
+
+def _format_ndjson(rows: Sequence[Any]) -> str:
+    return b"".join(json_dumps_line(dict(zip(_RAW_POINT_FIELDS, row))) for row in rows).decode()
+
+
+def _format_csv(rows: Sequence[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+async def _stream_raw_points(
+    stmt: Select[Any],
+    output: Literal["ndjson", "csv"],
+    blob_points: RawPointFilter | None = None,
+) -> AsyncIterator[str]:
+    # Dependencies are torn down before a StreamingResponse body is sent, so
+    # the generator owns its session; session.stream uses a server-side cursor.
+    formatter = _format_ndjson if output == "ndjson" else _format_csv
+    chunk_size = max(settings.raw_read_chunk_size, 1)
+    if output == "csv":
+        yield _format_csv([_RAW_POINT_FIELDS])
+    async with ReadSessionMaker() as session:
+        result = await session.stream(stmt)
+        if blob_points is None:
+            async for rows in result.partitions(chunk_size):
+                yield formatter(rows)
+            return
+        async for blobs in result.partitions(_BLOB_FETCH_SIZE):
+            points = blob_points.apply_blobs(blobs)
+            while chunk := list(islice(points, chunk_size)):
+                yield formatter(chunk)
+
+
+_RAW_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get(
+    "/{file_id}/raw",
+    response_model=RawMeasurementPage,
+    responses={200: {"content": {media: {} for media in _RAW_MEDIA_TYPES.values()}}},
+)
+async def read_raw_measurements(
+    file_id: int,
+    item_id: list[int] | None = Query(None),
+    class_name: str | None = None,
+    measure_item_key: str | None = None,
+    metric: str | None = Query(None, description="Metric type name."),
+    measurable: bool | None = None,
+    min_value: float | None = Query(None, description="Keep points with `value >= min_value`."),
+    max_value: float | None = Query(None, description="Keep points with `value <= max_value`."),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page."),
+    limit: int = Query(1000, ge=1, le=10000, description="Page size for `format=json`."),
+    output: Literal["json", "ndjson", "csv"] = Query(
+        "json",
+        alias="format",
+        description="`ndjson`/`csv` stream every remaining row instead of one page.",
+    ),
+    session: AsyncSession = Depends(get_read_session),
+) -> RawMeasurementPage | StreamingResponse:
+    """Return raw points of one file ordered by (item_id, x_index, y_index).
+
+    Files stored as per-item blobs are decoded on the fly; the response is
+    the same either way.
+    """
+
+    points = RawPointFilter(
+        measurable=measurable,
+        min_value=min_value,
+        max_value=max_value,
+        after=_decode_cursor(cursor, int, int, int) if cursor else None,
+    )
+    item_filters = dict(
+        item_ids=item_id, class_name=class_name, measure_item_key=measure_item_key, metric=metric
+    )
+    post_date, raw_storage = await _load_raw_location(session, file_id)
+    is_blob = raw_storage is RawStorage.BLOB
+    if is_blob:
+        stmt = _build_raw_blob_query(file_id, points, **item_filters)
+    else:
+        stmt = _build_raw_query(file_id, post_date, points, **item_filters)
+
+    if output != "json":
+        return StreamingResponse(
+            _stream_raw_points(stmt, output, points if is_blob else None),
+            media_type=_RAW_MEDIA_TYPES[output],
+        )
+
+    if is_blob:
+        rows: list[Any] = []
+        result = await session.stream(stmt)
+        async for blobs in result.partitions(_BLOB_FETCH_SIZE):
+            rows.extend(islice(points.apply_blobs(blobs), limit + 1 - len(rows)))
+            if len(rows) > limit:
+                break
+        await result.close()
+    else:
+        rows = (await session.execute(stmt.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(last.item_id, last.x_index, last.y_index)
+    return RawMeasurementPage(
+        file_id=file_id,
+        items=[RawMeasurementPoint.model_validate(row._asdict()) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+
+def _npy_header(shape: tuple[int, ...]) -> bytes:
+    """NPY format 1.0 header for a C-ordered little-endian float64 array."""
+
+    header = f"{{'descr': '<f8', 'fortran_order': False, 'shape': {shape}, }}"
+    # Magic (6) + version (2) + length (2) + header + newline, padded to 64 bytes.
+    padding = -(10 + len(header) + 1) % 64
+    header_bytes = (header + " " * padding + "\n").encode("latin1")
+    return b"\x93NUMPY\x01\x00" + len(header_bytes).to_bytes(2, "little") + header_bytes
+
+
+_GRID_MEDIA_TYPES = {"raw": "application/octet-stream", "npy": "application/x-npy"}
+
+
+def _grid_shape(x_min: int, x_max: int, y_min: int, y_max: int, step: int) -> tuple[int, int]:
+    width = (x_max - x_min) // step + 1
+    height = (y_max - y_min) // step + 1
+    if width * height > settings.grid_max_cells:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Grid of {height}x{width} cells exceeds {settings.grid_max_cells}; use a larger step",
+        )
+    return height, width
+
+
+_NO_RAW_FOR_ITEM = "No raw measurements for this item"
+
+GridResult = tuple[array, tuple[int, int], tuple[int, int]]
+
+
+async def _row_grid(
+    session: AsyncSession, file_id: int, post_date: date, item_id: int, step: int
+) -> GridResult:
+    scope = (
+        RawMeasurementRecord.file_id == file_id,
+        RawMeasurementRecord.post_date == post_date,
+        RawMeasurementRecord.item_id == item_id,
+    )
+    bounds = (
+        await session.execute(
+            select(
+                func.min(RawMeasurementRecord.x_index),
+                func.max(RawMeasurementRecord.x_index),
+                func.min(RawMeasurementRecord.y_index),
+                func.max(RawMeasurementRecord.y_index),
+            ).where(*scope)
+        )
+    ).one()
+    x_min, x_max, y_min, y_max = bounds
+    if x_min is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_NO_RAW_FOR_ITEM)
+    height, width = _grid_shape(x_min, x_max, y_min, y_max, step)
+
+    x_offset = RawMeasurementRecord.x_index - x_min
+    y_offset = RawMeasurementRecord.y_index - y_min
+    # The flat cell index is computed in SQL so each fetched row is a bare
+    # (int, float) pair written straight into the buffer.
+    stmt = select(
+        (y_offset // step) * width + x_offset // step,
+        type_coerce(RawMeasurementRecord.value, Float(asdecimal=False)),
+    ).where(*scope, RawMeasurementRecord.measurable.is_(True))
+    if step > 1:
+        stmt = stmt.where(x_offset % step == 0, y_offset % step == 0)
+
+    grid = array("d", [math.nan]) * (width * height)
+    result = await session.stream(stmt)
+    async for rows in result.partitions(max(settings.raw_read_chunk_size, 1)):
+        for index, value in rows:
+            grid[index] = value
+    return grid, (x_min, y_min), (height, width)
+
+
+async def _blob_grid(session: AsyncSession, file_id: int, item_id: int, step: int) -> GridResult:
+    found = await session.execute(
+        select(RawMeasurementBlob.codec, RawMeasurementBlob.point_count, RawMeasurementBlob.payload).where(
+            RawMeasurementBlob.file_id == file_id, RawMeasurementBlob.item_id == item_id
+        )
+    )
+    blob = found.one_or_none()
+    if blob is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_NO_RAW_FOR_ITEM)
+    columns: RawBlobColumns = decode_raw_blob(blob.payload, blob.codec, blob.point_count)
+    x_min, x_max = min(columns.x_index), max(columns.x_index)
+    y_min, y_max = min(columns.y_index), max(columns.y_index)
+    height, width = _grid_shape(x_min, x_max, y_min, y_max, step)
+
+    grid = array("d", [math.nan]) * (width * height)
+    for measurable, x_index, y_index, value in zip(
+        columns.measurable, columns.x_index, columns.y_index, columns.value
+    ):
+        x_offset = x_index - x_min
+        y_offset = y_index - y_min
+        if not measurable or x_offset % step or y_offset % step:
+            continue
+        grid[(y_offset // step) * width + x_offset // step] = value
+    return grid, (x_min, y_min), (height, width)
+
+
+@router.get(
+    "/{file_id}/items/{item_id}/grid",
+    response_class=Response,
+    responses={200: {"content": {media: {} for media in _GRID_MEDIA_TYPES.values()}}},
+)
+async def read_wafer_map_grid(
+    file_id: int,
+    item_id: int,
+    step: int = Query(1, ge=1, description="Keep every `step`-th cell on both axes."),
+    output: Literal["raw", "npy"] = Query(
+        "raw",
+        alias="format",
+        description="`raw` is a bare little-endian float64 buffer; `npy` adds a NumPy header.",
+    ),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    """Return one item's raw values as a dense (height, width) float64 grid.
+
+    Rows are ``y_index`` and columns ``x_index``, offset by the minimum index
+    on each axis. Missing and non-measurable cells are NaN.
+    """
+
+    post_date, raw_storage = await _load_raw_location(session, file_id)
+    if raw_storage is RawStorage.BLOB:
+        grid, (x_min, y_min), (height, width) = await _blob_grid(session, file_id, item_id, step)
+    else:
+        grid, (x_min, y_min), (height, width) = await _row_grid(
+            session, file_id, post_date, item_id, step
+        )
+    if sys.byteorder == "big":
+        grid.byteswap()
+
+    body = grid.tobytes()
+    headers = {
+        "X-Grid-Shape": f"{height},{width}",
+        "X-Grid-Origin": f"{x_min},{y_min}",
+        "X-Grid-Step": str(step),
+        "X-Grid-Dtype": "<f8",
+    }
+    if output == "npy":
+        body = _npy_header((height, width)) + body
+        headers["Content-Disposition"] = f'attachment; filename="file{file_id}_item{item_id}.npy"'
+    return Response(content=body, media_type=_GRID_MEDIA_TYPES[output], headers=headers)
+
+
+async def _load_item_summaries(
+    session: AsyncSession,
+    file_ids: list[int],
+) -> dict[int, list[FileItemSummaryRead]]:
+    result = await session.execute(
+        select(
+            FileItemSummary.file_id,
+            FileItemSummary.item_id,
+            MeasurementItem.class_name,
+            MeasurementItem.measure_item_key,
+            MeasurementMetricType.name.label("metric_name"),
+            FileItemSummary.raw_points,
+            FileItemSummary.measurable_points,
+            FileItemSummary.value_min,
+            FileItemSummary.value_max,
+            FileItemSummary.value_avg,
+            FileItemSummary.value_stddev,
+        )
+        .join(MeasurementItem, MeasurementItem.id == FileItemSummary.item_id)
+        .join(MeasurementMetricType, MeasurementMetricType.id == MeasurementItem.metric_type_id)
+        .where(FileItemSummary.file_id.in_(file_ids))
+        .order_by(FileItemSummary.file_id, FileItemSummary.item_id)
+    )
+    grouped: dict[int, list[FileItemSummaryRead]] = {file_id: [] for file_id in file_ids}
+    for row in result:
+        grouped[row.file_id].append(FileItemSummaryRead.model_validate(row._mapping))
+    return grouped
+
+
+@router.get("/overview", response_model=FileOverviewPage)
+async def read_file_overview(
+    node: str | None = None,
+    module: str | None = None,
+    version: str | None = None,
+    post_date_from: date | None = None,
+    post_date_to: date | None = None,
+    include_items: bool = Query(False, description="Attach per-item min/max/avg/stddev."),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page."),
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+) -> FileOverviewPage:
+    """Per-file totals from ``file_summaries``, newest ``post_time`` first."""
+
+    stmt = (
+        select(
+            MeasurementFile.id.label("file_id"),
+            MeasurementFile.file_name,
+            MeasurementFile.post_time,
+            MeasurementNode.name.label("node"),
+            MeasurementModule.name.label("module"),
+            MeasurementVersion.name.label("version"),
+            FileSummary.raw_points,
+            FileSummary.measurable_points,
+            FileSummary.item_count,
+            FileSummary.stat_sets,
+            FileSummary.value_min,
+            FileSummary.value_max,
+            FileSummary.value_avg,
+        )
+        .join(FileSummary, FileSummary.file_id == MeasurementFile.id)
+        .outerjoin(MeasurementNode, MeasurementNode.id == MeasurementFile.node_id)
+        .outerjoin(MeasurementModule, MeasurementModule.id == MeasurementFile.module_id)
+        .outerjoin(MeasurementVersion, MeasurementVersion.id == MeasurementFile.version_id)
+        .order_by(MeasurementFile.post_time.desc(), MeasurementFile.id.desc())
+        .limit(limit + 1)
+    )
+    if node is not None:
+        stmt = stmt.where(MeasurementNode.name == node)
+    if module is not None:
+        stmt = stmt.where(MeasurementModule.name == module)
+    if version is not None:
+        stmt = stmt.where(MeasurementVersion.name == version)
+    if post_date_from is not None:
+        stmt = stmt.where(MeasurementFile.post_date >= post_date_from)
+    if post_date_to is not None:
+        stmt = stmt.where(MeasurementFile.post_date <= post_date_to)
+    if cursor:
+        post_time, file_id = _decode_cursor(cursor, datetime.fromisoformat, int)
+        stmt = stmt.where(
+            tuple_(MeasurementFile.post_time, MeasurementFile.id) < tuple_(post_time, file_id)
+        )
+
+    rows = (await session.execute(stmt)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].post_time, rows[-1].file_id)
+    files = [FileOverviewRead.model_validate(row._mapping) for row in rows]
+    if include_items and files:
+        item_summaries = await _load_item_summaries(session, [entry.file_id for entry in files])
+        for entry in files:
+            entry.items = item_summaries[entry.file_id]
+    return FileOverviewPage(files=files, next_cursor=next_cursor)
+
+
+async def _resolve_directory(session: AsyncSession, path: str) -> int | None:
+    """Map a top-down ``a/b/c`` path to its directory id, one lookup per level."""
+
+    directory_id: int | None = None
+    for name in (segment for segment in path.strip("/").split("/") if segment):
+        parent_clause = (
+            MeasurementDirectory.parent_id.is_(None)
+            if directory_id is None
+            else MeasurementDirectory.parent_id == directory_id
+        )
+        directory_id = await session.scalar(
+            select(MeasurementDirectory.id).where(parent_clause, MeasurementDirectory.name == name)
+        )
+        if directory_id is None:
+            return None
+    return directory_id
+
+
+@router.get("/files", response_model=MeasurementFilePage)
+async def list_measurement_files(
+    node: str | None = None,
+    module: str | None = None,
+    version: str | None = None,
+    under_directory: str | None = Query(
+        None, description="Top-down directory prefix such as `line_a/img`; includes subdirectories."
+    ),
+    status_filter: Literal["OK", "FAIL"] | None = Query(None, alias="status"),
+    post_time_from: datetime | None = None,
+    post_time_to: datetime | None = Query(None, description="Exclusive upper bound."),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page."),
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+) -> MeasurementFilePage:
+    """Search ingested files, newest ``post_time`` first.
+
+    Dimension names are resolved to ids up front so every filter lands on one
+    of the ``(column, post_time)`` indexes of ``measurement_files``. The page of
+    ids is chosen from that index alone and only those rows are then fetched.
+    """
+
+    empty = MeasurementFilePage(files=[])
+    page = select(MeasurementFile.id, MeasurementFile.post_time)
+    for column, model, name in (
+        (MeasurementFile.node_id, MeasurementNode, node),
+        (MeasurementFile.module_id, MeasurementModule, module),
+        (MeasurementFile.version_id, MeasurementVersion, version),
+    ):
+        if name is None:
+            continue
+        dimension_id = await session.scalar(select(model.id).where(model.name == name))
+        if dimension_id is None:
+            return empty
+        page = page.where(column == dimension_id)
+    if under_directory is not None:
+        directory_id = await _resolve_directory(session, under_directory)
+        if directory_id is None:
+            return empty
+        page = page.join(
+            MeasurementDirectoryClosure,
+            MeasurementDirectoryClosure.descendant_id == MeasurementFile.directory_id,
+        ).where(MeasurementDirectoryClosure.ancestor_id == directory_id)
+    if status_filter is not None:
+        page = page.where(MeasurementFile.status == FileStatus[status_filter])
+    if post_time_from is not None:
+        page = page.where(MeasurementFile.post_time >= post_time_from)
+    if post_time_to is not None:
+        page = page.where(MeasurementFile.post_time < post_time_to)
+    if cursor:
+        post_time, file_id = _decode_cursor(cursor, datetime.fromisoformat, int)
+        page = page.where(
+            tuple_(MeasurementFile.post_time, MeasurementFile.id) < tuple_(post_time, file_id)
+        )
+    page = (
+        page.order_by(MeasurementFile.post_time.desc(), MeasurementFile.id.desc())
+        .limit(limit + 1)
+        .subquery("page")
+    )
+
+    stmt = (
+        select(
+            MeasurementFile,
+            MeasurementNode.name.label("node"),
+            MeasurementModule.name.label("module"),
+            MeasurementVersion.name.label("version"),
+        )
+        .join(page, page.c.id == MeasurementFile.id)
+        .outerjoin(MeasurementNode, MeasurementNode.id == MeasurementFile.node_id)
+        .outerjoin(MeasurementModule, MeasurementModule.id == MeasurementFile.module_id)
+        .outerjoin(MeasurementVersion, MeasurementVersion.id == MeasurementFile.version_id)
+        .order_by(page.c.post_time.desc(), page.c.id.desc())
+    )
+    rows = (await session.execute(stmt)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1].MeasurementFile
+        next_cursor = _encode_cursor(last.post_time, last.id)
+
+    # MeasurementFile.directory is selectin-loaded: one extra query for the
+    # whole page, and parent_dir_* read the directory's materialized path.
+    files: list[MeasurementFileListItem] = []
+    for row in rows:
+        file = row.MeasurementFile
+        files.append(
+            MeasurementFileListItem(
+                id=file.id,
+                post_time=file.post_time,
+                file_path=file.file_path,
+                parent_dir_0=file.parent_dir_0,
+                parent_dir_1=file.parent_dir_1,
+                parent_dir_2=file.parent_dir_2,
+                file_name=file.file_name,
+                file_hash=file.file_hash,
+                processing_ms=file.processing_ms,
+                status=file.status.value,
+                created_at=file.created_at,
+                node=row.node,
+                module=row.module,
+                version=row.version,
+                raw_storage=file.raw_storage.value,
+            )
+        )
+    return MeasurementFilePage(files=files, next_cursor=next_cursor)
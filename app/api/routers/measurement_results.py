@@ -2,39 +2,103 @@
 
 from __future__ import annotations
 
+import logging
+import math
+import time
+from dataclasses import asdict
+from collections.abc import AsyncIterator, Callable, Hashable, Iterable, Iterator
+from datetime import date, datetime, timedelta
+from contextlib import asynccontextmanager
 from hashlib import sha256
+from itertools import chain, repeat
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, select, text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import (
+    Float,
+    Select,
+    Table,
+    bindparam,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
-from ...core import get_session
+from ...core import (
+    AsyncSessionMaker,
+    DimensionCacheScope,
+    DuplicateRawPointError,
+    IngestTimer,
+    JSONRoute,
+    LockTimeoutError,
+    RawBlobBuilder,
+    SpooledJob,
+    SpoolFullError,
+    SpoolWorkerPool,
+    dimension_cache,
+    file_locks,
+    get_session,
+    ingest_spool,
+    json_loads,
+    settings,
+)
 from ...models import (
+    Base,
     DetectionClass,
     FileClassCount,
+    FileItemSummary,
     FileStatus,
+    FileSummary,
     MeasurementDirectory,
+    MeasurementDirectoryClosure,
     MeasurementFile,
     MeasurementItem,
     MeasurementMetricType,
     MeasurementModule,
     MeasurementNode,
     MeasurementVersion,
+    RawMeasurementBlob,
     RawMeasurementRecord,
+    RawStorage,
     StatMeasurement,
     StatMeasurementValue,
+    StatTrendRollup,
     StatValueType,
 )
 from ...schemas import (
+    ColumnarRawMeasurements,
+    FileClassCountPayload,
+    MeasurementBatchItemResult,
+    MeasurementBatchResult,
+    MeasurementColumnarCreate,
+    MeasurementFileCreate,
     MeasurementPipelineCreate,
     MeasurementPipelineResult,
     MeasurementFileRead,
+    MeasurementDiffSummary,
     MeasurementItemLink,
-    MetricTypeLink,
+    MeasurementJobRead,
+    MeasurementStreamHeader,
+    PipelineRawMeasurement,
+    PipelineStatMeasurement,
 )
+from ...schemas.fast import validate_pipeline_fast
 
 
-router = APIRouter(prefix="/measurement-results", tags=["measurement-results"])
+router = APIRouter(prefix="/measurement-results", tags=["measurement-results"], route_class=JSONRoute)
+logger = logging.getLogger("measure_system")
+
+IngestMode = Literal["replace", "diff"]
 
 
 def _compute_file_hash(file_payload: MeasurementFileCreate) -> str:
@@ -54,344 +118,2003 @@ def _build_lock_key(file_hash: str) -> str:
     return prefix + file_hash[:allowable]
 
 
+def _build_file_read(
+    file_data: MeasurementFile,
+    file_payload: MeasurementFileCreate,
+) -> MeasurementFileRead:
+    # Directory names come from the payload so the response never lazy-loads
+    # the directory chain (cached ids leave it outside the identity map).
+    segments: list[str | None] = [
+        name
+        for name in (file_payload.parent_dir_0, file_payload.parent_dir_1, file_payload.parent_dir_2)
+        if name
+    ]
+    segments += [None] * (3 - len(segments))
+    return MeasurementFileRead(
+        id=file_data.id,
+        created_at=file_data.created_at,
+        post_time=file_data.post_time,
+        file_path=file_data.file_path,
+        parent_dir_0=segments[0],
+        parent_dir_1=segments[1],
+        parent_dir_2=segments[2],
+        file_name=file_data.file_name,
+        file_hash=file_data.file_hash,
+        processing_ms=file_data.processing_ms,
+        status=FileStatus(file_data.status).value,
+    )
+
+
+_RAW_VALUE_COLUMNS = ("measurable", "x_0", "y_0", "x_1", "y_1", "value")
+
+
+def _iter_raw_rows(
+    file_id: int,
+    post_date: date,
+    raw_entries: Iterable[PipelineRawMeasurement],
+    item_ids: dict[tuple[str, str, str], int],
+) -> Iterator[dict[str, Any]]:
+    for raw_entry in raw_entries:
+        yield {
+            "file_id": file_id,
+            "item_id": item_ids[_item_link_key(raw_entry.item)],
+            "post_date": post_date,
+            "measurable": raw_entry.measurable,
+            "x_index": raw_entry.x_index,
+            "y_index": raw_entry.y_index,
+            "x_0": raw_entry.x_0,
+            "y_0": raw_entry.y_0,
+            "x_1": raw_entry.x_1,
+            "y_1": raw_entry.y_1,
+            "value": raw_entry.value,
+        }
+
+
+async def _insert_raw_rows(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Insert raw points through Core executemany, bypassing the ORM unit of work."""
+
+    if not rows:
+        return
+    await session.execute(insert(RawMeasurementRecord.__table__), rows)
+
+
+async def _insert_raw_records(session: AsyncSession, rows: Iterable[dict[str, Any]]) -> int:
+    batch_size = max(settings.raw_insert_batch_size, 1)
+    count = 0
+    batch: list[dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        count += 1
+        if len(batch) >= batch_size:
+            await _insert_raw_rows(session, batch)
+            batch = []
+    await _insert_raw_rows(session, batch)
+    return count
+
+
+async def _write_raw_blobs(
+    session: AsyncSession,
+    file_id: int,
+    blobs: RawBlobBuilder,
+    changes: MeasurementDiffSummary | None,
+) -> None:
+    """Encode the collected points into one compressed blob per item and store them.
+
+    In diff mode a blob is the unit of change: items whose uncompressed
+    payload checksum matches the stored one are left untouched.
+    """
+
+    try:
+        rows = [
+            {"file_id": file_id, "item_id": item_id, **asdict(blob)}
+            for item_id, blob in blobs.encode(settings.raw_blob_codec, settings.raw_blob_level)
+        ]
+    except DuplicateRawPointError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+    table = RawMeasurementBlob.__table__
+    if changes is None:
+        if rows:
+            await session.execute(insert(table), rows)
+        return
+
+    result = await session.execute(
+        select(table.c.item_id, table.c.checksum).where(table.c.file_id == file_id)
+    )
+    stored: dict[int, str] = dict(result.tuples().all())
+    inserts: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    for row in rows:
+        checksum = stored.pop(row["item_id"], None)
+        if checksum is None:
+            inserts.append(row)
+        elif checksum != row["checksum"]:
+            updates.append({"b_file_id": row.pop("file_id"), "b_item_id": row.pop("item_id"), **row})
+        else:
+            changes.unchanged += 1
+
+    if updates:
+        await session.execute(
+            update(table).where(
+                table.c.file_id == bindparam("b_file_id"),
+                table.c.item_id == bindparam("b_item_id"),
+            ),
+            updates,
+        )
+    if inserts:
+        await session.execute(insert(table), inserts)
+    if stored:
+        await session.execute(
+            delete(table).where(table.c.file_id == file_id, table.c.item_id.in_(list(stored)))
+        )
+    changes.updated += len(updates)
+    changes.inserted += len(inserts)
+    changes.deleted += len(stored)
+
+
+async def _insert_stat_measurements(
+    session: AsyncSession,
+    file_id: int,
+    post_date: date,
+    stat_entries: list[PipelineStatMeasurement],
+    item_ids: dict[tuple[str, str, str], int],
+    value_type_ids: dict[Hashable, int],
+) -> int:
+    """Insert stat headers and their values with three statements in total."""
+
+    if not stat_entries:
+        return 0
+    header_rows = [
+        {"file_id": file_id, "item_id": item_ids[_item_link_key(entry.item)], "post_date": post_date}
+        for entry in stat_entries
+    ]
+    await session.execute(insert(StatMeasurement.__table__), header_rows)
+
+    # uk_stat_file_item allows one header per item, so (file_id, item_id)
+    # finds exactly the rows just inserted. Reading only this call's items
+    # keeps streamed batches from re-reading the headers of earlier ones.
+    result = await session.execute(
+        select(StatMeasurement.item_id, StatMeasurement.id).where(
+            StatMeasurement.file_id == file_id,
+            StatMeasurement.post_date == post_date,
+            StatMeasurement.item_id.in_([header["item_id"] for header in header_rows]),
+        )
+    )
+    stat_ids: dict[int, int] = dict(result.tuples().all())
+
+    value_rows = [
+        {
+            "stat_measurement_id": stat_ids[header["item_id"]],
+            "value_type_id": value_type_ids[value_payload.value_type_name],
+            "post_date": post_date,
+            "value": value_payload.value,
+        }
+        for header, entry in zip(header_rows, stat_entries)
+        for value_payload in entry.values
+    ]
+    if value_rows:
+        await session.execute(insert(StatMeasurementValue.__table__), value_rows)
+    return len(stat_entries)
+
+
+class _ItemValueStats:
+    """Running count/min/max/mean/variance (Welford) for one item's points."""
+
+    __slots__ = ("raw_points", "measurable_points", "value_min", "value_max", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.raw_points = 0
+        self.measurable_points = 0
+        self.value_min = math.inf
+        self.value_max = -math.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float, measurable: bool) -> None:
+        self.raw_points += 1
+        if not measurable:
+            return
+        self.measurable_points += 1
+        if value < self.value_min:
+            self.value_min = value
+        if value > self.value_max:
+            self.value_max = value
+        delta = value - self.mean
+        self.mean += delta / self.measurable_points
+        self.m2 += delta * (value - self.mean)
+
+    def as_row(self, file_id: int, item_id: int) -> dict[str, Any]:
+        measured = self.measurable_points > 0
+        return {
+            "file_id": file_id,
+            "item_id": item_id,
+            "raw_points": self.raw_points,
+            "measurable_points": self.measurable_points,
+            "value_min": self.value_min if measured else None,
+            "value_max": self.value_max if measured else None,
+            "value_avg": self.mean if measured else None,
+            "value_stddev": math.sqrt(self.m2 / self.measurable_points) if measured else None,
+        }
+
+
+class _FileSummaryBuilder:
+    """Collects per-item statistics while raw rows flow into the insert."""
+
+    def __init__(self) -> None:
+        self.items: dict[int, _ItemValueStats] = {}
+
+    def observe(self, rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        items = self.items
+        for row in rows:
+            stats = items.get(row["item_id"])
+            if stats is None:
+                stats = items[row["item_id"]] = _ItemValueStats()
+            stats.add(row["value"], row["measurable"])
+            yield row
+
+    def file_row(self, file_id: int, stat_sets: int) -> dict[str, Any]:
+        measured = [stats for stats in self.items.values() if stats.measurable_points]
+        measurable_points = sum(stats.measurable_points for stats in measured)
+        return {
+            "file_id": file_id,
+            "raw_points": sum(stats.raw_points for stats in self.items.values()),
+            "measurable_points": measurable_points,
+            "item_count": len(self.items),
+            "stat_sets": stat_sets,
+            "value_min": min((stats.value_min for stats in measured), default=None),
+            "value_max": max((stats.value_max for stats in measured), default=None),
+            "value_avg": (
+                sum(stats.mean * stats.measurable_points for stats in measured) / measurable_points
+                if measurable_points
+                else None
+            ),
+        }
+
+
+async def _write_file_summary(
+    session: AsyncSession,
+    file_id: int,
+    summary: _FileSummaryBuilder,
+    stat_sets: int,
+) -> None:
+    await session.execute(delete(FileItemSummary).where(FileItemSummary.file_id == file_id))
+    await session.execute(delete(FileSummary).where(FileSummary.file_id == file_id))
+    await session.execute(insert(FileSummary.__table__), [summary.file_row(file_id, stat_sets)])
+    item_rows = [stats.as_row(file_id, item_id) for item_id, stats in summary.items.items()]
+    if item_rows:
+        await session.execute(insert(FileItemSummary.__table__), item_rows)
+
+
+TrendKey = tuple[str, datetime, int, int, int, int]
+
+
+def _trend_buckets(post_time: datetime) -> tuple[tuple[str, datetime], ...]:
+    hour = post_time.replace(tzinfo=None, minute=0, second=0, microsecond=0)
+    return (("hour", hour), ("day", hour.replace(hour=0)))
+
+
+class _StatTrendRollup:
+    """Net rollup deltas of one file: its previous contribution retracted, the new one added.
+
+    Each delta is ``[count, sum, sumsq, min, max]`` keyed by
+    ``(granularity, bucket_start, node_id, module_id, item_id, value_type_id)``.
+    """
+
+    def __init__(self) -> None:
+        self.deltas: dict[TrendKey, list[Any]] = {}
+        self.retracted: set[TrendKey] = set()
+
+    def observe(
+        self,
+        post_time: datetime,
+        node_id: int | None,
+        module_id: int | None,
+        values: Iterable[tuple[int, int, float]],
+        sign: int = 1,
+    ) -> None:
+        buckets = _trend_buckets(post_time)
+        for item_id, value_type_id, value in values:
+            for granularity, bucket_start in buckets:
+                key = (granularity, bucket_start, node_id or 0, module_id or 0, item_id, value_type_id)
+                delta = self.deltas.get(key)
+                if delta is None:
+                    delta = self.deltas[key] = [0, 0.0, 0.0, None, None]
+                delta[0] += sign
+                delta[1] += sign * value
+                delta[2] += sign * value * value
+                if sign < 0:
+                    self.retracted.add(key)
+                    continue
+                delta[3] = value if delta[3] is None else min(delta[3], value)
+                delta[4] = value if delta[4] is None else max(delta[4], value)
+
+
+_TREND_KEY_COLUMNS = ("granularity", "bucket_start", "node_id", "module_id", "item_id", "value_type_id")
+
+
+def _stat_trend_values(
+    stat_entries: Iterable[PipelineStatMeasurement],
+    item_ids: dict[tuple[str, str, str], int],
+    value_type_ids: dict[Hashable, int],
+) -> Iterator[tuple[int, int, float]]:
+    for entry in stat_entries:
+        item_id = item_ids[_item_link_key(entry.item)]
+        for value_payload in entry.values:
+            yield item_id, value_type_ids[value_payload.value_type_name], value_payload.value
+
+
+async def _retract_stat_trends(
+    session: AsyncSession,
+    file_data: MeasurementFile,
+    trends: _StatTrendRollup,
+) -> None:
+    """Record the stored stat values of an existing file as negative deltas.
+
+    Assumes the stored values are already in the rollups, which holds for
+    files ingested before ``stat_trend_rollups`` existed only after
+    ``sql/stat_trend_rollups_backfill.sql`` has been run.
+    """
+
+    result = await session.execute(
+        select(
+            StatMeasurement.item_id,
+            StatMeasurementValue.value_type_id,
+            type_coerce(StatMeasurementValue.value, Float(asdecimal=False)),
+        )
+        .join(
+            StatMeasurementValue,
+            (StatMeasurementValue.stat_measurement_id == StatMeasurement.id)
+            & (StatMeasurementValue.post_date == StatMeasurement.post_date),
+        )
+        .where(
+            StatMeasurement.file_id == file_data.id,
+            StatMeasurement.post_date == file_data.post_date,
+        )
+    )
+    trends.observe(file_data.post_time, file_data.node_id, file_data.module_id, result.tuples(), sign=-1)
+
+
+async def _upsert_trend_rollups(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    table = StatTrendRollup.__table__
+    stmt = mysql_insert(table).values(rows)
+    new = stmt.inserted
+    stmt = stmt.on_duplicate_key_update(
+        value_count=table.c.value_count + new.value_count,
+        value_sum=table.c.value_sum + new.value_sum,
+        value_sumsq=table.c.value_sumsq + new.value_sumsq,
+        # Retraction rows carry NULL min/max and must leave the stored bound alone.
+        value_min=func.least(
+            func.coalesce(table.c.value_min, new.value_min),
+            func.coalesce(new.value_min, table.c.value_min),
+        ),
+        value_max=func.greatest(
+            func.coalesce(table.c.value_max, new.value_max),
+            func.coalesce(new.value_max, table.c.value_max),
+        ),
+    )
+    await session.execute(stmt)
+
+
+async def _refresh_trend_bounds(session: AsyncSession, keys: set[TrendKey]) -> None:
+    """Recompute min/max of retracted buckets from the source stat values.
+
+    count/sum/sumsq can be subtracted but a bound cannot, so buckets that lost
+    values re-read their extremes. Every retracted key of one file shares the
+    same bucket, node and module per granularity, so this is one grouped
+    query per granularity.
+    """
+
+    table = StatTrendRollup.__table__
+    groups: dict[tuple[str, datetime, int, int], list[tuple[int, int]]] = {}
+    for granularity, bucket_start, node_id, module_id, item_id, value_type_id in keys:
+        groups.setdefault((granularity, bucket_start, node_id, module_id), []).append(
+            (item_id, value_type_id)
+        )
+    value = type_coerce(StatMeasurementValue.value, Float(asdecimal=False))
+    for (granularity, bucket_start, node_id, module_id), pairs in groups.items():
+        span = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+        result = await session.execute(
+            select(
+                StatMeasurement.item_id,
+                StatMeasurementValue.value_type_id,
+                func.min(value),
+                func.max(value),
+            )
+            .join(
+                StatMeasurementValue,
+                (StatMeasurementValue.stat_measurement_id == StatMeasurement.id)
+                & (StatMeasurementValue.post_date == StatMeasurement.post_date),
+            )
+            .join(MeasurementFile, MeasurementFile.id == StatMeasurement.file_id)
+            .where(
+                # Hour and day buckets never straddle a date, so both stat
+                # tables prune to the bucket's single partition.
+                StatMeasurement.post_date == bucket_start.date(),
+                MeasurementFile.post_time >= bucket_start,
+                MeasurementFile.post_time < bucket_start + span,
+                func.coalesce(MeasurementFile.node_id, 0) == node_id,
+                func.coalesce(MeasurementFile.module_id, 0) == module_id,
+                tuple_(StatMeasurement.item_id, StatMeasurementValue.value_type_id).in_(pairs),
+            )
+            .group_by(StatMeasurement.item_id, StatMeasurementValue.value_type_id)
+        )
+        bounds = [
+            {
+                "b_granularity": granularity,
+                "b_bucket_start": bucket_start,
+                "b_node_id": node_id,
+                "b_module_id": module_id,
+                "b_item_id": item_id,
+                "b_value_type_id": value_type_id,
+                "value_min": value_min,
+                "value_max": value_max,
+            }
+            for item_id, value_type_id, value_min, value_max in result
+        ]
+        if bounds:
+            await session.execute(
+                update(table)
+                .where(*(table.c[name] == bindparam(f"b_{name}") for name in _TREND_KEY_COLUMNS))
+                .values(value_min=bindparam("value_min"), value_max=bindparam("value_max")),
+                bounds,
+            )
+
+
+async def _flush_stat_trends(session: AsyncSession, trends: _StatTrendRollup) -> None:
+    if not trends.deltas:
+        return
+    table = StatTrendRollup.__table__
+    await _upsert_trend_rollups(
+        session,
+        [
+            {
+                **dict(zip(_TREND_KEY_COLUMNS, key)),
+                "value_count": count,
+                "value_sum": total,
+                "value_sumsq": total_sq,
+                "value_min": value_min,
+                "value_max": value_max,
+            }
+            for key, (count, total, total_sq, value_min, value_max) in trends.deltas.items()
+        ],
+    )
+    if trends.retracted:
+        key_columns = tuple_(*(table.c[name] for name in _TREND_KEY_COLUMNS))
+        await session.execute(
+            delete(table).where(key_columns.in_(list(trends.retracted)), table.c.value_count <= 0)
+        )
+        await _refresh_trend_bounds(session, trends.retracted)
+    trends.deltas.clear()
+    trends.retracted.clear()
+
+
+async def _get_or_create_named(
+    session: AsyncSession,
+    model: type[Base],
+    name: str,
+    cache: DimensionCacheScope,
+) -> int:
+    # Goes through the upsert path so concurrent ingests creating the same
+    # name (e.g. parallel spool consumers) do not collide on the unique key;
+    # the locking read-back in _resolve_dimension_ids finds the other row.
+    resolved = await _resolve_dimension_ids(session, model, ("name",), [name], cache)
+    return resolved[name]
+
+
 async def _get_or_create_node(
     session: AsyncSession,
     name: str | None,
-    cache: dict[str, MeasurementNode],
-) -> MeasurementNode | None:
+    cache: DimensionCacheScope,
+) -> int | None:
     if not name:
         return None
-    if name in cache:
-        return cache[name]
-    stmt = select(MeasurementNode).where(MeasurementNode.name == name)
-    result = await session.execute(stmt)
-    node = result.scalars().first()
-    if node is None:
-        node = MeasurementNode(name=name)
-        session.add(node)
-        await session.flush()
-    cache[name] = node
-    return node
+    return await _get_or_create_named(session, MeasurementNode, name, cache)
 
 
 async def _get_or_create_module(
     session: AsyncSession,
     name: str | None,
-    cache: dict[str, MeasurementModule],
-) -> MeasurementModule | None:
+    cache: DimensionCacheScope,
+) -> int | None:
     if not name:
         return None
-    if name in cache:
-        return cache[name]
-    stmt = select(MeasurementModule).where(MeasurementModule.name == name)
-    result = await session.execute(stmt)
-    module = result.scalars().first()
-    if module is None:
-        module = MeasurementModule(name=name)
-        session.add(module)
-        await session.flush()
-    cache[name] = module
-    return module
+    return await _get_or_create_named(session, MeasurementModule, name, cache)
 
 
 async def _get_or_create_version(
     session: AsyncSession,
     name: str | None,
-    cache: dict[str, MeasurementVersion],
-) -> MeasurementVersion | None:
+    cache: DimensionCacheScope,
+) -> int | None:
     if not name:
         return None
-    if name in cache:
-        return cache[name]
-    stmt = select(MeasurementVersion).where(MeasurementVersion.name == name)
-    result = await session.execute(stmt)
-    version = result.scalars().first()
-    if version is None:
-        version = MeasurementVersion(name=name)
-        session.add(version)
-        await session.flush()
-    cache[name] = version
-    return version
+    return await _get_or_create_named(session, MeasurementVersion, name, cache)
 
 
 async def _get_or_create_directory_path(
     session: AsyncSession,
     segments: list[str | None],
-    cache: dict[tuple[str, ...], MeasurementDirectory],
-) -> MeasurementDirectory | None:
+    cache: DimensionCacheScope,
+) -> int | None:
     ordered_segments = [name for name in segments if name]
     if not ordered_segments:
         return None
+    namespace = MeasurementDirectory.__tablename__
     path: list[str] = []
-    parent: MeasurementDirectory | None = None
+    lineage: list[int] = []
+    parent_id: int | None = None
     for name in reversed(ordered_segments):
         path.append(name)
         key = tuple(path)
-        if key in cache:
-            parent = cache[key]
+        cached = cache.get(namespace, key)
+        if cached is not None:
+            parent_id = cached
+            lineage.append(parent_id)
             continue
-        stmt = select(MeasurementDirectory).where(
-            MeasurementDirectory.parent_id == (parent.id if parent else None),
-            MeasurementDirectory.name == name,
+        stmt = (
+            select(MeasurementDirectory.id)
+            .where(MeasurementDirectory.parent_id == parent_id, MeasurementDirectory.name == name)
+            .order_by(MeasurementDirectory.id)
         )
         result = await session.execute(stmt)
-        directory = result.scalars().first()
-        if directory is None:
-            directory = MeasurementDirectory(parent_id=parent.id if parent else None, name=name)
-            session.add(directory)
-            await session.flush()
-        cache[key] = directory
-        parent = directory
-    return parent
+        directory_id = result.scalars().first()
+        if directory_id is None:
+            # Same upsert + locking read-back as _resolve_dimension_ids, so a
+            # directory another ingest committed meanwhile is reused instead
+            # of failing on uk_directories_parent_name.
+            await _upsert_dimension_rows(
+                session,
+                MeasurementDirectory.__table__,
+                [{"parent_id": parent_id, "name": name, "path": "/".join(path)}],
+            )
+            result = await session.execute(stmt.with_for_update(read=True))
+            directory_id = result.scalars().first()
+            # The ancestors are exactly the directories walked so far, so the
+            # closure rows need no lookup; they already exist if the other
+            # ingest created the directory.
+            closure = MeasurementDirectoryClosure.__table__
+            closure_insert = mysql_insert(closure).values(
+                [
+                    {"ancestor_id": ancestor_id, "descendant_id": directory_id, "depth": len(lineage) - index}
+                    for index, ancestor_id in enumerate([*lineage, directory_id])
+                ]
+            )
+            await session.execute(closure_insert.on_duplicate_key_update(depth=closure.c.depth))
+            cache.put(namespace, key, directory_id, created=True)
+        else:
+            cache.put(namespace, key, directory_id)
+        parent_id = directory_id
+        lineage.append(parent_id)
+    return parent_id
+
+
+def _file_stat_ids(file_id: int, post_date: date) -> Select[tuple[int]]:
+    return select(StatMeasurement.id).where(
+        StatMeasurement.file_id == file_id,
+        StatMeasurement.post_date == post_date,
+    )
+
+
+async def _clear_raw_points(
+    session: AsyncSession,
+    file_id: int,
+    post_date: date,
+    raw_storage: RawStorage,
+) -> int:
+    """Delete a file's raw points in whichever representation they are stored."""
+
+    if raw_storage is RawStorage.BLOB:
+        result = await session.execute(
+            delete(RawMeasurementBlob).where(RawMeasurementBlob.file_id == file_id)
+        )
+    else:
+        result = await session.execute(
+            delete(RawMeasurementRecord).where(
+                RawMeasurementRecord.file_id == file_id,
+                RawMeasurementRecord.post_date == post_date,
+            )
+        )
+    return result.rowcount or 0
 
 
 async def _clear_existing_measurement_data(
     session: AsyncSession,
     file_id: int,
+    post_date: date,
+    raw_storage: RawStorage,
 ) -> None:
-    await session.execute(delete(RawMeasurementRecord).where(RawMeasurementRecord.file_id == file_id))
-    await session.execute(delete(StatMeasurement).where(StatMeasurement.file_id == file_id))
+    """Delete a file's raw/stat/class rows; ``post_date`` pins the partition they live in."""
+
+    await _clear_raw_points(session, file_id, post_date, raw_storage)
+    # The partitioned stat tables have no FK cascade, so values go first.
+    await session.execute(
+        delete(StatMeasurementValue).where(
+            StatMeasurementValue.post_date == post_date,
+            StatMeasurementValue.stat_measurement_id.in_(_file_stat_ids(file_id, post_date)),
+        )
+    )
+    await session.execute(
+        delete(StatMeasurement).where(
+            StatMeasurement.file_id == file_id,
+            StatMeasurement.post_date == post_date,
+        )
+    )
     await session.execute(delete(FileClassCount).where(FileClassCount.file_id == file_id))
     await session.flush()
 
 
-async def _acquire_file_lock(session: AsyncSession, lock_key: str, timeout: int = 30) -> None:
-    result = await session.execute(text("SELECT GET_LOCK(:lock_key, :timeout)"), {"lock_key": lock_key, "timeout": timeout})
-    acquired = result.scalar_one()
-    if acquired != 1:
-        raise HTTPException(status_code=503, detail="Could not obtain lock for file ingestion")
-    await session.commit()
+async def _move_file_partition(
+    session: AsyncSession,
+    file_id: int,
+    old_post_date: date,
+    new_post_date: date,
+) -> None:
+    """Re-key a file's raw/stat rows after its post_time moved to another date.
+
+    ``post_date`` is part of these tables' primary keys, so the updates are
+    issued against the tables rather than through the ORM, which would try
+    to synchronise the session's identity map on the changed keys.
+    """
+
+    value_table = StatMeasurementValue.__table__
+    await session.execute(
+        update(value_table)
+        .where(
+            value_table.c.post_date == old_post_date,
+            value_table.c.stat_measurement_id.in_(_file_stat_ids(file_id, old_post_date)),
+        )
+        .values(post_date=new_post_date)
+    )
+    for model in (StatMeasurement, RawMeasurementRecord):
+        table = model.__table__
+        await session.execute(
+            update(table)
+            .where(table.c.file_id == file_id, table.c.post_date == old_post_date)
+            .values(post_date=new_post_date)
+        )
+
+
+@asynccontextmanager
+async def _hold_file_locks(*lock_keys: str, timer: IngestTimer | None = None) -> AsyncIterator[None]:
+    requested = time.perf_counter()
+    try:
+        async with file_locks.hold(*lock_keys):
+            if timer is not None:
+                timer.add("lock", time.perf_counter() - requested)
+            yield
+    except LockTimeoutError as exc:
+        raise HTTPException(status_code=503, detail="Could not obtain lock for file ingestion") from exc
+
+
+def _item_link_key(link: MeasurementItemLink) -> tuple[str, str, str]:
+    return (link.class_name, link.measure_item_key, link.metric_type.name)
+
 
+def _match_dimension_keys(
+    requested: Iterable[Hashable],
+    found: dict[Hashable, int],
+) -> dict[Hashable, int]:
+    # MySQL compares with a case-insensitive collation, so a requested key may
+    # come back spelled differently; fall back to a casefolded comparison.
+    # Keys equal only under the collation's other rules (accents, trailing
+    # spaces) stay unmatched here; see _select_dimension_ids_each.
+    folded = {_fold_key(key): row_id for key, row_id in found.items()}
+    matched: dict[Hashable, int] = {}
+    for key in requested:
+        row_id = found.get(key)
+        if row_id is None:
+            row_id = folded.get(_fold_key(key))
+        if row_id is not None:
+            matched[key] = row_id
+    return matched
 
-async def _release_file_lock(session: AsyncSession, lock_key: str) -> None:
-    await session.execute(text("SELECT RELEASE_LOCK(:lock_key)"), {"lock_key": lock_key})
-    await session.commit()
 
+def _fold_key(key: Hashable) -> Hashable:
+    if isinstance(key, str):
+        return key.casefold()
+    if isinstance(key, tuple):
+        return tuple(part.casefold() if isinstance(part, str) else part for part in key)
+    return key
 
-async def _get_or_create_metric_type(
+
+async def _select_dimension_ids(
     session: AsyncSession,
-    link: MetricTypeLink,
-    cache: dict[tuple[str, str | None], MeasurementMetricType],
-) -> MeasurementMetricType:
-    cache_key = (link.name, link.unit)
-    if cache_key in cache:
-        return cache[cache_key]
-
-    stmt = select(MeasurementMetricType).where(MeasurementMetricType.name == link.name)
-    result = await session.execute(stmt)
-    metric_type = result.scalars().first()
-    if metric_type is None:
-        metric_type = MeasurementMetricType(name=link.name, unit=link.unit)
-        session.add(metric_type)
-        await session.flush()
-    cache[cache_key] = metric_type
-    return metric_type
+    table: Table,
+    key_columns: tuple[str, ...],
+    keys: list[Hashable],
+    locking: bool = False,
+) -> dict[Hashable, int]:
+    columns = [table.c[name] for name in key_columns]
+    if len(columns) == 1:
+        condition = columns[0].in_(keys)
+    else:
+        condition = tuple_(*columns).in_(keys)
+    query = select(table.c.id, *columns).where(condition)
+    if locking:
+        query = query.with_for_update(read=True)
+    result = await session.execute(query)
+    found: dict[Hashable, int] = {}
+    for row in result:
+        key = row[1] if len(columns) == 1 else tuple(row[1:])
+        found[key] = row[0]
+    return _match_dimension_keys(keys, found)
 
 
-async def _get_or_create_item(
+async def _select_dimension_ids_each(
     session: AsyncSession,
-    link: MeasurementItemLink,
-    metric_type: MeasurementMetricType,
-    cache: dict[tuple[str, str, int], MeasurementItem],
-) -> MeasurementItem:
-    cache_key = (link.class_name, link.measure_item_key, metric_type.id)
-    if cache_key in cache:
-        return cache[cache_key]
-
-    stmt = select(MeasurementItem).where(
-        MeasurementItem.class_name == link.class_name,
-        MeasurementItem.measure_item_key == link.measure_item_key,
-        MeasurementItem.metric_type_id == metric_type.id,
-    )
-    result = await session.execute(stmt)
-    item = result.scalars().first()
-    if item is None:
-        item = MeasurementItem(
-            class_name=link.class_name,
-            measure_item_key=link.measure_item_key,
-            metric_type_id=metric_type.id,
-        )
-        session.add(item)
-        await session.flush()
-    cache[cache_key] = item
-    return item
+    table: Table,
+    key_columns: tuple[str, ...],
+    keys: list[Hashable],
+) -> dict[Hashable, int]:
+    """Locking lookup of one key at a time, matched by the column collation.
+
+    Only used for the rare keys Python-side matching cannot pair with the
+    row the database considers equal.
+    """
+
+    found: dict[Hashable, int] = {}
+    for key in keys:
+        parts = key if len(key_columns) > 1 else (key,)
+        row_id = await session.scalar(
+            select(table.c.id)
+            .where(*(table.c[name] == part for name, part in zip(key_columns, parts)))
+            .with_for_update(read=True)
+        )
+        if row_id is not None:
+            found[key] = row_id
+    return found
 
 
-async def _get_or_create_value_type(
+async def _upsert_dimension_rows(
     session: AsyncSession,
-    name: str,
-    cache: dict[str, StatValueType],
-) -> StatValueType:
-    if name in cache:
-        return cache[name]
-
-    stmt = select(StatValueType).where(StatValueType.name == name)
-    result = await session.execute(stmt)
-    value_type = result.scalars().first()
-    if value_type is None:
-        value_type = StatValueType(name=name)
-        session.add(value_type)
+    table: Table,
+    rows: list[dict[str, Any]],
+) -> None:
+    # Rows created concurrently by another ingest are absorbed by the
+    # ``id = id`` no-op instead of failing the whole transaction; assigning
+    # the key column itself would overwrite the stored spelling.
+    stmt = mysql_insert(table).values(rows)
+    stmt = stmt.on_duplicate_key_update(id=table.c.id)
+    await session.execute(stmt)
+
+
+async def _resolve_dimension_ids(
+    session: AsyncSession,
+    model: type[Base],
+    key_columns: tuple[str, ...],
+    keys: Iterable[Hashable],
+    cache: DimensionCacheScope,
+    extra_values: dict[Hashable, dict[str, Any]] | None = None,
+) -> dict[Hashable, int]:
+    """Resolve natural keys to ids with a constant number of round-trips.
+
+    Keys missing from the cache are looked up with one ``IN`` query, the
+    remainder is created with one multi-row upsert and read back once more.
+    The read-back is a locking read: under REPEATABLE READ a plain ``SELECT``
+    still sees the transaction's snapshot and would miss a row another ingest
+    committed after it, which the upsert left untouched. Keys the read-back
+    still cannot match are looked up one by one with the database's own
+    comparison.
+    """
+
+    table = model.__table__
+    namespace = model.__tablename__
+    resolved: dict[Hashable, int] = {}
+    missing: list[Hashable] = []
+    for key in dict.fromkeys(keys):
+        cached = cache.get(namespace, key)
+        if cached is None:
+            missing.append(key)
+        else:
+            resolved[key] = cached
+    if not missing:
+        return resolved
+
+    found = await _select_dimension_ids(session, table, key_columns, missing)
+    for key, row_id in found.items():
+        cache.put(namespace, key, row_id)
+        resolved[key] = row_id
+
+    to_create = [key for key in missing if key not in found]
+    if not to_create:
+        return resolved
+    rows: list[dict[str, Any]] = []
+    for key in to_create:
+        parts = key if len(key_columns) > 1 else (key,)
+        values = dict(zip(key_columns, parts))
+        if extra_values:
+            values.update(extra_values.get(key, {}))
+        rows.append(values)
+    await _upsert_dimension_rows(session, table, rows)
+    created = await _select_dimension_ids(session, table, key_columns, to_create, locking=True)
+    unmatched = [key for key in to_create if key not in created]
+    if unmatched:
+        created.update(await _select_dimension_ids_each(session, table, key_columns, unmatched))
+    for key in to_create:
+        cache.put(namespace, key, created[key], created=True)
+        resolved[key] = created[key]
+    return resolved
+
+
+async def _resolve_item_ids(
+    session: AsyncSession,
+    links: Iterable[MeasurementItemLink],
+    cache: DimensionCacheScope,
+) -> dict[tuple[str, str, str], int]:
+    distinct: dict[tuple[str, str, str], MeasurementItemLink] = {}
+    for link in links:
+        distinct.setdefault(_item_link_key(link), link)
+    if not distinct:
+        return {}
+
+    metric_units: dict[Hashable, dict[str, Any]] = {}
+    for link in distinct.values():
+        metric_units.setdefault(link.metric_type.name, {"unit": link.metric_type.unit})
+    metric_ids = await _resolve_dimension_ids(
+        session,
+        MeasurementMetricType,
+        ("name",),
+        metric_units.keys(),
+        cache,
+        extra_values=metric_units,
+    )
+
+    item_keys = {
+        (class_name, measure_item_key, metric_name): (
+            class_name,
+            measure_item_key,
+            metric_ids[metric_name],
+        )
+        for class_name, measure_item_key, metric_name in distinct
+    }
+    item_ids = await _resolve_dimension_ids(
+        session,
+        MeasurementItem,
+        ("class_name", "measure_item_key", "metric_type_id"),
+        item_keys.values(),
+        cache,
+    )
+    return {key: item_ids[db_key] for key, db_key in item_keys.items()}
+
+
+async def _insert_class_counts(
+    session: AsyncSession,
+    file_id: int,
+    counts: dict[int, int],
+) -> None:
+    if not counts:
+        return
+    await session.execute(
+        insert(FileClassCount.__table__),
+        [{"file_id": file_id, "class_id": class_id, "cnt": cnt} for class_id, cnt in counts.items()],
+    )
+
+
+async def _delete_by_ids(
+    session: AsyncSession, table: Table, ids: list[int], post_date: date
+) -> None:
+    batch_size = max(settings.raw_insert_batch_size, 1)
+    for start in range(0, len(ids), batch_size):
+        await session.execute(
+            delete(table).where(
+                table.c.post_date == post_date,
+                table.c.id.in_(ids[start : start + batch_size]),
+            )
+        )
+
+
+async def _diff_raw_records(
+    session: AsyncSession,
+    file_id: int,
+    post_date: date,
+    rows: Iterable[dict[str, Any]],
+    changes: MeasurementDiffSummary,
+) -> int:
+    """Apply only the raw row changes needed, matching on uk_raw_file_item_xy."""
+
+    table = RawMeasurementRecord.__table__
+    result = await session.execute(
+        select(
+            table.c.id,
+            table.c.item_id,
+            table.c.x_index,
+            table.c.y_index,
+            table.c.measurable,
+            # DOUBLE reads back as Decimal by default, which never equals the
+            # incoming float; compare as floats.
+            *(
+                type_coerce(table.c[name], Float(asdecimal=False)).label(name)
+                for name in _RAW_VALUE_COLUMNS
+                if name != "measurable"
+            ),
+        ).where(table.c.file_id == file_id, table.c.post_date == post_date)
+    )
+    stored = {(row.item_id, row.x_index, row.y_index): row for row in result}
+
+    count = 0
+    inserts: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    for row in rows:
+        count += 1
+        current = stored.pop((row["item_id"], row["x_index"], row["y_index"]), None)
+        if current is None:
+            inserts.append(row)
+        elif any(getattr(current, name) != row[name] for name in _RAW_VALUE_COLUMNS):
+            updates.append({"b_id": current.id, **{name: row[name] for name in _RAW_VALUE_COLUMNS}})
+        else:
+            changes.unchanged += 1
+
+    if updates:
+        await session.execute(
+            update(table).where(table.c.post_date == post_date, table.c.id == bindparam("b_id")),
+            updates,
+        )
+    await _insert_raw_records(session, inserts)
+    await _delete_by_ids(session, table, [row.id for row in stored.values()], post_date)
+    changes.updated += len(updates)
+    changes.inserted += len(inserts)
+    changes.deleted += len(stored)
+    return count
+
+
+async def _diff_stat_measurements(
+    session: AsyncSession,
+    file_id: int,
+    post_date: date,
+    stat_entries: list[PipelineStatMeasurement],
+    item_ids: dict[tuple[str, str, str], int],
+    value_type_ids: dict[Hashable, int],
+    changes: MeasurementDiffSummary,
+) -> int:
+    """Apply only the stat header/value changes needed, matching on uk_stat_file_item."""
+
+    header_table = StatMeasurement.__table__
+    value_table = StatMeasurementValue.__table__
+    result = await session.execute(
+        select(header_table.c.item_id, header_table.c.id).where(
+            header_table.c.file_id == file_id, header_table.c.post_date == post_date
+        )
+    )
+    stored_headers: dict[int, int] = dict(result.tuples().all())
+    result = await session.execute(
+        select(
+            value_table.c.stat_measurement_id,
+            value_table.c.value_type_id,
+            type_coerce(value_table.c.value, Float(asdecimal=False)),
+        )
+        .join(header_table, header_table.c.id == value_table.c.stat_measurement_id)
+        .where(
+            header_table.c.file_id == file_id,
+            header_table.c.post_date == post_date,
+            value_table.c.post_date == post_date,
+        )
+    )
+    stored_values = {(row[0], row[1]): row[2] for row in result}
+
+    new_entries: list[PipelineStatMeasurement] = []
+    value_inserts: list[dict[str, Any]] = []
+    value_updates: list[dict[str, Any]] = []
+    changed_stat_ids: set[int] = set()
+    matched_stat_ids: list[int] = []
+    for entry in stat_entries:
+        item_id = item_ids[_item_link_key(entry.item)]
+        stat_id = stored_headers.pop(item_id, None)
+        if stat_id is None:
+            new_entries.append(entry)
+            continue
+        matched_stat_ids.append(stat_id)
+        for value_payload in entry.values:
+            value_type_id = value_type_ids[value_payload.value_type_name]
+            current = stored_values.pop((stat_id, value_type_id), None)
+            if current is None:
+                changed_stat_ids.add(stat_id)
+                value_inserts.append(
+                    {
+                        "stat_measurement_id": stat_id,
+                        "value_type_id": value_type_id,
+                        "post_date": post_date,
+                        "value": value_payload.value,
+                    }
+                )
+            elif current != value_payload.value:
+                changed_stat_ids.add(stat_id)
+                value_updates.append(
+                    {"b_stat_id": stat_id, "b_value_type_id": value_type_id, "value": value_payload.value}
+                )
+            else:
+                changes.unchanged += 1
+
+    # A matched header is unchanged only if none of its values were
+    # inserted, updated or are about to be deleted.
+    changed_stat_ids.update(stat_id for stat_id, _ in stored_values)
+    changes.unchanged += sum(1 for stat_id in matched_stat_ids if stat_id not in changed_stat_ids)
+
+    removed_stat_ids = set(stored_headers.values())
+    if value_updates:
+        await session.execute(
+            update(value_table).where(
+                value_table.c.post_date == post_date,
+                value_table.c.stat_measurement_id == bindparam("b_stat_id"),
+                value_table.c.value_type_id == bindparam("b_value_type_id"),
+            ),
+            value_updates,
+        )
+    if value_inserts:
+        await session.execute(insert(value_table), value_inserts)
+    # Values of removed headers are deleted here too: the partitioned tables
+    # carry no ON DELETE CASCADE.
+    if stored_values:
+        await session.execute(
+            delete(value_table).where(
+                value_table.c.post_date == post_date,
+                tuple_(value_table.c.stat_measurement_id, value_table.c.value_type_id).in_(
+                    list(stored_values)
+                ),
+            )
+        )
+    await _delete_by_ids(session, header_table, sorted(removed_stat_ids), post_date)
+    await _insert_stat_measurements(
+        session, file_id, post_date, new_entries, item_ids, value_type_ids
+    )
+
+    changes.updated += len(value_updates)
+    changes.inserted += len(value_inserts) + len(new_entries)
+    changes.inserted += sum(len(entry.values) for entry in new_entries)
+    changes.deleted += len(stored_values) + len(removed_stat_ids)
+    return len(stat_entries)
+
+
+async def _diff_class_counts(
+    session: AsyncSession,
+    file_id: int,
+    counts: dict[int, int],
+    changes: MeasurementDiffSummary,
+) -> None:
+    """Apply only the class-count changes needed, matching on the table primary key."""
+
+    table = FileClassCount.__table__
+    result = await session.execute(
+        select(table.c.class_id, table.c.cnt).where(table.c.file_id == file_id)
+    )
+    stored: dict[int, int] = dict(result.tuples().all())
+
+    inserts: dict[int, int] = {}
+    updates: list[dict[str, Any]] = []
+    for class_id, cnt in counts.items():
+        current = stored.pop(class_id, None)
+        if current is None:
+            inserts[class_id] = cnt
+        elif current != cnt:
+            updates.append({"b_file_id": file_id, "b_class_id": class_id, "cnt": cnt})
+        else:
+            changes.unchanged += 1
+
+    if updates:
+        await session.execute(
+            update(table).where(
+                table.c.file_id == bindparam("b_file_id"),
+                table.c.class_id == bindparam("b_class_id"),
+            ),
+            updates,
+        )
+    await _insert_class_counts(session, file_id, inserts)
+    if stored:
+        await session.execute(
+            delete(table).where(table.c.file_id == file_id, table.c.class_id.in_(list(stored)))
+        )
+    changes.updated += len(updates)
+    changes.inserted += len(inserts)
+    changes.deleted += len(stored)
+
+
+async def _upsert_measurement_file(
+    session: AsyncSession,
+    file_payload: MeasurementFileCreate,
+    file_hash: str,
+    cache: DimensionCacheScope,
+    trends: _StatTrendRollup,
+    *,
+    clear_existing: bool,
+    changes: MeasurementDiffSummary | None = None,
+) -> MeasurementFile:
+    existing_stmt = (
+        select(MeasurementFile.id)
+        .where(MeasurementFile.file_hash == file_hash)
+        .limit(1)
+    )
+    result = await session.execute(existing_stmt)
+    file_id = result.scalars().first()
+    file_data = None
+    if file_id is not None:
+        result = await session.execute(
+            select(MeasurementFile)
+            .where(MeasurementFile.id == file_id)
+            .options(raiseload(MeasurementFile.directory))
+            .with_for_update(nowait=False)
+        )
+        file_data = result.scalars().first()
+    node_id = await _get_or_create_node(session, file_payload.node_name, cache)
+    module_id = await _get_or_create_module(session, file_payload.module_name, cache)
+    version_id = await _get_or_create_version(session, file_payload.version_name, cache)
+    directory_id = await _get_or_create_directory_path(
+        session,
+        [file_payload.parent_dir_0, file_payload.parent_dir_1, file_payload.parent_dir_2],
+        cache,
+    )
+
+    raw_storage = RawStorage(settings.raw_storage)
+    if file_data is None:
+        file_data = MeasurementFile(
+            post_time=file_payload.post_time,
+            file_path=file_payload.file_path,
+            file_name=file_payload.file_name,
+            file_hash=file_hash,
+            processing_ms=file_payload.processing_ms,
+            status=FileStatus(file_payload.status),
+            raw_storage=raw_storage,
+        )
+        session.add(file_data)
+        await session.flush()
+        await session.refresh(file_data)
+    else:
+        # Capture the old contribution while the previous post_time, node and
+        # stat rows are still in place.
+        await _retract_stat_trends(session, file_data, trends)
+        old_post_date = file_data.post_date
+        old_raw_storage = file_data.raw_storage
+        file_data.post_time = file_payload.post_time
+        file_data.file_path = file_payload.file_path
+        file_data.file_name = file_payload.file_name
+        file_data.processing_ms = file_payload.processing_ms
+        file_data.status = FileStatus(file_payload.status)
+        file_data.raw_storage = raw_storage
         await session.flush()
-    cache[name] = value_type
-    return value_type
+        # post_date is generated from post_time; reload it to key the child rows.
+        await session.refresh(file_data, ["post_date"])
+        if clear_existing:
+            await _clear_existing_measurement_data(
+                session, file_data.id, old_post_date, old_raw_storage
+            )
+        else:
+            if old_raw_storage is not raw_storage:
+                # Switching representation: nothing to diff against.
+                deleted = await _clear_raw_points(
+                    session, file_data.id, old_post_date, old_raw_storage
+                )
+                if changes is not None:
+                    changes.deleted += deleted
+            if file_data.post_date != old_post_date:
+                await _move_file_partition(
+                    session, file_data.id, old_post_date, file_data.post_date
+                )
+
+    file_data.file_hash = file_hash
+    file_data.node_id = node_id
+    file_data.module_id = module_id
+    file_data.version_id = version_id
+    file_data.directory_id = directory_id
+    return file_data
+
+
+async def _resolve_value_type_ids(
+    session: AsyncSession,
+    stat_entries: Iterable[PipelineStatMeasurement],
+    cache: DimensionCacheScope,
+) -> dict[Hashable, int]:
+    return await _resolve_dimension_ids(
+        session,
+        StatValueType,
+        ("name",),
+        (
+            value_payload.value_type_name
+            for stat_entry in stat_entries
+            for value_payload in stat_entry.values
+        ),
+        cache,
+    )
+
+
+async def _insert_measurements(
+    session: AsyncSession,
+    file_data: MeasurementFile,
+    raw_entries: list[PipelineRawMeasurement],
+    stat_entries: list[PipelineStatMeasurement],
+    cache: DimensionCacheScope,
+    summary: _FileSummaryBuilder,
+    trends: _StatTrendRollup,
+    blobs: RawBlobBuilder | None = None,
+) -> tuple[int, int]:
+    item_ids = await _resolve_item_ids(
+        session,
+        chain(
+            (entry.item for entry in raw_entries),
+            (entry.item for entry in stat_entries),
+        ),
+        cache,
+    )
+    value_type_ids = await _resolve_value_type_ids(session, stat_entries, cache)
+    rows = summary.observe(_iter_raw_rows(file_data.id, file_data.post_date, raw_entries, item_ids))
+    if blobs is not None:
+        # Blobs are written once the whole file has been read.
+        raw_count = blobs.extend(rows)
+    else:
+        raw_count = await _insert_raw_records(session, rows)
+    stat_count = await _insert_stat_measurements(
+        session, file_data.id, file_data.post_date, stat_entries, item_ids, value_type_ids
+    )
+    trends.observe(
+        file_data.post_time,
+        file_data.node_id,
+        file_data.module_id,
+        _stat_trend_values(stat_entries, item_ids, value_type_ids),
+    )
+    return raw_count, stat_count
+
+
+async def _resolve_class_counts(
+    session: AsyncSession,
+    class_counts: dict[str, int],
+    cache: DimensionCacheScope,
+) -> dict[int, int]:
+    class_ids = await _resolve_dimension_ids(
+        session, DetectionClass, ("name",), class_counts.keys(), cache
+    )
+    return {class_ids[name]: count for name, count in class_counts.items()}
+
+
+_STREAM_RECORD_MODELS: dict[str, type[BaseModel]] = {
+    "raw": PipelineRawMeasurement,
+    "stat": PipelineStatMeasurement,
+    "class_count": FileClassCountPayload,
+}
+
+
+async def _iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int | None = None,
+) -> AsyncIterator[tuple[int, bytes]]:
+    """Split a byte stream into numbered NDJSON lines, skipping blank ones.
+
+    A line longer than ``max_line_bytes`` is rejected with 413 as soon as it
+    is seen, so a body without newlines is never buffered whole.
+    """
+
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if max_line_bytes is not None and len(line) > max_line_bytes:
+                raise _line_too_long(line_no, max_line_bytes)
+            if line.strip():
+                yield line_no, line
+        if max_line_bytes is not None and len(buffer) > max_line_bytes:
+            raise _line_too_long(line_no + 1, max_line_bytes)
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+def _line_too_long(line_no: int, max_line_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"NDJSON line {line_no} exceeds {max_line_bytes} bytes",
+    )
+
+
+def _stream_error(
+    line_no: int,
+    errors: list[dict[str, Any]],
+    header: Any = None,
+) -> RequestValidationError:
+    located = [{**err, "loc": ("body", line_no, *err.get("loc", ()))} for err in errors]
+    return RequestValidationError(located, body=header)
+
+
+def _decode_stream_line(line_no: int, line: bytes, header: Any = None) -> dict[str, Any]:
+    try:
+        decoded = json_loads(line)
+    except ValueError as exc:
+        raise _stream_error(
+            line_no, [{"loc": (), "msg": f"Invalid JSON: {exc}", "type": "json_invalid"}], header
+        ) from exc
+    if not isinstance(decoded, dict):
+        raise _stream_error(
+            line_no, [{"loc": (), "msg": "Each line must be a JSON object", "type": "dict_type"}], header
+        )
+    return decoded
+
+
+def _parse_stream_record(line_no: int, line: bytes, header: Any) -> BaseModel:
+    decoded = _decode_stream_line(line_no, line, header)
+    kind = decoded.pop("type", None)
+    model = _STREAM_RECORD_MODELS.get(kind) if isinstance(kind, str) else None
+    if model is None:
+        raise _stream_error(
+            line_no,
+            [
+                {
+                    "loc": ("type",),
+                    "msg": f"type must be one of {sorted(_STREAM_RECORD_MODELS)}",
+                    "type": "literal_error",
+                    "input": kind,
+                }
+            ],
+            header,
+        )
+    try:
+        return model.model_validate(decoded)
+    except ValidationError as exc:
+        raise _stream_error(line_no, exc.errors(include_url=False), header) from exc
+
+
+RawRowBuilder = Callable[[int, date, dict[tuple[str, str, str], int]], Iterable[dict[str, Any]]]
+
+
+async def _write_measurement_file(
+    session: AsyncSession,
+    file_payload: MeasurementFileCreate,
+    file_hash: str,
+    cache: DimensionCacheScope,
+    *,
+    mode: IngestMode,
+    item_links: Iterable[MeasurementItemLink],
+    raw_rows: RawRowBuilder,
+    stat_entries: list[PipelineStatMeasurement],
+    class_counts: dict[str, int],
+    timer: IngestTimer,
+) -> MeasurementPipelineResult:
+    """Write one file and its measurements inside the caller's transaction."""
+
+    changes = MeasurementDiffSummary() if mode == "diff" else None
+    trends = _StatTrendRollup()
+    with timer.stage("file"):
+        file_data = await _upsert_measurement_file(
+            session,
+            file_payload,
+            file_hash,
+            cache,
+            trends,
+            clear_existing=mode == "replace",
+            changes=changes,
+        )
+    with timer.stage("dimensions"):
+        counts = await _resolve_class_counts(session, class_counts, cache)
+        item_ids = await _resolve_item_ids(
+            session,
+            chain(item_links, (entry.item for entry in stat_entries)),
+            cache,
+        )
+        value_type_ids = await _resolve_value_type_ids(session, stat_entries, cache)
+    summary = _FileSummaryBuilder()
+    post_date = file_data.post_date
+    rows = summary.observe(raw_rows(file_data.id, post_date, item_ids))
+    with timer.stage("raw"):
+        if file_data.raw_storage is RawStorage.BLOB:
+            blobs = RawBlobBuilder()
+            raw_count = blobs.extend(rows)
+            await _write_raw_blobs(session, file_data.id, blobs, changes)
+        elif changes is not None:
+            raw_count = await _diff_raw_records(session, file_data.id, post_date, rows, changes)
+        else:
+            raw_count = await _insert_raw_records(session, rows)
+    if changes is not None:
+        with timer.stage("stat"):
+            stat_count = await _diff_stat_measurements(
+                session, file_data.id, post_date, stat_entries, item_ids, value_type_ids, changes
+            )
+        with timer.stage("class_counts"):
+            await _diff_class_counts(session, file_data.id, counts, changes)
+    else:
+        with timer.stage("stat"):
+            stat_count = await _insert_stat_measurements(
+                session, file_data.id, post_date, stat_entries, item_ids, value_type_ids
+            )
+        with timer.stage("class_counts"):
+            await _insert_class_counts(session, file_data.id, counts)
+    with timer.stage("summary"):
+        await _write_file_summary(session, file_data.id, summary, stat_count)
+        trends.observe(
+            file_data.post_time,
+            file_data.node_id,
+            file_data.module_id,
+            _stat_trend_values(stat_entries, item_ids, value_type_ids),
+        )
+        await _flush_stat_trends(session, trends)
+
+    return MeasurementPipelineResult(
+        file=_build_file_read(file_data, file_payload),
+        raw_records=raw_count,
+        stat_measurements=stat_count,
+        changes=changes,
+    )
+
+
+async def _ingest_file(
+    session: AsyncSession,
+    file_payload: MeasurementFileCreate,
+    *,
+    payload_bytes: int = 0,
+    **write_options: Any,
+) -> MeasurementPipelineResult:
+    """Take the file-hash lock and write one file in its own transaction."""
+
+    timer = IngestTimer(payload_bytes)
+    file_hash = _compute_file_hash(file_payload)
+    lock_key = _build_lock_key(file_hash)
+    cache = dimension_cache.scope()
+    try:
+        async with _hold_file_locks(lock_key, timer=timer):
+            try:
+                async with session.begin() as transaction:
+                    result = await _write_measurement_file(
+                        session, file_payload, file_hash, cache, timer=timer, **write_options
+                    )
+                    with timer.stage("commit"):
+                        await transaction.commit()
+                cache.publish()
+            finally:
+                cache.discard()
+    except Exception:
+        timer.record_failure(file_payload.node_name, file_payload.module_name)
+        raise
+    timer.record(
+        file_payload.node_name, file_payload.module_name, result.raw_records + result.stat_measurements
+    )
+    return result
+
+
+async def _ingest_pipeline(
+    session: AsyncSession,
+    payload: MeasurementPipelineCreate,
+    mode: IngestMode,
+    payload_bytes: int = 0,
+) -> MeasurementPipelineResult:
+    return await _ingest_file(
+        session,
+        payload.file,
+        payload_bytes=payload_bytes,
+        mode=mode,
+        item_links=(entry.item for entry in payload.raw_measurements),
+        raw_rows=lambda file_id, post_date, item_ids: _iter_raw_rows(
+            file_id, post_date, payload.raw_measurements, item_ids
+        ),
+        stat_entries=payload.stat_measurements,
+        class_counts=payload.class_counts,
+    )
+
+
+async def _process_spooled_job(payload_json: str, mode: str) -> str:
+    if settings.ingest_fast_validation:
+        payload = validate_pipeline_fast(json_loads(payload_json))
+    else:
+        payload = MeasurementPipelineCreate.model_validate_json(payload_json)
+    async with AsyncSessionMaker() as session:
+        result = await _ingest_pipeline(session, payload, mode, len(payload_json))  # type: ignore[arg-type]
+    return result.model_dump_json()
+
+
+ingest_job_workers = SpoolWorkerPool(ingest_spool, _process_spooled_job, settings.ingest_workers)
+
+
+def _iter_columnar_rows(
+    file_id: int,
+    post_date: date,
+    raw: ColumnarRawMeasurements | None,
+    item_links: list[MeasurementItemLink],
+    item_ids: dict[tuple[str, str, str], int],
+) -> Iterator[dict[str, Any]]:
+    if raw is None:
+        return
+    index_ids = [item_ids[_item_link_key(link)] for link in item_links]
+    measurable = raw.measurable if raw.measurable is not None else repeat(1)
+    for item_idx, is_measurable, x_index, y_index, x_0, y_0, x_1, y_1, value in zip(
+        raw.item_idx,
+        measurable,
+        raw.x_index,
+        raw.y_index,
+        raw.x_0,
+        raw.y_0,
+        raw.x_1,
+        raw.y_1,
+        raw.value,
+    ):
+        yield {
+            "file_id": file_id,
+            "item_id": index_ids[item_idx],
+            "post_date": post_date,
+            "measurable": bool(is_measurable),
+            "x_index": x_index,
+            "y_index": y_index,
+            "x_0": x_0,
+            "y_0": y_0,
+            "x_1": x_1,
+            "y_1": y_1,
+            "value": value,
+        }
+
+
+def _content_length(request: Request) -> int:
+    try:
+        return int(request.headers.get("content-length", 0))
+    except ValueError:
+        return 0
+
+
+async def _decode_json_body(request: Request) -> Any:
+    body = await request.body()
+    try:
+        return json_loads(body)
+    except ValueError as exc:
+        # Same entry FastAPI produces for a malformed JSON body.
+        raise RequestValidationError(
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ("body", getattr(exc, "pos", 0)),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": getattr(exc, "msg", str(exc))},
+                }
+            ],
+            body=body,
+        ) from exc
+
+
+def _body_validation_error(errors: list[Any], body: Any, *prefix: int) -> RequestValidationError:
+    located = [{**err, "loc": ("body", *prefix, *err["loc"])} for err in errors]
+    return RequestValidationError(located, body=body)
+
+
+async def _fast_pipeline_payload(request: Request) -> MeasurementPipelineCreate:
+    """Body dependency used instead of FastAPI's model parsing when fast validation is on."""
+
+    data = await _decode_json_body(request)
+    try:
+        return validate_pipeline_fast(data)
+    except ValidationError as exc:
+        raise _body_validation_error(exc.errors(include_url=False), data) from exc
+
+
+async def _fast_pipeline_payloads(request: Request) -> list[MeasurementPipelineCreate]:
+    data = await _decode_json_body(request)
+    if not isinstance(data, list):
+        # Echo only the type: the body may be a whole multi-megabyte pipeline.
+        raise _body_validation_error(
+            [{"type": "list_type", "loc": (), "msg": "Input should be a valid list", "input": type(data).__name__}],
+            data,
+        )
+    payloads: list[MeasurementPipelineCreate] = []
+    errors: list[Any] = []
+    for index, entry in enumerate(data):
+        try:
+            payloads.append(validate_pipeline_fast(entry))
+        except ValidationError as exc:
+            errors.extend(
+                {**err, "loc": (index, *err["loc"])} for err in exc.errors(include_url=False)
+            )
+    if errors:
+        raise _body_validation_error(errors, data)
+    return payloads
+
+
+# Fast validation swaps the body parameter for a dependency that reads the
+# request itself, so the request body schema is declared by hand.
+if settings.ingest_fast_validation:
+    PipelinePayload = Annotated[MeasurementPipelineCreate, Depends(_fast_pipeline_payload)]
+    PipelinePayloads = Annotated[list[MeasurementPipelineCreate], Depends(_fast_pipeline_payloads)]
+    _PIPELINE_BODY_OPENAPI: dict[str, Any] | None = {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"$ref": "#/components/schemas/MeasurementPipelineCreate"}}
+            },
+        }
+    }
+    _PIPELINE_BATCH_BODY_OPENAPI: dict[str, Any] | None = {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/MeasurementPipelineCreate"},
+                    }
+                }
+            },
+        }
+    }
+else:
+    PipelinePayload = MeasurementPipelineCreate  # type: ignore[misc]
+    PipelinePayloads = list[MeasurementPipelineCreate]  # type: ignore[misc]
+    _PIPELINE_BODY_OPENAPI = None
+    _PIPELINE_BATCH_BODY_OPENAPI = None
 
 
 @router.post(
     "/",
     status_code=status.HTTP_201_CREATED,
     response_model=MeasurementPipelineResult,
+    openapi_extra=_PIPELINE_BODY_OPENAPI,
 )
 async def ingest_measurement_results(
-    payload: MeasurementPipelineCreate,
+    payload: PipelinePayload,
+    request: Request,
+    mode: IngestMode = Query(
+        "replace",
+        description="`diff` rewrites only the rows that changed when the file_hash already exists.",
+    ),
     session: AsyncSession = Depends(get_session),
 ) -> MeasurementPipelineResult:
-    raw_count = 0
-    stat_count = 0
+    return await _ingest_pipeline(session, payload, mode, _content_length(request))
 
-    file_hash = _compute_file_hash(payload.file)
-    lock_key = _build_lock_key(file_hash)
-    await _acquire_file_lock(session, lock_key)
-    try:
-        async with session.begin():
-            node_cache: dict[str, MeasurementNode] = {}
-            module_cache: dict[str, MeasurementModule] = {}
-            version_cache: dict[str, MeasurementVersion] = {}
-            directory_cache: dict[tuple[str, ...], MeasurementDirectory] = {}
-
-            existing_stmt = (
-                select(MeasurementFile.id)
-                .where(MeasurementFile.file_hash == file_hash)
-                .limit(1)
-            )
-            result = await session.execute(existing_stmt)
-            file_id = result.scalars().first()
-            file_data = None
-            if file_id is not None:
-                result = await session.execute(
-                    select(MeasurementFile)
-                    .where(MeasurementFile.id == file_id)
-                    .with_for_update(nowait=False)
-                )
-                file_data = result.scalars().first()
-            node = await _get_or_create_node(session, payload.file.node_name, node_cache)
-            module = await _get_or_create_module(session, payload.file.module_name, module_cache)
-            version = await _get_or_create_version(
-                session, payload.file.version_name, version_cache
-            )
-            directory = await _get_or_create_directory_path(
-                session,
-                [payload.file.parent_dir_0, payload.file.parent_dir_1, payload.file.parent_dir_2],
-                directory_cache,
+
+@router.post(
+    "/columnar",
+    status_code=status.HTTP_201_CREATED,
+    response_model=MeasurementPipelineResult,
+)
+async def ingest_measurement_results_columnar(
+    payload: MeasurementColumnarCreate,
+    request: Request,
+    mode: IngestMode = Query(
+        "replace",
+        description="`diff` rewrites only the rows that changed when the file_hash already exists.",
+    ),
+    session: AsyncSession = Depends(get_session),
+) -> MeasurementPipelineResult:
+    """Ingest raw points sent as parallel columns against a declared item table.
+
+    Columns are JSON arrays or base64 little-endian buffers (int32 for
+    ``item_idx``/``x_index``/``y_index``, float64 for coordinates and
+    ``value``, uint8 for ``measurable``) and go straight to the bulk insert.
+    """
+
+    return await _ingest_file(
+        session,
+        payload.file,
+        payload_bytes=_content_length(request),
+        mode=mode,
+        item_links=payload.items,
+        raw_rows=lambda file_id, post_date, item_ids: _iter_columnar_rows(
+            file_id, post_date, payload.raw, payload.items, item_ids
+        ),
+        stat_entries=payload.stat_measurements,
+        class_counts=payload.class_counts,
+    )
+
+
+async def _prime_batch_dimensions(
+    session: AsyncSession,
+    payloads: list[MeasurementPipelineCreate],
+    cache: DimensionCacheScope,
+) -> None:
+    # Every dimension row is created before any per-file savepoint, so rolling
+    # back one file can never drop a row whose id is pending in the cache.
+    for payload in payloads:
+        await _get_or_create_node(session, payload.file.node_name, cache)
+        await _get_or_create_module(session, payload.file.module_name, cache)
+        await _get_or_create_version(session, payload.file.version_name, cache)
+        await _get_or_create_directory_path(
+            session,
+            [payload.file.parent_dir_0, payload.file.parent_dir_1, payload.file.parent_dir_2],
+            cache,
+        )
+    await _resolve_item_ids(
+        session,
+        chain.from_iterable(
+            chain(
+                (entry.item for entry in payload.raw_measurements),
+                (entry.item for entry in payload.stat_measurements),
             )
+            for payload in payloads
+        ),
+        cache,
+    )
+    await _resolve_value_type_ids(
+        session,
+        chain.from_iterable(payload.stat_measurements for payload in payloads),
+        cache,
+    )
+    await _resolve_dimension_ids(
+        session,
+        DetectionClass,
+        ("name",),
+        chain.from_iterable(payload.class_counts for payload in payloads),
+        cache,
+    )
 
-            if file_data is None:
-                file_data = MeasurementFile(
-                    post_time=payload.file.post_time,
-                    file_path=payload.file.file_path,
-                    file_name=payload.file.file_name,
-                    file_hash=file_hash,
-                    processing_ms=payload.file.processing_ms,
-                    status=FileStatus(payload.file.status),
-                )
-                session.add(file_data)
-                await session.flush()
-                await session.refresh(file_data)
-            else:
-                file_data.post_time = payload.file.post_time
-                file_data.file_path = payload.file.file_path
-                file_data.file_name = payload.file.file_name
-                file_data.processing_ms = payload.file.processing_ms
-                file_data.status = FileStatus(payload.file.status)
-                await _clear_existing_measurement_data(session, file_data.id)
-
-            file_data.file_hash = file_hash
-            file_data.node_id = node.id if node else None
-            file_data.module_id = module.id if module else None
-            file_data.version_id = version.id if version else None
-            file_data.directory_id = directory.id if directory else None
-
-            metric_cache: dict[tuple[str, str | None], MeasurementMetricType] = {}
-            item_cache: dict[tuple[str, str, int], MeasurementItem] = {}
-            value_type_cache: dict[str, StatValueType] = {}
-
-            for raw_entry in payload.raw_measurements:
-                metric_type = await _get_or_create_metric_type(
-                    session, raw_entry.item.metric_type, metric_cache
-                )
-                item = await _get_or_create_item(session, raw_entry.item, metric_type, item_cache)
-                record = RawMeasurementRecord(
-                    file_id=file_data.id,
-                    item_id=item.id,
-                    measurable=raw_entry.measurable,
-                    x_index=raw_entry.x_index,
-                    y_index=raw_entry.y_index,
-                    x_0=raw_entry.x_0,
-                    y_0=raw_entry.y_0,
-                    x_1=raw_entry.x_1,
-                    y_1=raw_entry.y_1,
-                    value=raw_entry.value,
-                )
-                session.add(record)
-                raw_count += 1
 
-            for stat_entry in payload.stat_measurements:
-                metric_type = await _get_or_create_metric_type(
-                    session, stat_entry.item.metric_type, metric_cache
-                )
-                item = await _get_or_create_item(session, stat_entry.item, metric_type, item_cache)
-                measurement = StatMeasurement(
-                    file_id=file_data.id,
-                    item_id=item.id,
-                )
-                session.add(measurement)
-                await session.flush()
+def _describe_error(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        message = str(exc.detail)
+    elif isinstance(exc, DBAPIError) and exc.orig is not None:
+        message = str(exc.orig)
+    else:
+        message = str(exc) or type(exc).__name__
+    return message[:500]
 
-                values = []
-                for value_payload in stat_entry.values:
-                    value_type = await _get_or_create_value_type(
-                        session, value_payload.value_type_name, value_type_cache
-                    )
-                    values.append(
-                        StatMeasurementValue(
-                            stat_measurement_id=measurement.id,
-                            value_type_id=value_type.id,
-                            value=value_payload.value,
+
+@router.post(
+    "/batch",
+    response_model=MeasurementBatchResult,
+    openapi_extra=_PIPELINE_BATCH_BODY_OPENAPI,
+)
+async def ingest_measurement_results_batch(
+    payloads: PipelinePayloads,
+    mode: IngestMode = Query(
+        "replace",
+        description="`diff` rewrites only the rows that changed when the file_hash already exists.",
+    ),
+    transaction: Literal["per_file", "all_or_nothing"] = Query(
+        "per_file",
+        description="`per_file` isolates each file in a savepoint; `all_or_nothing` rolls back the whole batch on the first error.",
+    ),
+    session: AsyncSession = Depends(get_session),
+) -> MeasurementBatchResult:
+    """Ingest many small files with one lock round, one dimension pass and one commit."""
+
+    if len(payloads) > settings.batch_max_files:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.batch_max_files} files",
+        )
+
+    file_hashes = [_compute_file_hash(payload.file) for payload in payloads]
+    lock_keys = sorted({_build_lock_key(file_hash) for file_hash in file_hashes})
+    cache = dimension_cache.scope()
+    files: list[MeasurementBatchItemResult] = []
+    # Lock wait and commit are shared by the batch, so per-file metrics cover
+    # only the write stages and are published once the batch committed.
+    timers: list[tuple[IngestTimer, MeasurementFileCreate, MeasurementPipelineResult]] = []
+    async with _hold_file_locks(*lock_keys):
+        try:
+            async with session.begin() as outer:
+                await _prime_batch_dimensions(session, payloads, cache)
+                for index, (payload, file_hash) in enumerate(zip(payloads, file_hashes)):
+                    timer = IngestTimer()
+                    try:
+                        async with session.begin_nested():
+                            result = await _write_measurement_file(
+                                session,
+                                payload.file,
+                                file_hash,
+                                cache,
+                                mode=mode,
+                                item_links=(entry.item for entry in payload.raw_measurements),
+                                raw_rows=lambda file_id, post_date, item_ids: _iter_raw_rows(
+                                    file_id, post_date, payload.raw_measurements, item_ids
+                                ),
+                                stat_entries=payload.stat_measurements,
+                                class_counts=payload.class_counts,
+                                timer=timer,
+                            )
+                    except Exception as exc:
+                        timer.record_failure(payload.file.node_name, payload.file.module_name)
+                        logger.exception("batch ingest failed for file_path=%s", payload.file.file_path)
+                        files.append(
+                            MeasurementBatchItemResult(
+                                index=index,
+                                file_name=payload.file.file_name,
+                                status="error",
+                                error=_describe_error(exc),
+                            )
                         )
-                    )
-                session.add_all(values)
-                stat_count += 1
-
-            for class_name, count in payload.class_counts.items():
-                class_stmt = select(DetectionClass).where(DetectionClass.name == class_name)
-                class_result = await session.execute(class_stmt)
-                det_class = class_result.scalars().first()
-                if det_class is None:
-                    det_class = DetectionClass(name=class_name)
-                    session.add(det_class)
-                    await session.flush()
-
-                stmt = select(FileClassCount).where(
-                    FileClassCount.file_id == file_data.id,
-                    FileClassCount.class_id == det_class.id,
-                )
-                result = await session.execute(stmt)
-                existing = result.scalars().first()
-                if existing:
-                    existing.cnt = count
-                else:
-                    session.add(
-                        FileClassCount(
-                            file_id=file_data.id,
-                            class_id=det_class.id,
-                            cnt=count,
+                        if transaction == "all_or_nothing":
+                            await outer.rollback()
+                            break
+                        continue
+                    timer.stop()
+                    timers.append((timer, payload.file, result))
+                    files.append(
+                        MeasurementBatchItemResult(
+                            index=index,
+                            file_name=payload.file.file_name,
+                            status="ok",
+                            result=result,
                         )
                     )
+            errors = {entry.index: entry for entry in files if entry.status == "error"}
+            if transaction == "all_or_nothing" and errors:
+                files = [
+                    errors.get(index)
+                    or MeasurementBatchItemResult(
+                        index=index,
+                        file_name=payload.file.file_name,
+                        status="rolled_back",
+                    )
+                    for index, payload in enumerate(payloads)
+                ]
+            else:
+                cache.publish()
+                for timer, file_payload, result in timers:
+                    timer.record(
+                        file_payload.node_name,
+                        file_payload.module_name,
+                        result.raw_records + result.stat_measurements,
+                    )
+        finally:
+            cache.discard()
+
+    succeeded = sum(1 for entry in files if entry.status == "ok")
+    return MeasurementBatchResult(
+        transaction=transaction,
+        succeeded=succeeded,
+        failed=len(files) - succeeded,
+        files=files,
+    )
+
+
+def _build_job_read(job: SpooledJob) -> MeasurementJobRead:
+    return MeasurementJobRead(
+        id=job.id,
+        status=job.status,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        result=MeasurementPipelineResult.model_validate_json(job.result) if job.result else None,
+        error=job.error,
+    )
+
+
+@router.post(
+    "/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=MeasurementJobRead,
+    openapi_extra=_PIPELINE_BODY_OPENAPI,
+)
+async def enqueue_measurement_results(
+    payload: PipelinePayload,
+    request: Request,
+    response: Response,
+    mode: IngestMode = Query(
+        "replace",
+        description="`diff` rewrites only the rows that changed when the file_hash already exists.",
+    ),
+) -> MeasurementJobRead:
+    """Validate the payload, spool it to disk and return immediately with a job id."""
 
-    finally:
-        await _release_file_lock(session, lock_key)
+    if settings.ingest_workers <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Asynchronous ingest is disabled",
+        )
+    try:
+        if settings.ingest_fast_validation:
+            # Raw points are plain tuples here; spool the validated body as sent.
+            payload_json = (await request.body()).decode()
+        else:
+            payload_json = payload.model_dump_json()
+        job_id = await ingest_spool.enqueue(payload_json, mode)
+    except SpoolFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Ingest queue is full, retry later",
+            headers={"Retry-After": "5"},
+        ) from exc
+    ingest_job_workers.notify()
+    job = await ingest_spool.get(job_id)
+    response.headers["Location"] = f"{router.prefix}/jobs/{job_id}"
+    return _build_job_read(job)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=MeasurementJobRead,
+)
+async def get_measurement_job(job_id: str) -> MeasurementJobRead:
+    job = await ingest_spool.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return _build_job_read(job)
+
+
+@router.post(
+    "/stream",
+    status_code=status.HTTP_201_CREATED,
+    response_model=MeasurementPipelineResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def ingest_measurement_results_stream(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> MeasurementPipelineResult:
+    """Ingest one file from newline-delimited JSON without buffering the body.
+
+    The first line is ``{"file": {...}}``; every following line is a record
+    tagged with ``"type"``: ``raw`` / ``stat`` (same fields as the pipeline
+    payload entries) or ``class_count`` (``class_name`` + ``count``).
+    Records are written in batches of ``STREAM_BATCH_SIZE`` inside a single
+    transaction, so a bad line rolls back the whole file. An existing file
+    with the same hash is always replaced; there is no ``diff`` mode.
+
+    ``RAW_STORAGE=blob`` is rejected: a blob holds all points of one item and
+    would have to be built in memory for the whole file.
+    """
+
+    if settings.raw_storage == RawStorage.BLOB:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Streaming ingest is not available with RAW_STORAGE=blob",
+        )
+    lines = _iter_ndjson_lines(request.stream(), settings.stream_max_line_bytes)
+    first = await anext(lines, None)
+    if first is None:
+        raise _stream_error(1, [{"loc": ("file",), "msg": "Field required", "type": "missing"}])
+    line_no, line = first
+    header = _decode_stream_line(line_no, line)
+    try:
+        file_payload = MeasurementStreamHeader.model_validate(header).file
+    except ValidationError as exc:
+        raise _stream_error(line_no, exc.errors(include_url=False), header) from exc
+
+    raw_count = 0
+    stat_count = 0
+    batch_size = max(settings.stream_batch_size, 1)
+    timer = IngestTimer(len(line) + 1)
+    file_hash = _compute_file_hash(file_payload)
+    lock_key = _build_lock_key(file_hash)
+    cache = dimension_cache.scope()
+    try:
+        async with _hold_file_locks(lock_key, timer=timer):
+            try:
+                async with session.begin() as transaction:
+                    trends = _StatTrendRollup()
+                    with timer.stage("file"):
+                        file_data = await _upsert_measurement_file(
+                            session, file_payload, file_hash, cache, trends, clear_existing=True
+                        )
+                    raw_batch: list[PipelineRawMeasurement] = []
+                    stat_batch: list[PipelineStatMeasurement] = []
+                    class_counts: dict[str, int] = {}
+                    summary = _FileSummaryBuilder()
+                    async for line_no, line in lines:
+                        timer.payload_bytes += len(line) + 1
+                        record = _parse_stream_record(line_no, line, header)
+                        if isinstance(record, PipelineRawMeasurement):
+                            raw_batch.append(record)
+                        elif isinstance(record, PipelineStatMeasurement):
+                            stat_batch.append(record)
+                        else:
+                            class_counts[record.class_name] = record.count
+                        if len(raw_batch) + len(stat_batch) >= batch_size:
+                            with timer.stage("rows"):
+                                raw_written, stat_written = await _insert_measurements(
+                                    session, file_data, raw_batch, stat_batch, cache, summary, trends
+                                )
+                            raw_count += raw_written
+                            stat_count += stat_written
+                            raw_batch = []
+                            stat_batch = []
+                    with timer.stage("rows"):
+                        raw_written, stat_written = await _insert_measurements(
+                            session, file_data, raw_batch, stat_batch, cache, summary, trends
+                        )
+                        raw_count += raw_written
+                        stat_count += stat_written
+                    with timer.stage("class_counts"):
+                        counts = await _resolve_class_counts(session, class_counts, cache)
+                        await _insert_class_counts(session, file_data.id, counts)
+                    with timer.stage("summary"):
+                        await _write_file_summary(session, file_data.id, summary, stat_count)
+                        await _flush_stat_trends(session, trends)
+                    with timer.stage("commit"):
+                        await transaction.commit()
+                cache.publish()
+            finally:
+                cache.discard()
+    except Exception:
+        timer.record_failure(file_payload.node_name, file_payload.module_name)
+        raise
+    timer.record(file_payload.node_name, file_payload.module_name, raw_count + stat_count)
 
     return MeasurementPipelineResult(
-        file=MeasurementFileRead.model_validate(file_data),
+        file=_build_file_read(file_data, file_payload),
         raw_records=raw_count,
         stat_measurements=stat_count,
     )
@@ -0,0 +1,53 @@
+"""Prometheus scrape endpoint."""
+
+from collections.abc import Iterable
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ...core import JSONRoute, dimension_cache, engine, file_locks, metrics_registry, pool_stats, read_engine
+
+
+router = APIRouter(tags=["metrics"], route_class=JSONRoute)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _metric_name(prefix: str, key: str, kind: str) -> str:
+    name = f"{prefix}_{key}"
+    return name if kind == "gauge" or name.endswith("_total") else f"{name}_total"
+
+
+def _runtime_metrics() -> Iterable[tuple[str, str, str, list[tuple[str, dict[str, str], float]]]]:
+    """Current pool, lock and dimension cache values, read at scrape time."""
+
+    pools = [pool_stats(engine), pool_stats(read_engine)]
+    for key, kind, documentation in (
+        ("checked_out", "gauge", "Connections currently checked out."),
+        ("capacity", "gauge", "pool_size + max_overflow."),
+        ("checkouts", "counter", "Connections handed out since start."),
+        ("timeouts", "counter", "Checkouts that hit the pool timeout."),
+        ("wait_seconds_total", "counter", "Time spent waiting for a connection."),
+    ):
+        name = _metric_name("measure_db_pool", key, kind)
+        yield name, kind, documentation, [(name, {"pool": stats["name"]}, stats[key]) for stats in pools]
+    locks = file_locks.stats()
+    for key in ("acquired", "contended", "timeouts", "wait_seconds_total"):
+        name = _metric_name("measure_file_lock", key, "counter")
+        yield name, "counter", f"File ingestion lock {key.replace('_', ' ')}.", [
+            (name, {"backend": str(locks["backend"])}, float(locks[key]))
+        ]
+    cache = dimension_cache.stats()
+    for key, kind in (("size", "gauge"), ("hits", "counter"), ("misses", "counter")):
+        name = _metric_name("measure_dimension_cache", key, kind)
+        yield name, kind, f"Dimension cache {key}.", [(name, {}, float(cache[key]))]
+
+
+metrics_registry.register_collector(_runtime_metrics)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Ingest stage histograms, DB round trips and pool/lock gauges in Prometheus text format."""
+
+    return PlainTextResponse(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,88 @@
+"""Trend endpoint answered from the stat value rollups."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core import JSONRoute, get_read_session
+from ...models import MeasurementModule, MeasurementNode, StatTrendRollup, StatValueType
+from ...schemas import TrendPoint, TrendSeries
+
+
+router = APIRouter(prefix="/trends", tags=["trends"], route_class=JSONRoute)
+
+
+def _build_trend_point(row: Row[Any]) -> TrendPoint:
+    mean = row.value_sum / row.value_count
+    # Population variance from the running sums; clamp rounding noise below zero.
+    variance = max(row.value_sumsq / row.value_count - mean * mean, 0.0)
+    return TrendPoint(
+        bucket_start=row.bucket_start,
+        node=row.node,
+        module=row.module,
+        count=row.value_count,
+        mean=mean,
+        stddev=math.sqrt(variance),
+        min=row.value_min,
+        max=row.value_max,
+    )
+
+
+@router.get("", response_model=TrendSeries)
+async def read_trends(
+    item_id: int,
+    value_type: str = Query(..., description="Stat value type name, e.g. `AVG`."),
+    granularity: Literal["hour", "day"] = "day",
+    start: datetime | None = Query(None, description="Inclusive lower bound on bucket_start."),
+    end: datetime | None = Query(None, description="Exclusive upper bound on bucket_start."),
+    node: str | None = None,
+    module: str | None = None,
+    session: AsyncSession = Depends(get_read_session),
+) -> TrendSeries:
+    """Per-bucket count/mean/stddev/min/max of one item's stat value, per node and module."""
+
+    rollup = StatTrendRollup
+    stmt = (
+        select(
+            rollup.bucket_start,
+            MeasurementNode.name.label("node"),
+            MeasurementModule.name.label("module"),
+            rollup.value_count,
+            rollup.value_sum,
+            rollup.value_sumsq,
+            rollup.value_min,
+            rollup.value_max,
+        )
+        .join(StatValueType, StatValueType.id == rollup.value_type_id)
+        .outerjoin(MeasurementNode, MeasurementNode.id == rollup.node_id)
+        .outerjoin(MeasurementModule, MeasurementModule.id == rollup.module_id)
+        .where(
+            rollup.granularity == granularity,
+            rollup.item_id == item_id,
+            StatValueType.name == value_type,
+            rollup.value_count > 0,
+        )
+        .order_by(rollup.bucket_start, rollup.node_id, rollup.module_id)
+    )
+    if start is not None:
+        stmt = stmt.where(rollup.bucket_start >= start)
+    if end is not None:
+        stmt = stmt.where(rollup.bucket_start < end)
+    if node is not None:
+        stmt = stmt.where(MeasurementNode.name == node)
+    if module is not None:
+        stmt = stmt.where(MeasurementModule.name == module)
+
+    result = await session.execute(stmt)
+    return TrendSeries(
+        item_id=item_id,
+        value_type=value_type,
+        granularity=granularity,
+        points=[_build_trend_point(row) for row in result],
+    )
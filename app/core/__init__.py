@@ -1,7 +1,26 @@
 """Core utilities such as config and database helpers."""
 
+from .cache import DimensionCache, DimensionCacheScope, dimension_cache
 from .config import Settings, get_settings, settings
-from .db import AsyncSessionMaker, engine, get_session
+from .db import (
+    AsyncSessionMaker,
+    ReadSessionMaker,
+    engine,
+    get_read_session,
+    get_session,
+    pool_stats,
+    read_engine,
+)
+from .jsonio import JSONRequest, JSONRoute, json_dumps_line, json_loads
+from .locks import FileLockManager, LockTimeoutError, file_locks
+from .metrics import IngestTimer, MetricsRegistry, metrics_registry
+from .raw_blobs import (
+    DuplicateRawPointError,
+    RawBlobBuilder,
+    RawBlobColumns,
+    decode_raw_blob,
+)
+from .spool import IngestSpool, SpooledJob, SpoolFullError, SpoolWorkerPool, ingest_spool
 
 __all__ = [
     "Settings",
@@ -10,4 +29,30 @@ __all__ = [
     "AsyncSessionMaker",
     "engine",
     "get_session",
+    "ReadSessionMaker",
+    "read_engine",
+    "get_read_session",
+    "pool_stats",
+    "JSONRequest",
+    "JSONRoute",
+    "json_dumps_line",
+    "json_loads",
+    "FileLockManager",
+    "LockTimeoutError",
+    "file_locks",
+    "IngestTimer",
+    "MetricsRegistry",
+    "metrics_registry",
+    "DuplicateRawPointError",
+    "RawBlobBuilder",
+    "RawBlobColumns",
+    "decode_raw_blob",
+    "DimensionCache",
+    "DimensionCacheScope",
+    "dimension_cache",
+    "IngestSpool",
+    "SpooledJob",
+    "SpoolFullError",
+    "SpoolWorkerPool",
+    "ingest_spool",
 ]
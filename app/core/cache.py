@@ -0,0 +1,110 @@
+"""Process-wide natural-key → id cache for dimension tables."""
+
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from collections.abc import Hashable
+
+from .config import settings
+
+
+CacheKey = tuple[str, Hashable]
+
+
+class DimensionCache:
+    """Bounded LRU cache shared by every request in the worker process.
+
+    All operations are synchronous and never await, so they run atomically
+    with respect to other coroutines on the same event loop.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max(max_size, 0)
+        self._entries: OrderedDict[CacheKey, int] = OrderedDict()
+        self._hits: Counter[str] = Counter()
+        self._misses: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, namespace: str, key: Hashable) -> int | None:
+        cache_key = (namespace, key)
+        value = self._entries.get(cache_key)
+        if value is None:
+            self._misses[namespace] += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        self._hits[namespace] += 1
+        return value
+
+    def put(self, namespace: str, key: Hashable, value: int) -> None:
+        if self.max_size == 0:
+            return
+        cache_key = (namespace, key)
+        self._entries[cache_key] = value
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: str | None = None) -> None:
+        if namespace is None:
+            self._entries.clear()
+            return
+        for cache_key in [key for key in self._entries if key[0] == namespace]:
+            del self._entries[cache_key]
+
+    def scope(self) -> DimensionCacheScope:
+        return DimensionCacheScope(self)
+
+    def stats(self) -> dict[str, object]:
+        namespaces = sorted(set(self._hits) | set(self._misses))
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": sum(self._hits.values()),
+            "misses": sum(self._misses.values()),
+            "namespaces": {
+                name: {"hits": self._hits[name], "misses": self._misses[name]}
+                for name in namespaces
+            },
+        }
+
+    def reset_stats(self) -> None:
+        self._hits.clear()
+        self._misses.clear()
+
+
+class DimensionCacheScope:
+    """Transaction-local view over :class:`DimensionCache`.
+
+    Ids of rows created inside the current transaction are kept aside and
+    only published to the shared cache by :meth:`publish` once the
+    transaction has committed, so a rollback never leaves dangling ids behind.
+    """
+
+    def __init__(self, cache: DimensionCache) -> None:
+        self._cache = cache
+        self._pending: dict[CacheKey, int] = {}
+
+    def get(self, namespace: str, key: Hashable) -> int | None:
+        pending = self._pending.get((namespace, key))
+        if pending is not None:
+            return pending
+        return self._cache.get(namespace, key)
+
+    def put(self, namespace: str, key: Hashable, value: int, *, created: bool = False) -> None:
+        if created:
+            self._pending[(namespace, key)] = value
+        else:
+            self._cache.put(namespace, key, value)
+
+    def publish(self) -> None:
+        for (namespace, key), value in self._pending.items():
+            self._cache.put(namespace, key, value)
+        self._pending.clear()
+
+    def discard(self) -> None:
+        self._pending.clear()
+
+
+dimension_cache = DimensionCache(settings.dimension_cache_size)
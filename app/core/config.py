@@ -21,6 +21,43 @@ class Settings(BaseSettings):
     echo_sql: bool = False
     log_dir: str = "logs"
 
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pre_ping: Literal["always", "idle", "never"] = "idle"
+    db_pre_ping_idle_seconds: float = 300.0
+    db_read_pool_size: int = 5
+    db_read_max_overflow: int = 10
+    db_schema_startup: Literal["check", "create", "off"] = "check"
+    db_pool_prewarm: bool = False
+    dimension_cache_prewarm: bool = False
+
+    raw_insert_batch_size: int = 5000
+    dimension_cache_size: int = 10000
+    stream_batch_size: int = 5000
+    stream_max_line_bytes: int = 8_388_608
+    batch_max_files: int = 500
+    raw_read_chunk_size: int = 2000
+    grid_max_cells: int = 16_777_216
+    raw_storage: Literal["rows", "blob"] = "rows"
+    raw_blob_codec: Literal["zlib", "zstd"] = "zlib"
+    raw_blob_level: int = 6
+
+    ingest_spool_dir: str = "spool"
+    ingest_workers: int = 2
+    ingest_spool_max_depth: int = 1000
+    ingest_spool_retention: float = 86400.0
+    ingest_fast_validation: bool = False
+
+    file_lock_backend: Literal["local", "mysql"] = "local"
+    file_lock_stripes: int = 1024
+    file_lock_timeout: float = 30.0
+
+    partition_retention_months: int = 0
+    partition_months_ahead: int = 3
+    partition_maintenance_interval: float = 0.0
+
     model_config = SettingsConfigDict(env_file=".env", env_prefix="", extra="ignore")
 
     @property
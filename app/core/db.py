@@ -1,21 +1,140 @@
 """Database engine and session helpers."""
 
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 
-from .config import settings
+from .config import Settings, settings
+from .metrics import install_round_trip_counter
 
 
-engine: AsyncEngine = create_async_engine(
-    settings.sqlalchemy_url,
-    echo=settings.echo_sql,
-    pool_pre_ping=True,
+class PoolMetrics:
+    """Checkout latency and saturation counters for one connection pool."""
+
+    def __init__(self, name: str, pool_size: int, max_overflow: int) -> None:
+        self.name = name
+        self.capacity = pool_size + max(max_overflow, 0)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.peak_checked_out = 0
+
+    def observe_checkout(self, wait_seconds: float, checked_out: int) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long callers wait for a connection."""
+
+    metrics: PoolMetrics | None = None
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def _install_idle_pre_ping(db_engine: AsyncEngine, idle_seconds: float) -> None:
+    """Ping only connections that sat in the pool longer than ``idle_seconds``."""
+
+    sync_engine = db_engine.sync_engine
+
+    @event.listens_for(sync_engine, "checkin")
+    def _mark_idle(dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _ping_if_idle(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        metrics = getattr(sync_engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.pings += 1
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as error:
+            # The pool invalidates the record and retries with a fresh connection.
+            raise exc.DisconnectionError() from error
+
+
+def build_engine(config: Settings, name: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    """Create an instrumented async engine with the configured pool tuning."""
+
+    db_engine = create_async_engine(
+        config.sqlalchemy_url,
+        echo=config.echo_sql,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pre_ping == "always",
+    )
+    db_engine.sync_engine.pool.metrics = PoolMetrics(name, pool_size, max_overflow)
+    if config.db_pre_ping == "idle":
+        _install_idle_pre_ping(db_engine, config.db_pre_ping_idle_seconds)
+    install_round_trip_counter(db_engine, name)
+    return db_engine
+
+
+def pool_stats(db_engine: AsyncEngine) -> dict[str, Any]:
+    """Return the current occupancy and checkout counters of ``db_engine``'s pool."""
+
+    pool = db_engine.sync_engine.pool
+    metrics: PoolMetrics = pool.metrics
+    checked_out = pool.checkedout()
+    return {
+        "name": metrics.name,
+        "size": pool.size(),
+        "capacity": metrics.capacity,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(checked_out / metrics.capacity, 4) if metrics.capacity else 0.0,
+        "peak_checked_out": metrics.peak_checked_out,
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "idle_pings": metrics.pings,
+        "wait_seconds_total": round(metrics.wait_seconds_total, 6),
+        "wait_seconds_max": round(metrics.wait_seconds_max, 6),
+    }
+
+
+# Ingest writes and read/query traffic use separate pools so long analytical
+# reads cannot exhaust the connections ingest needs. With
+# FILE_LOCK_BACKEND=mysql each running ingest also holds a lock connection
+# from the ingest pool, i.e. two connections per concurrent ingest.
+engine: AsyncEngine = build_engine(
+    settings, "ingest", settings.db_pool_size, settings.db_max_overflow
+)
+read_engine: AsyncEngine = build_engine(
+    settings, "read", settings.db_read_pool_size, settings.db_read_max_overflow
 )
 
 AsyncSessionMaker = async_sessionmaker(
@@ -23,6 +142,11 @@ AsyncSessionMaker = async_sessionmaker(
     expire_on_commit=False,
 )
 
+ReadSessionMaker = async_sessionmaker(
+    read_engine,
+    expire_on_commit=False,
+)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency that yields an async SQLAlchemy session."""
@@ -30,3 +154,9 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionMaker() as session:
         yield session
 
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields a session bound to the read-only pool."""
+
+    async with ReadSessionMaker() as session:
+        yield session
@@ -0,0 +1,72 @@
+"""orjson-backed JSON decoding for request bodies, NDJSON lines and spooled jobs.
+
+Routers are built with ``route_class=JSONRoute`` so FastAPI's body parsing
+goes through :func:`json_loads` instead of the stdlib decoder, and the raw
+body bytes stay reachable from ``request.state.raw_body`` for the
+validation error handler. Responses are encoded by ``ORJSONResponse``, the
+application's default response class.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+_NON_FINITE_TOKENS = ("NaN", "Infinity")
+_NON_FINITE_TOKENS_BYTES = tuple(token.encode() for token in _NON_FINITE_TOKENS)
+
+
+def json_loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Decode ``data`` with orjson.
+
+    Input orjson refuses but :mod:`json` accepts (``NaN``/``Infinity``
+    tokens) is decoded by :mod:`json`. Any other error is orjson's own
+    :class:`json.JSONDecodeError`, so malformed bodies are parsed only once.
+    """
+
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        tokens = _NON_FINITE_TOKENS if isinstance(data, str) else _NON_FINITE_TOKENS_BYTES
+        if not any(token in data for token in tokens):
+            raise
+        return json.loads(data)
+
+
+def json_dumps_line(value: Any) -> bytes:
+    """Encode ``value`` as one newline-terminated NDJSON line."""
+
+    return orjson.dumps(value, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+
+
+class JSONRequest(Request):
+    """Request whose ``json()`` uses :func:`json_loads` and which records the raw body."""
+
+    async def body(self) -> bytes:
+        body = await super().body()
+        # ``state`` lives in the ASGI scope, so the exception handler's own
+        # Request object sees it too.
+        self.state.raw_body = body
+        return body
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = json_loads(await self.body())
+        return self._json
+
+
+class JSONRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(JSONRequest(request.scope, request.receive))
+
+        return route_handler
@@ -0,0 +1,215 @@
+"""File ingestion lock managers (in-process striping, optional MySQL advisory locks)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .config import Settings, settings
+from .db import engine
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when file locks cannot be obtained within the configured timeout."""
+
+
+class LockMetrics:
+    """Wait-time counters for one lock manager."""
+
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.timeouts = 0
+        self.contended = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, wait_seconds: float, contended: bool) -> None:
+        self.acquired += 1
+        self.contended += int(contended)
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "acquired": self.acquired,
+            "contended": self.contended,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+class FileLockManager(ABC):
+    """Serialises ingestion of the same ``file_hash`` lock keys."""
+
+    backend = "none"
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.metrics = LockMetrics()
+
+    @abstractmethod
+    def hold(self, *keys: str) -> AbstractAsyncContextManager[None]:
+        """Hold the locks for ``keys`` for the duration of the ``async with`` block."""
+
+    def stats(self) -> dict[str, object]:
+        return {"backend": self.backend, **self.metrics.stats()}
+
+
+class LocalFileLockManager(FileLockManager):
+    """Striped ``asyncio.Lock`` set for single-node deployments.
+
+    Keys hash onto a fixed number of stripes; multi-key holders take their
+    stripes in index order so overlapping batches cannot deadlock.
+    """
+
+    backend = "local"
+
+    def __init__(self, stripes: int, timeout: float) -> None:
+        super().__init__(timeout)
+        self._stripes = [asyncio.Lock() for _ in range(max(stripes, 1))]
+
+    def _stripe_indexes(self, keys: tuple[str, ...]) -> list[int]:
+        return sorted({zlib.crc32(key.encode("utf-8")) % len(self._stripes) for key in keys})
+
+    async def acquire(self, keys: tuple[str, ...], deadline: float) -> tuple[list[asyncio.Lock], bool]:
+        """Take the stripes for ``keys``; return them with a contention flag."""
+
+        locks = [self._stripes[index] for index in self._stripe_indexes(keys)]
+        contended = any(lock.locked() for lock in locks)
+        taken: list[asyncio.Lock] = []
+        try:
+            for lock in locks:
+                async with asyncio.timeout(max(deadline - time.monotonic(), 0)):
+                    await lock.acquire()
+                taken.append(lock)
+        except TimeoutError as exc:
+            self.release(taken)
+            self.metrics.timeouts += 1
+            raise LockTimeoutError("Could not obtain lock for file ingestion") from exc
+        except BaseException:
+            self.release(taken)
+            raise
+        return taken, contended
+
+    @staticmethod
+    def release(locks: list[asyncio.Lock]) -> None:
+        for lock in reversed(locks):
+            lock.release()
+
+    @asynccontextmanager
+    async def hold(self, *keys: str) -> AsyncIterator[None]:
+        started = time.monotonic()
+        locks, contended = await self.acquire(keys, started + self.timeout)
+        self.metrics.observe(time.monotonic() - started, contended)
+        try:
+            yield
+        finally:
+            self.release(locks)
+
+
+class MySQLFileLockManager(FileLockManager):
+    """MySQL ``GET_LOCK`` advisory locks for multi-node deployments.
+
+    Waiters first queue on the in-process stripes, then poll ``GET_LOCK`` with
+    a zero timeout and back off between attempts, so a blocked ingest never
+    keeps a pooled connection checked out. The winning connection is held
+    until release because advisory locks belong to the connection, so while
+    a lock is held the ingest uses two connections from the ingest pool: the
+    lock connection and its session's. Size ``DB_POOL_SIZE`` +
+    ``DB_MAX_OVERFLOW`` for twice the concurrent ingests, otherwise lock
+    holders can take every connection and wait on the pool for their session.
+    """
+
+    backend = "mysql"
+
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        local: LocalFileLockManager,
+        timeout: float,
+        poll_interval: float = 0.05,
+        max_poll_interval: float = 1.0,
+    ) -> None:
+        super().__init__(timeout)
+        self.engine = db_engine
+        self.local = local
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+    async def _try_get_locks(self, conn: AsyncConnection, keys: list[str]) -> bool:
+        taken: list[str] = []
+        for key in keys:
+            result = await conn.execute(text("SELECT GET_LOCK(:lock_key, 0)"), {"lock_key": key})
+            if result.scalar_one() != 1:
+                await self._release_locks(conn, taken)
+                return False
+            taken.append(key)
+        return True
+
+    @staticmethod
+    async def _release_locks(conn: AsyncConnection, keys: list[str]) -> None:
+        for key in reversed(keys):
+            await conn.execute(text("SELECT RELEASE_LOCK(:lock_key)"), {"lock_key": key})
+        await conn.commit()
+
+    async def _connect_with_locks(
+        self,
+        keys: list[str],
+        deadline: float,
+    ) -> tuple[AsyncConnection, int]:
+        delay = self.poll_interval
+        attempts = 0
+        while True:
+            attempts += 1
+            conn = await self.engine.connect()
+            try:
+                if await self._try_get_locks(conn, keys):
+                    await conn.commit()
+                    return conn, attempts
+            except BaseException:
+                await conn.close()
+                raise
+            await conn.close()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.metrics.timeouts += 1
+                raise LockTimeoutError("Could not obtain lock for file ingestion")
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.max_poll_interval)
+
+    @asynccontextmanager
+    async def hold(self, *keys: str) -> AsyncIterator[None]:
+        ordered = sorted(set(keys))
+        started = time.monotonic()
+        deadline = started + self.timeout
+        locks, contended = await self.local.acquire(tuple(ordered), deadline)
+        try:
+            conn, attempts = await self._connect_with_locks(ordered, deadline)
+            try:
+                self.metrics.observe(time.monotonic() - started, contended or attempts > 1)
+                try:
+                    yield
+                finally:
+                    await self._release_locks(conn, ordered)
+            finally:
+                await conn.close()
+        finally:
+            self.local.release(locks)
+
+
+def build_file_lock_manager(config: Settings, db_engine: AsyncEngine) -> FileLockManager:
+    local = LocalFileLockManager(config.file_lock_stripes, config.file_lock_timeout)
+    if config.file_lock_backend == "mysql":
+        return MySQLFileLockManager(db_engine, local, config.file_lock_timeout)
+    return local
+
+
+file_locks = build_file_lock_manager(settings, engine)
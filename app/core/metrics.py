@@ -0,0 +1,266 @@
+"""In-process ingest and database metrics rendered in Prometheus text format.
+
+Everything here is plain counters and fixed-bucket histograms updated on the
+event loop thread, so an observation is a dict lookup, a bisect and a few
+additions. ``GET /metrics`` renders the current values; nothing is pushed.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+ROWS_PER_SECOND_BUCKETS = (100.0, 1e3, 5e3, 1e4, 2.5e4, 5e4, 1e5, 2.5e5, 5e5, 1e6)
+PAYLOAD_BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 5e7, 1e8, 5e8)
+
+Sample = tuple[str, dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._values.items():
+            yield self.name, dict(zip(self.label_names, labels)), value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: one count per bucket (non-cumulative), then +Inf, sum.
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, series in self._series.items():
+            base = dict(zip(self.label_names, labels))
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), series):
+                cumulative += count
+                yield f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", base, series[-1]
+            yield f"{self.name}_count", base, cumulative
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors that produce samples at scrape time."""
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]] = []
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(
+        self, collector: Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]
+    ) -> None:
+        """Add a callable yielding ``(name, kind, help, samples)`` on each scrape.
+
+        ``kind`` is ``"counter"`` for values that only grow (named ``*_total``)
+        and ``"gauge"`` otherwise.
+        """
+
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        def emit(name: str, kind: str, documentation: str, samples: Iterable[Sample]) -> None:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+
+        for metric in self._metrics:
+            emit(metric.name, metric.kind, metric.documentation, metric.samples())
+        for collector in self._collectors:
+            for name, kind, documentation, samples in collector():
+                emit(name, kind, documentation, samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+ingest_seconds = metrics_registry.histogram(
+    "measure_ingest_seconds",
+    "Wall time of one file ingest, lock wait and commit included.",
+    ("node", "module"),
+)
+ingest_stage_seconds = metrics_registry.histogram(
+    "measure_ingest_stage_seconds",
+    "Wall time spent in each ingest stage.",
+    ("stage", "node", "module"),
+)
+ingest_rows_per_second = metrics_registry.histogram(
+    "measure_ingest_rows_per_second",
+    "Raw points plus stat sets written per second of ingest wall time.",
+    ("node", "module"),
+    ROWS_PER_SECOND_BUCKETS,
+)
+ingest_payload_bytes = metrics_registry.histogram(
+    "measure_ingest_payload_bytes",
+    "Request body size of ingested files.",
+    ("node", "module"),
+    PAYLOAD_BYTES_BUCKETS,
+)
+ingest_failures = metrics_registry.counter(
+    "measure_ingest_failures_total",
+    "File ingests that raised before committing.",
+    ("node", "module"),
+)
+db_round_trips = metrics_registry.counter(
+    "measure_db_round_trips_total",
+    "Statements sent to the database, by pool and statement kind.",
+    ("pool", "statement"),
+)
+db_seconds = metrics_registry.counter(
+    "measure_db_seconds_total",
+    "Time spent waiting on statement execution, by pool.",
+    ("pool",),
+)
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer: IngestTimer, name: str) -> None:
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.timer.add(self.name, time.perf_counter() - self.started)
+
+
+class IngestTimer:
+    """Per-file stage stopwatch; :meth:`record` publishes it once the file committed.
+
+    Stages repeat freely (the stream path writes several batches), their
+    times add up.
+    """
+
+    __slots__ = ("stages", "started", "stopped", "payload_bytes")
+
+    def __init__(self, payload_bytes: int = 0) -> None:
+        self.stages: dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.stopped: float | None = None
+        self.payload_bytes = payload_bytes
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def stop(self) -> None:
+        """Freeze the total, for files recorded only after a shared commit."""
+
+        self.stopped = time.perf_counter()
+
+    def record(self, node: str | None, module: str | None, rows: int) -> None:
+        elapsed = (self.stopped or time.perf_counter()) - self.started
+        labels = (node or "", module or "")
+        ingest_seconds.observe(elapsed, *labels)
+        for name, seconds in self.stages.items():
+            ingest_stage_seconds.observe(seconds, name, *labels)
+        if elapsed > 0:
+            ingest_rows_per_second.observe(rows / elapsed, *labels)
+        if self.payload_bytes:
+            ingest_payload_bytes.observe(self.payload_bytes, *labels)
+
+    def record_failure(self, node: str | None, module: str | None) -> None:
+        ingest_failures.inc(node or "", module or "")
+
+
+_STATEMENT_KINDS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+def _statement_kind(statement: str) -> str:
+    head = statement[:16].lstrip().upper()
+    for kind in _STATEMENT_KINDS:
+        if head.startswith(kind):
+            return kind.lower()
+    return "other"
+
+
+def install_round_trip_counter(db_engine: AsyncEngine, pool_name: str) -> None:
+    """Count every cursor execution of ``db_engine`` and time it."""
+
+    sync_engine = db_engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info["measure_query_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        started = conn.info.pop("measure_query_started", None)
+        db_round_trips.inc(pool_name, _statement_kind(statement))
+        if started is not None:
+            db_seconds.inc(pool_name, amount=time.perf_counter() - started)
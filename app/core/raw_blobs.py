@@ -0,0 +1,184 @@
+"""Compressed columnar encoding for raw point sets stored one blob per (file, item).
+
+A blob is the concatenation of eight little-endian columns in
+:data:`BLOB_COLUMNS` order, points sorted by ``(x_index, y_index)``. Multi-byte
+columns are byte-shuffled (all first bytes, then all second bytes, ...) before
+compression, which groups the slowly varying exponent bytes of doubles and
+the high bytes of indices so zlib/zstd find long runs. The point count lives
+in the blob's metadata row, so the payload carries no header.
+"""
+
+from __future__ import annotations
+
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from hashlib import sha256
+from typing import Any, Literal
+
+try:  # optional: zlib is always available, zstd needs the zstandard package
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+RawBlobCodec = Literal["zlib", "zstd"]
+
+BLOB_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("measurable", "B"),
+    ("x_index", "i"),
+    ("y_index", "i"),
+    ("x_0", "d"),
+    ("y_0", "d"),
+    ("x_1", "d"),
+    ("y_1", "d"),
+    ("value", "d"),
+)
+
+
+class DuplicateRawPointError(ValueError):
+    """Raised when one item carries the same ``(x_index, y_index)`` twice."""
+
+
+@dataclass(slots=True)
+class RawBlobColumns:
+    measurable: array = field(default_factory=lambda: array("B"))
+    x_index: array = field(default_factory=lambda: array("i"))
+    y_index: array = field(default_factory=lambda: array("i"))
+    x_0: array = field(default_factory=lambda: array("d"))
+    y_0: array = field(default_factory=lambda: array("d"))
+    x_1: array = field(default_factory=lambda: array("d"))
+    y_1: array = field(default_factory=lambda: array("d"))
+    value: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def append(self, row: dict[str, Any]) -> None:
+        self.measurable.append(1 if row["measurable"] else 0)
+        for name, _ in BLOB_COLUMNS[1:]:
+            getattr(self, name).append(row[name])
+
+    def points(self) -> Iterator[tuple[Any, ...]]:
+        """Yield ``(measurable, x_index, y_index, x_0, y_0, x_1, y_1, value)`` tuples."""
+
+        for measurable, *rest in zip(*(getattr(self, name) for name, _ in BLOB_COLUMNS)):
+            yield (bool(measurable), *rest)
+
+
+@dataclass(slots=True)
+class EncodedRawBlob:
+    codec: RawBlobCodec
+    point_count: int
+    measurable_count: int
+    value_min: float
+    value_max: float
+    checksum: str
+    payload: bytes
+
+
+def _shuffle(data: bytes, itemsize: int) -> bytes:
+    if itemsize == 1:
+        return data
+    return b"".join(data[offset::itemsize] for offset in range(itemsize))
+
+
+def _unshuffle(data: bytes, itemsize: int) -> bytes:
+    if itemsize == 1:
+        return data
+    out = bytearray(len(data))
+    lane = len(data) // itemsize
+    for offset in range(itemsize):
+        out[offset::itemsize] = data[offset * lane : (offset + 1) * lane]
+    return bytes(out)
+
+
+def _compress(data: bytes, codec: RawBlobCodec, level: int) -> bytes:
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    if zstandard is None:
+        raise RuntimeError("RAW_BLOB_CODEC=zstd requires the 'zstandard' package")
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _decompress(payload: bytes, codec: str) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(payload)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("reading zstd raw blobs requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"unknown raw blob codec {codec!r}")
+
+
+def encode_raw_blob(columns: RawBlobColumns, codec: RawBlobCodec, level: int) -> EncodedRawBlob:
+    """Sort, validate and compress one item's points."""
+
+    count = len(columns)
+    order = sorted(range(count), key=lambda i: (columns.x_index[i], columns.y_index[i]))
+    for previous, current in zip(order, order[1:]):
+        if (columns.x_index[previous], columns.y_index[previous]) == (
+            columns.x_index[current],
+            columns.y_index[current],
+        ):
+            raise DuplicateRawPointError(
+                f"duplicate raw point x_index={columns.x_index[current]} y_index={columns.y_index[current]}"
+            )
+
+    in_order = all(index == position for position, index in enumerate(order))
+    parts: list[bytes] = []
+    for name, typecode in BLOB_COLUMNS:
+        source = getattr(columns, name)
+        column = array(typecode, source) if in_order else array(typecode, (source[i] for i in order))
+        if sys.byteorder == "big":
+            column.byteswap()
+        parts.append(_shuffle(column.tobytes(), column.itemsize))
+    data = b"".join(parts)
+    return EncodedRawBlob(
+        codec=codec,
+        point_count=count,
+        measurable_count=sum(columns.measurable),
+        value_min=min(columns.value),
+        value_max=max(columns.value),
+        checksum=sha256(data).hexdigest(),
+        payload=_compress(data, codec, level),
+    )
+
+
+def decode_raw_blob(payload: bytes, codec: str, point_count: int) -> RawBlobColumns:
+    data = _decompress(payload, codec)
+    columns = RawBlobColumns()
+    offset = 0
+    for name, typecode in BLOB_COLUMNS:
+        column: array = getattr(columns, name)
+        size = column.itemsize * point_count
+        column.frombytes(_unshuffle(data[offset : offset + size], column.itemsize))
+        if sys.byteorder == "big":
+            column.byteswap()
+        offset += size
+    if offset != len(data):
+        raise ValueError("raw blob length does not match its point count")
+    return columns
+
+
+class RawBlobBuilder:
+    """Collect raw rows per item as typed columns, ready for :func:`encode_raw_blob`."""
+
+    def __init__(self) -> None:
+        self.items: dict[int, RawBlobColumns] = {}
+
+    def extend(self, rows: Iterable[dict[str, Any]]) -> int:
+        count = 0
+        for row in rows:
+            columns = self.items.get(row["item_id"])
+            if columns is None:
+                columns = self.items[row["item_id"]] = RawBlobColumns()
+            columns.append(row)
+            count += 1
+        return count
+
+    def encode(self, codec: RawBlobCodec, level: int) -> Iterator[tuple[int, EncodedRawBlob]]:
+        for item_id, columns in self.items.items():
+            yield item_id, encode_raw_blob(columns, codec, level)
@@ -0,0 +1,288 @@
+"""Monthly partition upkeep and retention for the raw/stat measurement tables.
+
+``raw_measurement_records``, ``stat_measurements`` and
+``stat_measurement_values`` are ``RANGE COLUMNS(post_date)`` partitioned with
+one ``pYYYYMM`` partition per month and a trailing ``pmax`` catch-all. This
+module splits new months out of ``pmax`` ahead of time and drops whole months
+once they leave the retention window, which is a metadata operation instead
+of a multi-million row ``DELETE``.
+
+Run it from a single scheduled job with ``python -m app.core.retention``.
+The in-process loop (``PARTITION_MAINTENANCE_INTERVAL``, off by default)
+runs in every API worker; a MySQL ``GET_LOCK`` lets one of them do the work
+and the others skip that round.
+
+The partition lists in sql/create_db.sql and the baseline migration are
+only the initial layout; a run right after creating the schema splits the
+months up to ``PARTITION_MONTHS_AHEAD`` out of ``pmax``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Any
+
+from sqlalchemy import column, delete, select, table, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .config import settings
+from .db import engine
+
+
+logger = logging.getLogger("measure_system")
+
+PARTITIONED_TABLES = ("raw_measurement_records", "stat_measurements", "stat_measurement_values")
+
+_MAINTENANCE_LOCK = "measure_system:partition_maintenance"
+_FILE_DELETE_BATCH = 1000
+
+_measurement_files = table("measurement_files", column("id"), column("post_date"))
+
+
+@dataclass(slots=True)
+class RetentionReport:
+    cutoff: date | None
+    created: dict[str, list[str]] = field(default_factory=dict)
+    dropped: dict[str, list[str]] = field(default_factory=dict)
+    deleted_rows: dict[str, int] = field(default_factory=dict)
+    deleted_files: int = 0
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def retention_cutoff(today: date, retention_months: int) -> date | None:
+    """First post_date that is kept; ``None`` when retention is disabled."""
+
+    if retention_months <= 0:
+        return None
+    return _add_months(_month_start(today), -retention_months)
+
+
+async def _list_partitions(conn: AsyncConnection, table_name: str) -> list[tuple[str, date | None]]:
+    """Return ``(name, upper bound)`` per partition; ``pmax`` has bound ``None``."""
+
+    result = await conn.execute(
+        text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name "
+            "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table_name": table_name},
+    )
+    partitions: list[tuple[str, date | None]] = []
+    for name, description in result.tuples():
+        bound = None if description == "MAXVALUE" else date.fromisoformat(description.strip("'"))
+        partitions.append((name, bound))
+    return partitions
+
+
+async def _create_future_partitions(
+    conn: AsyncConnection,
+    table_name: str,
+    partitions: list[tuple[str, date | None]],
+    until: date,
+) -> list[str]:
+    """Split monthly partitions out of ``pmax`` until ``until`` is covered."""
+
+    if not partitions or partitions[-1][1] is not None:
+        logger.warning("%s has no MAXVALUE partition; skipping partition creation", table_name)
+        return []
+    bounds = [bound for _, bound in partitions if bound is not None]
+    month = max(bounds) if bounds else _month_start(until)
+    created: list[str] = []
+    clauses: list[str] = []
+    while month < until:
+        created.append(partition_name(month))
+        clauses.append(
+            f"PARTITION {partition_name(month)} VALUES LESS THAN ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    if clauses:
+        # pmax only holds rows dated past every bound, normally none, so the
+        # reorganize is a cheap rebuild of an empty partition.
+        clauses.append(f"PARTITION {partitions[-1][0]} VALUES LESS THAN (MAXVALUE)")
+        await conn.execute(
+            text(
+                f"ALTER TABLE {table_name} REORGANIZE PARTITION {partitions[-1][0]} "
+                f"INTO ({', '.join(clauses)})"
+            )
+        )
+    return created
+
+
+async def _drop_expired_partitions(
+    conn: AsyncConnection,
+    table_name: str,
+    partitions: list[tuple[str, date | None]],
+    cutoff: date,
+) -> list[str]:
+    expired = [name for name, bound in partitions if bound is not None and bound <= cutoff]
+    if expired:
+        await conn.execute(text(f"ALTER TABLE {table_name} DROP PARTITION {', '.join(expired)}"))
+    return expired
+
+
+async def _delete_expired_rows(conn: AsyncConnection, table_name: str, cutoff: date) -> int:
+    """Fallback for tables created without partitions (e.g. via ``create_all``)."""
+
+    target = table(table_name, column("post_date"))
+    result = await conn.execute(delete(target).where(target.c.post_date < cutoff))
+    return result.rowcount or 0
+
+
+async def _delete_expired_files(conn: AsyncConnection, cutoff: date) -> int:
+    """Delete file rows past the cutoff; summaries and class counts cascade.
+
+    Trend rollups are deliberately kept: they are the long-horizon history
+    that outlives the raw data.
+    """
+
+    deleted = 0
+    while True:
+        result = await conn.execute(
+            select(_measurement_files.c.id)
+            .where(_measurement_files.c.post_date < cutoff)
+            .limit(_FILE_DELETE_BATCH)
+        )
+        ids = list(result.scalars())
+        if not ids:
+            return deleted
+        await conn.execute(delete(_measurement_files).where(_measurement_files.c.id.in_(ids)))
+        deleted += len(ids)
+
+
+async def apply_retention(
+    db_engine: AsyncEngine,
+    *,
+    retention_months: int,
+    months_ahead: int,
+    today: date | None = None,
+) -> RetentionReport:
+    """Create upcoming monthly partitions and drop the ones past retention."""
+
+    today = today or date.today()
+    report = RetentionReport(cutoff=retention_cutoff(today, retention_months))
+    until = _add_months(_month_start(today), max(months_ahead, 0) + 1)
+    async with db_engine.connect() as conn:
+        is_mysql = conn.dialect.name == "mysql"
+        if is_mysql:
+            locked = await conn.scalar(text("SELECT GET_LOCK(:name, 0)"), {"name": _MAINTENANCE_LOCK})
+            if not locked:
+                logger.info("partition maintenance already running elsewhere; skipping")
+                return report
+        try:
+            for table_name in PARTITIONED_TABLES:
+                partitions = await _list_partitions(conn, table_name) if is_mysql else []
+                if partitions:
+                    report.created[table_name] = await _create_future_partitions(
+                        conn, table_name, partitions, until
+                    )
+                if report.cutoff is None:
+                    continue
+                if partitions:
+                    report.dropped[table_name] = await _drop_expired_partitions(
+                        conn, table_name, partitions, report.cutoff
+                    )
+                else:
+                    report.deleted_rows[table_name] = await _delete_expired_rows(
+                        conn, table_name, report.cutoff
+                    )
+            if report.cutoff is not None:
+                report.deleted_files = await _delete_expired_files(conn, report.cutoff)
+            await conn.commit()
+        finally:
+            if is_mysql:
+                await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": _MAINTENANCE_LOCK})
+    return report
+
+
+class PartitionMaintenance:
+    """Background task that runs :func:`apply_retention` every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        *,
+        retention_months: int,
+        months_ahead: int,
+        interval: float,
+    ) -> None:
+        self.db_engine = db_engine
+        self.retention_months = retention_months
+        self.months_ahead = months_ahead
+        self.interval = interval
+        self.last_report: RetentionReport | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> RetentionReport:
+        self.last_report = await apply_retention(
+            self.db_engine,
+            retention_months=self.retention_months,
+            months_ahead=self.months_ahead,
+        )
+        return self.last_report
+
+    async def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop(), name="partition-maintenance")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                report = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("partition maintenance failed")
+            else:
+                if any(report.dropped.values()) or report.deleted_files:
+                    logger.info(
+                        "retention cutoff=%s dropped=%s deleted_files=%d",
+                        report.cutoff,
+                        report.dropped,
+                        report.deleted_files,
+                    )
+            await asyncio.sleep(self.interval)
+
+
+partition_maintenance = PartitionMaintenance(
+    engine,
+    retention_months=settings.partition_retention_months,
+    months_ahead=settings.partition_months_ahead,
+    interval=settings.partition_maintenance_interval,
+)
+
+
+async def _main() -> dict[str, Any]:
+    try:
+        report = await partition_maintenance.run_once()
+    finally:
+        await engine.dispose()
+    return asdict(report)
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(_main()), default=str, indent=2))
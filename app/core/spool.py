@@ -0,0 +1,339 @@
+"""Durable on-disk spool and background consumers for asynchronous ingest."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Literal
+
+from .config import settings
+
+
+logger = logging.getLogger("measure_system")
+
+JobStatus = Literal["queued", "running", "done", "failed"]
+
+
+class SpoolFullError(RuntimeError):
+    """Raised when the spool already holds the configured number of queued jobs."""
+
+
+@dataclass(slots=True)
+class SpooledJob:
+    id: str
+    status: JobStatus
+    mode: str
+    payload: str | None
+    result: str | None
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    id         TEXT NOT NULL UNIQUE,
+    status     TEXT NOT NULL,
+    mode       TEXT NOT NULL,
+    payload    TEXT,
+    result     TEXT,
+    error      TEXT,
+    owner_pid  INTEGER,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_ingest_jobs_status_seq ON ingest_jobs (status, seq);
+"""
+
+_JOB_COLUMNS = "id, status, mode, payload, result, error, created_at, updated_at"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class IngestSpool:
+    """SQLite-backed job queue shared by every worker process on the host.
+
+    Each call runs the blocking sqlite3 work in a thread; one connection per
+    process is serialised by a lock, and SQLite's own locking keeps claims
+    atomic across processes.
+    """
+
+    def __init__(self, path: Path, max_depth: int, retention: float = 0.0) -> None:
+        self.path = path
+        self.max_depth = max_depth
+        self.retention = retention
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func: Callable[..., object], *args: object) -> object:
+        def call() -> object:
+            with self._lock:
+                return func(self._connection(), *args)
+
+        return await asyncio.to_thread(call)
+
+    @staticmethod
+    def _row_to_job(row: tuple) -> SpooledJob:
+        return SpooledJob(
+            id=row[0],
+            status=row[1],
+            mode=row[2],
+            payload=row[3],
+            result=row[4],
+            error=row[5],
+            created_at=datetime.fromisoformat(row[6]),
+            updated_at=datetime.fromisoformat(row[7]),
+        )
+
+    def _enqueue(self, conn: sqlite3.Connection, payload: str, mode: str) -> str:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (depth,) = conn.execute(
+                "SELECT COUNT(*) FROM ingest_jobs WHERE status = 'queued'"
+            ).fetchone()
+            if depth >= self.max_depth:
+                raise SpoolFullError(f"ingest spool holds {depth} queued jobs")
+            job_id = uuid.uuid4().hex
+            now = _now()
+            conn.execute(
+                "INSERT INTO ingest_jobs (id, status, mode, payload, created_at, updated_at)"
+                " VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, mode, payload, now, now),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return job_id
+
+    def _claim(self, conn: sqlite3.Connection) -> SpooledJob | None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM ingest_jobs WHERE status = 'queued' ORDER BY seq LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE ingest_jobs SET status = 'running', owner_pid = ?, updated_at = ?"
+                    " WHERE id = ?",
+                    (os.getpid(), _now(), row[0]),
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        if row is None:
+            return None
+        job = self._row_to_job(row)
+        job.status = "running"
+        return job
+
+    def _finish(
+        self,
+        conn: sqlite3.Connection,
+        job_id: str,
+        status: JobStatus,
+        result: str | None,
+        error: str | None,
+    ) -> None:
+        # The payload is dropped once the job is settled; only the outcome is kept.
+        conn.execute(
+            "UPDATE ingest_jobs SET status = ?, result = ?, error = ?, payload = NULL, updated_at = ?"
+            " WHERE id = ?",
+            (status, result, error, _now(), job_id),
+        )
+
+    def _get(self, conn: sqlite3.Connection, job_id: str) -> SpooledJob | None:
+        row = conn.execute(
+            f"SELECT {_JOB_COLUMNS} FROM ingest_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def _depth(self, conn: sqlite3.Connection) -> int:
+        (depth,) = conn.execute(
+            "SELECT COUNT(*) FROM ingest_jobs WHERE status = 'queued'"
+        ).fetchone()
+        return depth
+
+    def _purge_settled(self, conn: sqlite3.Connection, cutoff: str) -> int:
+        # Timestamps are all UTC isoformat strings, so they order as text.
+        return conn.execute(
+            "DELETE FROM ingest_jobs WHERE status IN ('done', 'failed') AND updated_at < ?",
+            (cutoff,),
+        ).rowcount
+
+    def _requeue_running(self, conn: sqlite3.Connection) -> int:
+        # Other worker processes share the spool, so only jobs whose owning
+        # process is gone (or is this very process restarting) go back.
+        rows = conn.execute(
+            "SELECT id, owner_pid FROM ingest_jobs WHERE status = 'running'"
+        ).fetchall()
+        now = _now()
+        stale = [
+            (now, job_id)
+            for job_id, owner_pid in rows
+            if owner_pid is None or owner_pid == os.getpid() or not _pid_alive(owner_pid)
+        ]
+        conn.executemany(
+            "UPDATE ingest_jobs SET status = 'queued', owner_pid = NULL, updated_at = ?"
+            " WHERE id = ? AND status = 'running'",
+            stale,
+        )
+        return len(stale)
+
+    async def enqueue(self, payload: str, mode: str) -> str:
+        return await self._run(self._enqueue, payload, mode)  # type: ignore[return-value]
+
+    async def claim(self) -> SpooledJob | None:
+        return await self._run(self._claim)  # type: ignore[return-value]
+
+    async def complete(self, job_id: str, result: str) -> None:
+        await self._run(self._finish, job_id, "done", result, None)
+
+    async def fail(self, job_id: str, error: str) -> None:
+        await self._run(self._finish, job_id, "failed", None, error)
+
+    async def get(self, job_id: str) -> SpooledJob | None:
+        return await self._run(self._get, job_id)  # type: ignore[return-value]
+
+    async def depth(self) -> int:
+        return await self._run(self._depth)  # type: ignore[return-value]
+
+    async def purge_settled(self) -> int:
+        """Delete done/failed jobs settled longer than ``retention`` seconds ago."""
+
+        if self.retention <= 0:
+            return 0
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=self.retention)).isoformat()
+        return await self._run(self._purge_settled, cutoff)  # type: ignore[return-value]
+
+    async def requeue_running(self) -> int:
+        """Return jobs left ``running`` by a crashed or stopped process to the queue."""
+
+        return await self._run(self._requeue_running)  # type: ignore[return-value]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+JobHandler = Callable[[str, str], Awaitable[str]]
+
+
+class SpoolWorkerPool:
+    """In-process consumers draining :class:`IngestSpool` with bounded concurrency."""
+
+    def __init__(
+        self,
+        spool: IngestSpool,
+        handler: JobHandler,
+        concurrency: int,
+        poll_interval: float = 1.0,
+        purge_interval: float = 60.0,
+    ) -> None:
+        self.spool = spool
+        self.handler = handler
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self.concurrency <= 0 or self._tasks:
+            return
+        requeued = await self.spool.requeue_running()
+        if requeued:
+            logger.warning("requeued %d interrupted ingest jobs", requeued)
+        self._tasks = [
+            asyncio.create_task(self._consume(), name=f"ingest-spool-{index}")
+            for index in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _purge_if_due(self) -> None:
+        now = time.monotonic()
+        if now < self._next_purge:
+            return
+        # Claimed before awaiting, so idle consumers don't purge together.
+        self._next_purge = now + self.purge_interval
+        try:
+            purged = await self.spool.purge_settled()
+        except sqlite3.Error:
+            logger.exception("failed to purge settled ingest jobs")
+            return
+        if purged:
+            logger.info("purged %d settled ingest jobs", purged)
+
+    async def _consume(self) -> None:
+        while True:
+            job = await self.spool.claim()
+            if job is None:
+                await self._purge_if_due()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                result = await self.handler(job.payload or "", job.mode)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("ingest job %s failed", job.id)
+                # DBAPI errors carry the full statement; keep only the driver message.
+                cause = getattr(exc, "orig", None) or exc
+                await self.spool.fail(job.id, (str(cause) or type(exc).__name__)[:500])
+            else:
+                await self.spool.complete(job.id, result)
+
+
+ingest_spool = IngestSpool(
+    Path(settings.ingest_spool_dir) / "ingest_jobs.sqlite3",
+    max_depth=settings.ingest_spool_max_depth,
+    retention=settings.ingest_spool_retention,
+)
@@ -0,0 +1,154 @@
+"""Worker start-up: schema revision check, dimension cache warm-up, pool pre-open.
+
+The schema is owned by Alembic (``alembic upgrade head``). A worker only
+confirms the database is at the revision this code was written for, which
+is one ``SELECT`` against ``alembic_version`` instead of the per-table
+information_schema probes ``create_all`` issues. ``DB_SCHEMA_STARTUP=create``
+keeps the old ``create_all`` behaviour for throwaway local databases.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Literal
+
+from sqlalchemy import exc, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..models import (
+    Base,
+    DetectionClass,
+    MeasurementDirectory,
+    MeasurementItem,
+    MeasurementMetricType,
+    MeasurementModule,
+    MeasurementNode,
+    MeasurementVersion,
+    StatValueType,
+)
+from .cache import DimensionCache
+
+
+logger = logging.getLogger("measure_system")
+
+SchemaStartup = Literal["check", "create", "off"]
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+class SchemaRevisionError(RuntimeError):
+    """The database is not at the Alembic revision this code expects."""
+
+
+def expected_revisions() -> set[str]:
+    """Head revision(s) of the migration scripts shipped with this code."""
+
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def check_schema_revision(db_engine: AsyncEngine) -> set[str]:
+    """Raise :class:`SchemaRevisionError` unless the database is at head."""
+
+    expected = expected_revisions()
+    async with db_engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except exc.DBAPIError as error:
+            raise SchemaRevisionError(
+                "alembic_version is missing: run `alembic upgrade head` "
+                "(or `alembic stamp head` for a database created from sql/create_db.sql)"
+            ) from error
+        current = set(result.scalars())
+    if current != expected:
+        raise SchemaRevisionError(
+            f"database schema revision {sorted(current) or 'none'} does not match "
+            f"{sorted(expected)}: run `alembic upgrade head`"
+        )
+    return current
+
+
+async def prepare_schema(db_engine: AsyncEngine, mode: SchemaStartup) -> None:
+    if mode == "check":
+        await check_schema_revision(db_engine)
+    elif mode == "create":
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+
+async def open_pool_connections(db_engine: AsyncEngine, count: int) -> int:
+    """Connect ``count`` pool connections concurrently and return them to the pool."""
+
+    if count <= 0:
+        return 0
+    opened = await asyncio.gather(
+        *(db_engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    connections = [conn for conn in opened if not isinstance(conn, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in connections))
+    failures = [conn for conn in opened if isinstance(conn, BaseException)]
+    if failures:
+        raise failures[0]
+    return len(connections)
+
+
+async def warm_dimension_cache(db_engine: AsyncEngine, cache: DimensionCache) -> int:
+    """Load dimension ids into ``cache`` under the keys the ingest path looks up.
+
+    Small lookup tables go first; items and directories fill whatever room
+    ``DIMENSION_CACHE_SIZE`` leaves, so warming never evicts its own rows.
+    """
+
+    named = (
+        MeasurementNode,
+        MeasurementModule,
+        MeasurementVersion,
+        MeasurementMetricType,
+        StatValueType,
+        DetectionClass,
+    )
+    loaded = 0
+    async with db_engine.connect() as conn:
+        for model in named:
+            room = cache.max_size - loaded
+            if room <= 0:
+                return loaded
+            rows = await conn.execute(select(model.id, model.name).limit(room))
+            for row_id, name in rows:
+                cache.put(model.__tablename__, name, row_id)
+                loaded += 1
+
+        room = cache.max_size - loaded
+        if room > 0:
+            rows = await conn.execute(
+                select(
+                    MeasurementItem.id,
+                    MeasurementItem.class_name,
+                    MeasurementItem.measure_item_key,
+                    MeasurementItem.metric_type_id,
+                ).limit(room)
+            )
+            for row_id, class_name, measure_item_key, metric_type_id in rows:
+                cache.put(MeasurementItem.__tablename__, (class_name, measure_item_key, metric_type_id), row_id)
+                loaded += 1
+
+        room = cache.max_size - loaded
+        if room > 0:
+            # Parents are created before their children, so id order never
+            # caches a directory without its ancestors.
+            rows = await conn.execute(
+                select(MeasurementDirectory.id, MeasurementDirectory.path)
+                .order_by(MeasurementDirectory.id)
+                .limit(room)
+            )
+            for row_id, path in rows:
+                cache.put(MeasurementDirectory.__tablename__, tuple(path.split("/")), row_id)
+                loaded += 1
+    logger.info("dimension cache warmed with %d ids", loaded)
+    return loaded
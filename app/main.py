@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import re
 from contextlib import asynccontextmanager
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
@@ -12,22 +14,40 @@ from typing import Any
 from fastapi import FastAPI, Request
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 
 from .api import router
-from .core import engine, settings
-from .models import Base
+from .api.routers.measurement_results import ingest_job_workers
+from .core import dimension_cache, engine, ingest_spool, json_loads, read_engine, settings
+from .core.retention import partition_maintenance
+from .core.startup import open_pool_connections, prepare_schema, warm_dimension_cache
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    # Auto create tables for the prototype phase. Swap with Alembic later.
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield
-
-
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+    # Migrations are applied out of band (alembic upgrade head); by default a
+    # worker only verifies the revision before serving.
+    await prepare_schema(engine, settings.db_schema_startup)
+    if settings.db_pool_prewarm:
+        await asyncio.gather(
+            open_pool_connections(engine, settings.db_pool_size),
+            open_pool_connections(read_engine, settings.db_read_pool_size),
+        )
+    if settings.dimension_cache_prewarm:
+        await warm_dimension_cache(engine, dimension_cache)
+    await ingest_job_workers.start()
+    await partition_maintenance.start()
+    try:
+        yield
+    finally:
+        await partition_maintenance.stop()
+        await ingest_job_workers.stop()
+        ingest_spool.close()
+        await engine.dispose()
+        await read_engine.dispose()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=ORJSONResponse)
 app.include_router(router)
 
 logger = logging.getLogger("measure_system")
@@ -57,18 +77,35 @@ def _configure_logging() -> None:
 _configure_logging()
 
 
+# The error log only needs the file path and a short preview, so failed
+# bodies are never re-parsed or re-serialized: both come from this prefix.
+_BODY_SCAN_BYTES = 64 * 1024
+_FILE_PATH_PATTERN = re.compile(rb'"file_path"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def _raw_body(request: Request, body: Any) -> Any:
+    """Prefer the undecoded request bytes (recorded by ``JSONRequest``) over ``exc.body``."""
+
+    raw = getattr(request.state, "raw_body", None)
+    return body if raw is None else raw
+
+
 def _extract_file_path_from_body(body: Any) -> str | None:
     if body is None:
         return None
-    parsed = body
     if isinstance(body, (bytes, str)):
+        head = body[:_BODY_SCAN_BYTES]
+        match = _FILE_PATH_PATTERN.search(head.encode("utf-8", errors="replace") if isinstance(head, str) else head)
+        if match is None:
+            return None
         try:
-            parsed = json.loads(body)
-        except (json.JSONDecodeError, TypeError):
+            file_path = json_loads(match.group(1))
+        except ValueError:
             return None
-    if not isinstance(parsed, dict):
+        return file_path if isinstance(file_path, str) else None
+    if not isinstance(body, dict):
         return None
-    file_payload = parsed.get("file")
+    file_payload = body.get("file")
     if not isinstance(file_payload, dict):
         return None
     file_path = file_payload.get("file_path")
@@ -91,12 +128,12 @@ def _format_validation_errors(errors: list[Any]) -> str:
 def _body_preview(body: Any, limit: int = 512) -> str:
     if body is None:
         return ""
-    text: str
-    if isinstance(body, bytes):
-        text = body.decode("utf-8", errors="replace")
-    elif isinstance(body, str):
-        text = body
+    if isinstance(body, (bytes, str)):
+        head = body[: limit + 1]
+        text = head.decode("utf-8", errors="replace") if isinstance(head, bytes) else head
     else:
+        # Parsed bodies only arrive without raw bytes, i.e. the small NDJSON
+        # stream header.
         try:
             text = json.dumps(body, ensure_ascii=False)
         except TypeError:
@@ -108,9 +145,10 @@ def _body_preview(body: Any, limit: int = 512) -> str:
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    file_path = _extract_file_path_from_body(exc.body)
+    body = _raw_body(request, exc.body)
+    file_path = _extract_file_path_from_body(body)
+    body_preview = _body_preview(body)
     error_summary = _format_validation_errors(exc.errors())
-    body_preview = _body_preview(exc.body)
     client_host = request.client.host if request.client else None
     logger.error(
         "422 validation error method=%s path=%s client=%s file_path=%s errors=%s body=%s",
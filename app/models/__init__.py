@@ -13,6 +13,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -20,7 +21,7 @@ from sqlalchemy import (
     UniqueConstraint,
     text,
 )
-from sqlalchemy.dialects.mysql import BIGINT, DATETIME, DOUBLE
+from sqlalchemy.dialects.mysql import BIGINT, DATETIME, DOUBLE, LONGBLOB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -33,6 +34,13 @@ class FileStatus(str, enum.Enum):
     FAIL = "FAIL"
 
 
+class RawStorage(str, enum.Enum):
+    """Where a file's raw points live: one row per point or one blob per item."""
+
+    ROWS = "rows"
+    BLOB = "blob"
+
+
 class MeasurementNode(Base):
     __tablename__ = "measurement_nodes"
 
@@ -72,6 +80,10 @@ class MeasurementDirectory(Base):
         nullable=True,
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Top-down "line_a/img/wafer" of this directory and all its ancestors,
+    # written once at creation so reading a file's parent_dir_* never walks
+    # the parent chain.
+    path: Mapped[str] = mapped_column(Text, nullable=False)
 
     parent: Mapped[MeasurementDirectory | None] = relationship(
         "MeasurementDirectory", remote_side="MeasurementDirectory.id", back_populates="children"
@@ -84,10 +96,45 @@ class MeasurementDirectory(Base):
     )
 
 
+class MeasurementDirectoryClosure(Base):
+    """Every (ancestor, descendant) pair of the directory tree, self pairs included.
+
+    Files below a directory are one join on ``ancestor_id`` instead of a
+    recursive walk of ``measurement_directories``.
+    """
+
+    __tablename__ = "measurement_directory_closure"
+    __table_args__ = (
+        PrimaryKeyConstraint("ancestor_id", "descendant_id", name="pk_directory_closure"),
+        Index("idx_directory_closure_descendant", "descendant_id", "depth"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("measurement_directories.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("measurement_directories.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class MeasurementFile(Base):
     __tablename__ = "measurement_files"
     __table_args__ = (
         UniqueConstraint("file_hash", name="uk_measurement_files_hash"),
+        # Listing indexes: each filter column followed by post_time so a
+        # filtered "newest first" page is a range scan. InnoDB appends the
+        # primary key to secondary indexes, which makes them (col, post_time, id)
+        # and covers the (post_time, id) keyset without touching the rows.
+        Index("idx_files_post_time", "post_time"),
+        Index("idx_files_node_time", "node_id", "post_time"),
+        Index("idx_files_module_time", "module_id", "post_time"),
+        Index("idx_files_version_time", "version_id", "post_time"),
+        Index("idx_files_directory_time", "directory_id", "post_time"),
+        Index("idx_files_status_time", "status", "post_time"),
+        Index("idx_files_date_module", "post_date", "module_id"),
     )
 
     id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True)
@@ -117,6 +164,12 @@ class MeasurementFile(Base):
     file_hash: Mapped[str | None] = mapped_column(String(64))
     processing_ms: Mapped[int | None] = mapped_column(Integer)
     status: Mapped[FileStatus] = mapped_column(Enum(FileStatus), default=FileStatus.OK)
+    raw_storage: Mapped[RawStorage] = mapped_column(
+        Enum(RawStorage, values_callable=lambda members: [member.value for member in members]),
+        nullable=False,
+        default=RawStorage.ROWS,
+        server_default=RawStorage.ROWS.value,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
@@ -128,25 +181,39 @@ class MeasurementFile(Base):
     module: Mapped[MeasurementModule | None] = relationship("MeasurementModule", back_populates="files")
     version: Mapped[MeasurementVersion | None] = relationship("MeasurementVersion", back_populates="files")
     directory: Mapped[MeasurementDirectory | None] = relationship(
-        "MeasurementDirectory", back_populates="files"
+        "MeasurementDirectory", back_populates="files", lazy="selectin"
     )
     raw_records: Mapped[list[RawMeasurementRecord]] = relationship(
-        "RawMeasurementRecord", back_populates="file", cascade="all, delete-orphan"
+        "RawMeasurementRecord",
+        primaryjoin="MeasurementFile.id == foreign(RawMeasurementRecord.file_id)",
+        back_populates="file",
+        cascade="all, delete-orphan",
     )
     stat_measurements: Mapped[list[StatMeasurement]] = relationship(
-        "StatMeasurement", back_populates="file", cascade="all, delete-orphan"
+        "StatMeasurement",
+        primaryjoin="MeasurementFile.id == foreign(StatMeasurement.file_id)",
+        back_populates="file",
+        cascade="all, delete-orphan",
     )
     class_counts: Mapped[list[FileClassCount]] = relationship(
         "FileClassCount", back_populates="file", cascade="all, delete-orphan"
     )
+    summary: Mapped[FileSummary | None] = relationship(
+        "FileSummary", back_populates="file", cascade="all, delete-orphan", uselist=False
+    )
+    item_summaries: Mapped[list[FileItemSummary]] = relationship(
+        "FileItemSummary", back_populates="file", cascade="all, delete-orphan"
+    )
+    raw_blobs: Mapped[list[RawMeasurementBlob]] = relationship(
+        "RawMeasurementBlob", back_populates="file", cascade="all, delete-orphan"
+    )
 
     def _directory_segments(self) -> list[str]:
-        segments: list[str] = []
-        current = self.directory
-        while current is not None:
-            segments.append(current.name)
-            current = current.parent
-        return segments
+        """Directory names nearest first, from the directory's materialized path."""
+
+        if self.directory is None:
+            return []
+        return self.directory.path.split("/")[::-1]
 
     @property
     def parent_dir_0(self) -> str | None:
@@ -196,28 +263,38 @@ class MeasurementItem(Base):
         "MeasurementMetricType", back_populates="items"
     )
     raw_records: Mapped[list[RawMeasurementRecord]] = relationship(
-        "RawMeasurementRecord", back_populates="item"
+        "RawMeasurementRecord",
+        primaryjoin="MeasurementItem.id == foreign(RawMeasurementRecord.item_id)",
+        back_populates="item",
     )
     stat_measurements: Mapped[list[StatMeasurement]] = relationship(
-        "StatMeasurement", back_populates="item"
+        "StatMeasurement",
+        primaryjoin="MeasurementItem.id == foreign(StatMeasurement.item_id)",
+        back_populates="item",
     )
 
 
+# Raw and stat rows are range-partitioned by month of the owning file's
+# post_date (see sql/create_db.sql). MySQL partitioned tables cannot carry
+# foreign keys and every unique key, the primary key included, must contain
+# the partition column, so these tables hold a denormalized ``post_date``
+# that is part of their primary key and reference their parents by plain
+# columns; the application deletes children explicitly. The models declare
+# exactly that (no ``ForeignKey``, ``post_date`` in the key) so Alembic
+# autogenerate against ``Base.metadata`` does not try to undo the
+# partitioning. The partition layout itself is not in the metadata.
 class RawMeasurementRecord(Base):
     __tablename__ = "raw_measurement_records"
     __table_args__ = (
-        UniqueConstraint("file_id", "item_id", "x_index", "y_index", name="uk_raw_file_item_xy"),
+        UniqueConstraint(
+            "file_id", "item_id", "x_index", "y_index", "post_date", name="uk_raw_file_item_xy"
+        ),
     )
 
-    id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True)
-    file_id: Mapped[int] = mapped_column(
-        ForeignKey("measurement_files.id", ondelete="CASCADE", onupdate="CASCADE"),
-        nullable=False,
-    )
-    item_id: Mapped[int] = mapped_column(
-        ForeignKey("measurement_items.id", ondelete="RESTRICT", onupdate="CASCADE"),
-        nullable=False,
-    )
+    id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
+    file_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+    item_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+    post_date: Mapped[date] = mapped_column(Date, primary_key=True)
     measurable: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     x_index: Mapped[int] = mapped_column(Integer, nullable=False)
     y_index: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -227,29 +304,75 @@ class RawMeasurementRecord(Base):
     y_1: Mapped[float] = mapped_column(DOUBLE, nullable=False)
     value: Mapped[float] = mapped_column(DOUBLE, nullable=False)
 
-    file: Mapped[MeasurementFile] = relationship("MeasurementFile", back_populates="raw_records")
-    item: Mapped[MeasurementItem] = relationship("MeasurementItem", back_populates="raw_records")
+    file: Mapped[MeasurementFile] = relationship(
+        "MeasurementFile",
+        primaryjoin="foreign(RawMeasurementRecord.file_id) == MeasurementFile.id",
+        back_populates="raw_records",
+    )
+    item: Mapped[MeasurementItem] = relationship(
+        "MeasurementItem",
+        primaryjoin="foreign(RawMeasurementRecord.item_id) == MeasurementItem.id",
+        back_populates="raw_records",
+    )
 
 
-class StatMeasurement(Base):
-    __tablename__ = "stat_measurements"
+class RawMeasurementBlob(Base):
+    """All raw points of one (file, item) as a compressed columnar blob.
+
+    Used instead of ``raw_measurement_records`` for files stored with
+    ``raw_storage = 'blob'``; see :mod:`app.core.raw_blobs` for the layout.
+    The count and value bounds let readers skip blobs without decoding them.
+    """
+
+    __tablename__ = "raw_measurement_blobs"
     __table_args__ = (
-        UniqueConstraint("file_id", "item_id", name="uk_stat_file_item"),
+        PrimaryKeyConstraint("file_id", "item_id", name="pk_raw_measurement_blobs"),
     )
 
-    id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True)
     file_id: Mapped[int] = mapped_column(
-        ForeignKey("measurement_files.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False
+        ForeignKey("measurement_files.id", ondelete="CASCADE", onupdate="CASCADE"), primary_key=True
     )
     item_id: Mapped[int] = mapped_column(
-        ForeignKey("measurement_items.id", ondelete="RESTRICT", onupdate="CASCADE"),
-        nullable=False,
+        ForeignKey("measurement_items.id", ondelete="RESTRICT", onupdate="CASCADE"), primary_key=True
     )
+    codec: Mapped[str] = mapped_column(String(8), nullable=False)
+    point_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    measurable_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    value_min: Mapped[float] = mapped_column(DOUBLE(asdecimal=False), nullable=False)
+    value_max: Mapped[float] = mapped_column(DOUBLE(asdecimal=False), nullable=False)
+    checksum: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[bytes] = mapped_column(LONGBLOB, nullable=False)
+
+    file: Mapped[MeasurementFile] = relationship("MeasurementFile", back_populates="raw_blobs")
+    item: Mapped[MeasurementItem] = relationship("MeasurementItem")
 
-    file: Mapped[MeasurementFile] = relationship("MeasurementFile", back_populates="stat_measurements")
-    item: Mapped[MeasurementItem] = relationship("MeasurementItem", back_populates="stat_measurements")
+
+class StatMeasurement(Base):
+    __tablename__ = "stat_measurements"
+    __table_args__ = (
+        UniqueConstraint("file_id", "item_id", "post_date", name="uk_stat_file_item"),
+    )
+
+    id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
+    file_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+    item_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+    post_date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    file: Mapped[MeasurementFile] = relationship(
+        "MeasurementFile",
+        primaryjoin="foreign(StatMeasurement.file_id) == MeasurementFile.id",
+        back_populates="stat_measurements",
+    )
+    item: Mapped[MeasurementItem] = relationship(
+        "MeasurementItem",
+        primaryjoin="foreign(StatMeasurement.item_id) == MeasurementItem.id",
+        back_populates="stat_measurements",
+    )
     values: Mapped[list[StatMeasurementValue]] = relationship(
-        "StatMeasurementValue", back_populates="stat_measurement", cascade="all, delete-orphan"
+        "StatMeasurementValue",
+        primaryjoin="StatMeasurement.id == foreign(StatMeasurementValue.stat_measurement_id)",
+        back_populates="stat_measurement",
+        cascade="all, delete-orphan",
     )
 
 
@@ -261,30 +384,33 @@ class StatValueType(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
 
     values: Mapped[list[StatMeasurementValue]] = relationship(
-        "StatMeasurementValue", back_populates="value_type"
+        "StatMeasurementValue",
+        primaryjoin="StatValueType.id == foreign(StatMeasurementValue.value_type_id)",
+        back_populates="value_type",
     )
 
 
 class StatMeasurementValue(Base):
     __tablename__ = "stat_measurement_values"
     __table_args__ = (
-        PrimaryKeyConstraint("stat_measurement_id", "value_type_id", name="pk_stat_values"),
+        PrimaryKeyConstraint("stat_measurement_id", "value_type_id", "post_date", name="pk_stat_values"),
     )
 
-    stat_measurement_id: Mapped[int] = mapped_column(
-        ForeignKey("stat_measurements.id", ondelete="CASCADE", onupdate="CASCADE"),
-        primary_key=True,
-    )
-    value_type_id: Mapped[int] = mapped_column(
-        ForeignKey("stat_value_types.id", ondelete="RESTRICT", onupdate="CASCADE"),
-        primary_key=True,
-    )
+    stat_measurement_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True)
+    value_type_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True)
+    post_date: Mapped[date] = mapped_column(Date, primary_key=True)
     value: Mapped[float] = mapped_column(DOUBLE, nullable=False)
 
     stat_measurement: Mapped[StatMeasurement] = relationship(
-        "StatMeasurement", back_populates="values"
+        "StatMeasurement",
+        primaryjoin="foreign(StatMeasurementValue.stat_measurement_id) == StatMeasurement.id",
+        back_populates="values",
+    )
+    value_type: Mapped[StatValueType] = relationship(
+        "StatValueType",
+        primaryjoin="foreign(StatMeasurementValue.value_type_id) == StatValueType.id",
+        back_populates="values",
     )
-    value_type: Mapped[StatValueType] = relationship("StatValueType", back_populates="values")
 
 
 class DetectionClass(Base):
@@ -317,20 +443,101 @@ class FileClassCount(Base):
     det_class: Mapped[DetectionClass] = relationship("DetectionClass", back_populates="file_counts")
 
 
+class FileSummary(Base):
+    """Per-file totals written in the ingest transaction (see ``file_item_summaries``)."""
+
+    __tablename__ = "file_summaries"
+
+    file_id: Mapped[int] = mapped_column(
+        ForeignKey("measurement_files.id", ondelete="CASCADE", onupdate="CASCADE"), primary_key=True
+    )
+    raw_points: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False, default=0)
+    measurable_points: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False, default=0)
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stat_sets: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    value_min: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+    value_max: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+    value_avg: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+
+    file: Mapped[MeasurementFile] = relationship("MeasurementFile", back_populates="summary")
+
+
+class FileItemSummary(Base):
+    __tablename__ = "file_item_summaries"
+    __table_args__ = (
+        PrimaryKeyConstraint("file_id", "item_id", name="pk_file_item_summaries"),
+    )
+
+    file_id: Mapped[int] = mapped_column(
+        ForeignKey("measurement_files.id", ondelete="CASCADE", onupdate="CASCADE"), primary_key=True
+    )
+    item_id: Mapped[int] = mapped_column(
+        ForeignKey("measurement_items.id", ondelete="RESTRICT", onupdate="CASCADE"), primary_key=True
+    )
+    raw_points: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False, default=0)
+    measurable_points: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False, default=0)
+    value_min: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+    value_max: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+    value_avg: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+    value_stddev: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+
+    file: Mapped[MeasurementFile] = relationship("MeasurementFile", back_populates="item_summaries")
+    item: Mapped[MeasurementItem] = relationship("MeasurementItem")
+
+
+class StatTrendRollup(Base):
+    """Running count/sum/sumsq/min/max of stat values per time bucket.
+
+    ``node_id``/``module_id`` use 0 for files without a node or module so the
+    primary key stays unique; they are therefore not foreign keys.
+    """
+
+    __tablename__ = "stat_trend_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "granularity",
+            "item_id",
+            "value_type_id",
+            "node_id",
+            "module_id",
+            "bucket_start",
+            name="pk_stat_trend_rollups",
+        ),
+    )
+
+    granularity: Mapped[str] = mapped_column(String(8), nullable=False)
+    item_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+    value_type_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+    node_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False, default=0)
+    module_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False, default=0)
+    bucket_start: Mapped[datetime] = mapped_column(DATETIME, nullable=False)
+    value_count: Mapped[int] = mapped_column(BIGINT, nullable=False, default=0)
+    value_sum: Mapped[float] = mapped_column(DOUBLE(asdecimal=False), nullable=False, default=0)
+    value_sumsq: Mapped[float] = mapped_column(DOUBLE(asdecimal=False), nullable=False, default=0)
+    value_min: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+    value_max: Mapped[float | None] = mapped_column(DOUBLE(asdecimal=False))
+
+
 __all__ = [
     "Base",
     "FileStatus",
+    "RawStorage",
     "MeasurementNode",
     "MeasurementModule",
     "MeasurementVersion",
     "MeasurementDirectory",
+    "MeasurementDirectoryClosure",
     "MeasurementFile",
     "MeasurementMetricType",
     "MeasurementItem",
     "RawMeasurementRecord",
+    "RawMeasurementBlob",
     "StatMeasurement",
     "StatValueType",
     "StatMeasurementValue",
     "DetectionClass",
     "FileClassCount",
+    "FileSummary",
+    "FileItemSummary",
+    "StatTrendRollup",
 ]
@@ -1,9 +1,19 @@
 """Pydantic schemas for request/response bodies."""
 
+import base64
+import sys
+from array import array
 from datetime import datetime
-from typing import Any
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PlainValidator,
+    WithJsonSchema,
+    model_validator,
+)
 
 
 class MeasurementFileBase(BaseModel):
@@ -115,6 +125,25 @@ class FileClassCountPayload(BaseModel):
     count: int
 
 
+def _normalize_class_counts(values: dict[str, Any]) -> dict[str, Any]:
+    counts = values.get("class_counts")
+    if counts is None:
+        values["class_counts"] = {}
+        return values
+    if isinstance(counts, dict):
+        return values
+    if isinstance(counts, list):
+        normalized: dict[str, int] = {}
+        for entry in counts:
+            payload = entry
+            if not isinstance(entry, FileClassCountPayload):
+                payload = FileClassCountPayload(**entry)
+            normalized[payload.class_name] = payload.count
+        values["class_counts"] = normalized
+        return values
+    raise ValueError("class_counts must be a dict or list of objects")
+
+
 class MeasurementPipelineCreate(BaseModel):
     file: MeasurementFileCreate
     raw_measurements: list[PipelineRawMeasurement] = Field(default_factory=list)
@@ -124,22 +153,7 @@ class MeasurementPipelineCreate(BaseModel):
     @model_validator(mode="before")
     @classmethod
     def normalize_class_counts(cls, values: dict[str, Any]) -> dict[str, Any]:
-        counts = values.get("class_counts")
-        if counts is None:
-            values["class_counts"] = {}
-            return values
-        if isinstance(counts, dict):
-            return values
-        if isinstance(counts, list):
-            normalized: dict[str, int] = {}
-            for entry in counts:
-                payload = entry
-                if not isinstance(entry, FileClassCountPayload):
-                    payload = FileClassCountPayload(**entry)
-                normalized[payload.class_name] = payload.count
-            values["class_counts"] = normalized
-            return values
-        raise ValueError("class_counts must be a dict or list of objects")
+        return _normalize_class_counts(values)
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -202,10 +216,237 @@ class MeasurementPipelineCreate(BaseModel):
     )
 
 
+class MeasurementStreamHeader(BaseModel):
+    file: MeasurementFileCreate
+
+
+class MeasurementDiffSummary(BaseModel):
+    unchanged: int = 0
+    updated: int = 0
+    inserted: int = 0
+    deleted: int = 0
+
+
+def _column_validator(typecode: str, dtype: str):
+    """Build a validator turning a JSON array or base64 buffer into an ``array``.
+
+    Buffers are little-endian ``dtype`` values; JSON arrays are type-checked by
+    the ``array`` constructor itself, so no per-element Python objects are kept.
+    """
+
+    itemsize = array(typecode).itemsize
+
+    def validate(value: Any) -> array:
+        if isinstance(value, array) and value.typecode == typecode:
+            return value
+        if isinstance(value, str):
+            try:
+                buffer = base64.b64decode(value, validate=True)
+            except ValueError as exc:
+                raise ValueError(f"invalid base64 {dtype} buffer") from exc
+            if len(buffer) % itemsize:
+                raise ValueError(f"{dtype} buffer length must be a multiple of {itemsize} bytes")
+            column = array(typecode)
+            column.frombytes(buffer)
+            if sys.byteorder == "big":
+                column.byteswap()
+            return column
+        if isinstance(value, list):
+            try:
+                return array(typecode, value)
+            except (TypeError, OverflowError) as exc:
+                raise ValueError(f"array items must be {dtype} values") from exc
+        raise ValueError(f"expected a JSON array or a base64 little-endian {dtype} buffer")
+
+    return validate
+
+
+def _column_type(typecode: str, dtype: str, item_type: str) -> Any:
+    return Annotated[
+        array,
+        PlainValidator(_column_validator(typecode, dtype)),
+        WithJsonSchema(
+            {
+                "anyOf": [
+                    {"type": "array", "items": {"type": item_type}},
+                    {"type": "string", "format": "base64", "description": f"little-endian {dtype}"},
+                ]
+            }
+        ),
+    ]
+
+
+Int32Column = _column_type("i", "int32", "integer")
+Float64Column = _column_type("d", "float64", "number")
+BoolColumn = _column_type("B", "uint8", "boolean")
+
+
+class ColumnarRawMeasurements(BaseModel):
+    """Raw points as parallel columns; ``item_idx`` indexes the payload ``items`` table."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    item_idx: Int32Column
+    x_index: Int32Column
+    y_index: Int32Column
+    x_0: Float64Column
+    y_0: Float64Column
+    x_1: Float64Column
+    y_1: Float64Column
+    value: Float64Column
+    measurable: BoolColumn | None = None
+
+    @model_validator(mode="after")
+    def check_lengths(self) -> "ColumnarRawMeasurements":
+        lengths = {
+            name: len(column)
+            for name, column in self
+            if column is not None
+        }
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"raw columns must have equal lengths, got {lengths}")
+        return self
+
+    def __len__(self) -> int:
+        return len(self.item_idx)
+
+
+class MeasurementColumnarCreate(BaseModel):
+    file: MeasurementFileCreate
+    items: list[MeasurementItemLink] = Field(default_factory=list)
+    raw: ColumnarRawMeasurements | None = None
+    stat_measurements: list[PipelineStatMeasurement] = Field(default_factory=list)
+    class_counts: dict[str, int] = Field(default_factory=dict)
+
+    @model_validator(mode="before")
+    @classmethod
+    def normalize_class_counts(cls, values: dict[str, Any]) -> dict[str, Any]:
+        return _normalize_class_counts(values)
+
+    @model_validator(mode="after")
+    def check_item_indexes(self) -> "MeasurementColumnarCreate":
+        if self.raw is not None and len(self.raw):
+            if min(self.raw.item_idx) < 0 or max(self.raw.item_idx) >= len(self.items):
+                raise ValueError(f"raw.item_idx must be within [0, {len(self.items)})")
+        return self
+
+
 class MeasurementPipelineResult(BaseModel):
     file: MeasurementFileRead
     raw_records: int
     stat_measurements: int
+    changes: MeasurementDiffSummary | None = None
+
+
+class MeasurementBatchItemResult(BaseModel):
+    index: int
+    file_name: str
+    status: Literal["ok", "error", "rolled_back"]
+    result: MeasurementPipelineResult | None = None
+    error: str | None = None
+
+
+class MeasurementBatchResult(BaseModel):
+    transaction: Literal["per_file", "all_or_nothing"]
+    succeeded: int
+    failed: int
+    files: list[MeasurementBatchItemResult]
+
+
+class MeasurementJobRead(BaseModel):
+    id: str
+    status: Literal["queued", "running", "done", "failed"]
+    created_at: datetime
+    updated_at: datetime
+    result: MeasurementPipelineResult | None = None
+    error: str | None = None
+
+
+class RawMeasurementPoint(BaseModel):
+    item_id: int
+    class_name: str
+    measure_item_key: str
+    metric_name: str
+    metric_unit: str | None = None
+    measurable: bool
+    x_index: int
+    y_index: int
+    x_0: float
+    y_0: float
+    x_1: float
+    y_1: float
+    value: float
+
+
+class RawMeasurementPage(BaseModel):
+    file_id: int
+    items: list[RawMeasurementPoint]
+    next_cursor: str | None = None
+
+
+class FileItemSummaryRead(BaseModel):
+    item_id: int
+    class_name: str
+    measure_item_key: str
+    metric_name: str
+    raw_points: int
+    measurable_points: int
+    value_min: float | None = None
+    value_max: float | None = None
+    value_avg: float | None = None
+    value_stddev: float | None = None
+
+
+class FileOverviewRead(BaseModel):
+    file_id: int
+    file_name: str
+    post_time: datetime
+    node: str | None = None
+    module: str | None = None
+    version: str | None = None
+    raw_points: int
+    measurable_points: int
+    item_count: int
+    stat_sets: int
+    value_min: float | None = None
+    value_max: float | None = None
+    value_avg: float | None = None
+    items: list[FileItemSummaryRead] | None = None
+
+
+class FileOverviewPage(BaseModel):
+    files: list[FileOverviewRead]
+    next_cursor: str | None = None
+
+
+class MeasurementFileListItem(MeasurementFileRead):
+    node: str | None = None
+    module: str | None = None
+    version: str | None = None
+    raw_storage: str = "rows"
+
+
+class MeasurementFilePage(BaseModel):
+    files: list[MeasurementFileListItem]
+    next_cursor: str | None = None
+
+
+class TrendPoint(BaseModel):
+    bucket_start: datetime
+    node: str | None = None
+    module: str | None = None
+    count: int
+    mean: float
+    stddev: float
+    min: float | None = None
+    max: float | None = None
+
+
+class TrendSeries(BaseModel):
+    item_id: int
+    value_type: str
+    granularity: Literal["hour", "day"]
+    points: list[TrendPoint]
 
 
 __all__ = [
@@ -222,5 +463,21 @@ __all__ = [
     "PipelineStatMeasurement",
     "FileClassCountPayload",
     "MeasurementPipelineCreate",
+    "ColumnarRawMeasurements",
+    "MeasurementColumnarCreate",
+    "MeasurementStreamHeader",
+    "MeasurementDiffSummary",
     "MeasurementPipelineResult",
+    "MeasurementBatchItemResult",
+    "MeasurementBatchResult",
+    "MeasurementJobRead",
+    "RawMeasurementPoint",
+    "RawMeasurementPage",
+    "FileItemSummaryRead",
+    "FileOverviewRead",
+    "FileOverviewPage",
+    "MeasurementFileListItem",
+    "MeasurementFilePage",
+    "TrendPoint",
+    "TrendSeries",
 ]
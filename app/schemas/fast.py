@@ -0,0 +1,153 @@
+"""Opt-in fast validation of ``MeasurementPipelineCreate`` bodies (``INGEST_FAST_VALIDATION``).
+
+Pydantic builds a ``PipelineRawMeasurement`` with nested item and metric
+models for every point. Here each point is checked by hand against the
+decoded JSON and stored as a :class:`RawPoint` tuple that shares one
+interned :class:`MeasurementItemLink` per distinct item. Only points that do
+not have the exact JSON types (an ``int`` index, a numeric coordinate, a
+``bool`` flag) fall back to pydantic, so coercion rules and error entries,
+including their ``loc``, stay exactly those of the regular model.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+from pydantic import ValidationError
+
+from . import MeasurementItemLink, MeasurementPipelineCreate, PipelineRawMeasurement
+
+
+class RawPoint(NamedTuple):
+    """Attribute-compatible stand-in for :class:`PipelineRawMeasurement`."""
+
+    item: MeasurementItemLink
+    measurable: bool
+    x_index: int
+    y_index: int
+    x_0: float
+    y_0: float
+    x_1: float
+    y_1: float
+    value: float
+
+
+_FIELD_ORDER = {name: index for index, name in enumerate(MeasurementPipelineCreate.model_fields)}
+
+
+class ItemLinkInterner:
+    """Validate each distinct item link once and hand out the shared instance."""
+
+    def __init__(self) -> None:
+        self._links: dict[tuple[str, str, str, str | None], MeasurementItemLink] = {}
+
+    def get(self, item: Any) -> MeasurementItemLink | None:
+        """Return the interned link, or ``None`` when ``item`` needs full validation."""
+
+        if type(item) is not dict:
+            return None
+        metric = item.get("metric_type")
+        if type(metric) is not dict:
+            return None
+        class_name = item.get("class_name")
+        measure_item_key = item.get("measure_item_key")
+        metric_name = metric.get("name")
+        unit = metric.get("unit")
+        if (
+            type(class_name) is not str
+            or type(measure_item_key) is not str
+            or type(metric_name) is not str
+            or (unit is not None and type(unit) is not str)
+        ):
+            return None
+        key = (class_name, measure_item_key, metric_name, unit)
+        link = self._links.get(key)
+        if link is None:
+            link = self._links[key] = MeasurementItemLink(
+                class_name=class_name,
+                measure_item_key=measure_item_key,
+                metric_type={"name": metric_name, "unit": unit},
+            )
+        return link
+
+
+def _as_float(value: Any) -> float | None:
+    kind = type(value)
+    if kind is float:
+        return value
+    if kind is int:
+        try:
+            return float(value)
+        except OverflowError:
+            # Out of float range; pydantic reports it as a validation error.
+            return None
+    return None
+
+
+def _fast_point(entry: Any, items: ItemLinkInterner) -> RawPoint | None:
+    if type(entry) is not dict:
+        return None
+    item = items.get(entry.get("item"))
+    if item is None:
+        return None
+    x_index = entry.get("x_index")
+    y_index = entry.get("y_index")
+    measurable = entry.get("measurable", True)
+    if type(x_index) is not int or type(y_index) is not int or type(measurable) is not bool:
+        return None
+    x_0 = _as_float(entry.get("x_0"))
+    y_0 = _as_float(entry.get("y_0"))
+    x_1 = _as_float(entry.get("x_1"))
+    y_1 = _as_float(entry.get("y_1"))
+    value = _as_float(entry.get("value"))
+    if x_0 is None or y_0 is None or x_1 is None or y_1 is None or value is None:
+        return None
+    return RawPoint(item, measurable, x_index, y_index, x_0, y_0, x_1, y_1, value)
+
+
+def validate_raw_points(
+    entries: list[Any], items: ItemLinkInterner | None = None
+) -> tuple[list[RawPoint | PipelineRawMeasurement], list[dict[str, Any]]]:
+    """Validate ``raw_measurements`` entries; errors are located under ``raw_measurements``."""
+
+    items = items or ItemLinkInterner()
+    points: list[RawPoint | PipelineRawMeasurement] = []
+    errors: list[dict[str, Any]] = []
+    for index, entry in enumerate(entries):
+        point = _fast_point(entry, items)
+        if point is not None:
+            points.append(point)
+            continue
+        try:
+            points.append(PipelineRawMeasurement.model_validate(entry))
+        except ValidationError as exc:
+            errors.extend(
+                {**error, "loc": ("raw_measurements", index, *error["loc"])}
+                for error in exc.errors(include_url=False)
+            )
+    return points, errors
+
+
+def validate_pipeline_fast(data: Any) -> MeasurementPipelineCreate:
+    """Validate a decoded pipeline body, raising the same ``ValidationError`` as the model."""
+
+    raw_entries = data.get("raw_measurements", []) if isinstance(data, dict) else None
+    if not isinstance(raw_entries, list):
+        return MeasurementPipelineCreate.model_validate(data)
+
+    errors: list[dict[str, Any]] = []
+    payload = None
+    try:
+        payload = MeasurementPipelineCreate.model_validate(
+            {key: value for key, value in data.items() if key != "raw_measurements"}
+        )
+    except ValidationError as exc:
+        errors.extend(exc.errors(include_url=False))
+    points, point_errors = validate_raw_points(raw_entries)
+    errors.extend(point_errors)
+    if errors or payload is None:
+        errors.sort(key=lambda error: _FIELD_ORDER.get(str(error["loc"][0]), len(_FIELD_ORDER)))
+        raise ValidationError.from_exception_data(MeasurementPipelineCreate.__name__, errors)
+    # The ingest path only reads the point attributes, which RawPoint mirrors.
+    payload.raw_measurements = points  # type: ignore[assignment]
+    return payload
@@ -0,0 +1 @@
+"""Reproducible ingest benchmarks (``python -m benchmarks.ingest``)."""
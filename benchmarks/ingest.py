@@ -0,0 +1,306 @@
+"""Ingest benchmark: drive ``POST /measurement-results/`` in-process and report latency.
+
+Usage::
+
+    python -m benchmarks.ingest                                  # all scenarios, SQLite stand-in
+    python -m benchmarks.ingest --database-url mysql+asyncmy://u:p@localhost/bench
+    python -m benchmarks.ingest --output current.json --baseline baseline.json --threshold 0.1
+
+Needs the dev requirements (``pip install -r requirements-dev.txt``):
+httpx drives the app in-process and aiosqlite backs the SQLite stand-in.
+
+Each scenario runs in a fresh process so peak RSS belongs to that scenario
+alone. Payloads are generated and JSON-encoded before timing starts; the
+measured latency covers request parsing, validation, the database work and
+the response. The exit status is 1 when ``--baseline`` shows a regression.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal
+
+from .payloads import PayloadSpec, generate_payloads
+
+
+IngestMode = Literal["replace", "diff"]
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+# Metrics where a larger value is worse; rows_per_sec is the opposite.
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb", "db_round_trips_per_file")
+HIGHER_IS_BETTER = ("rows_per_sec",)
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    name: str
+    spec: PayloadSpec
+    files: int
+    mode: IngestMode = "replace"
+    warmup: int = 2
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("small_files", PayloadSpec(points=2_000, items=10, stat_value_types=4, classes=5), files=60),
+        Scenario("full_wafer", PayloadSpec(points=50_000, items=20, stat_value_types=4, classes=8), files=8),
+        Scenario(
+            "duplicates_replace",
+            PayloadSpec(points=5_000, items=10, stat_value_types=4, classes=5, duplicate_ratio=0.5),
+            files=40,
+        ),
+        Scenario(
+            "duplicates_diff",
+            PayloadSpec(points=5_000, items=10, stat_value_types=4, classes=5, duplicate_ratio=0.5),
+            files=40,
+            mode="diff",
+        ),
+        Scenario("stat_heavy", PayloadSpec(points=500, items=200, stat_value_types=8, classes=20), files=40),
+    )
+}
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    name: str
+    files: int
+    rows: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rows_per_sec: float
+    peak_rss_mb: float
+    db_round_trips_per_file: float
+    spec: dict[str, Any] = field(default_factory=dict)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentiles(latencies: list[float]) -> tuple[float, float, float]:
+    if len(latencies) == 1:
+        return latencies[0], latencies[0], latencies[0]
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+async def _run_scenario(scenario: Scenario, database_url: str) -> ScenarioResult:
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.core import dimension_cache, get_read_session, get_session
+    from app.main import app
+    from app.models import Base
+
+    if database_url.startswith("sqlite"):
+        from .sqlite_standin import create_standin_engine
+
+        db_engine = create_standin_engine(database_url)
+    else:
+        db_engine = create_async_engine(database_url)
+    session_maker = async_sessionmaker(db_engine, expire_on_commit=False)
+    # Cached dimension ids belong to whichever database the previous
+    # scenario used; start every scenario cold.
+    dimension_cache.invalidate()
+    round_trips = 0
+
+    @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+    def _count(*args: Any) -> None:
+        nonlocal round_trips
+        round_trips += 1
+
+    async def override_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_read_session] = override_session
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # A fresh tag per run keeps repeated runs against a persistent MySQL
+    # database from turning first inserts into replacements.
+    run_tag = uuid.uuid4().hex[:8]
+    bodies = [
+        json.dumps(payload).encode()
+        for payload in generate_payloads(scenario.spec, scenario.warmup + scenario.files, run_tag)
+    ]
+    latencies: list[float] = []
+    rows = 0
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for index, body in enumerate(bodies):
+                if index == scenario.warmup:
+                    round_trips = 0
+                started = time.perf_counter()
+                response = await client.post(
+                    "/measurement-results/",
+                    params={"mode": scenario.mode},
+                    content=body,
+                    headers={"content-type": "application/json"},
+                )
+                elapsed = time.perf_counter() - started
+                if response.status_code != 201:
+                    raise RuntimeError(
+                        f"{scenario.name}: ingest returned {response.status_code}: {response.text[:500]}"
+                    )
+                if index < scenario.warmup:
+                    continue
+                result = response.json()
+                rows += result["raw_records"] + result["stat_measurements"]
+                latencies.append(elapsed)
+    finally:
+        app.dependency_overrides.clear()
+        await db_engine.dispose()
+
+    p50, p95, p99 = _percentiles(latencies)
+    return ScenarioResult(
+        name=scenario.name,
+        files=len(latencies),
+        rows=rows,
+        mean_ms=round(statistics.fmean(latencies) * 1000, 3),
+        p50_ms=round(p50 * 1000, 3),
+        p95_ms=round(p95 * 1000, 3),
+        p99_ms=round(p99 * 1000, 3),
+        rows_per_sec=round(rows / sum(latencies), 1),
+        peak_rss_mb=round(_peak_rss_mb(), 1),
+        db_round_trips_per_file=round(round_trips / len(latencies), 2),
+        spec={**asdict(scenario.spec), "mode": scenario.mode},
+    )
+
+
+def run_scenario(scenario: Scenario, database_url: str = DEFAULT_DATABASE_URL) -> ScenarioResult:
+    return asyncio.run(_run_scenario(scenario, database_url))
+
+
+def run_isolated(scenario: Scenario, database_url: str = DEFAULT_DATABASE_URL) -> ScenarioResult:
+    """Run ``scenario`` in a freshly spawned interpreter."""
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(run_scenario, (scenario, database_url))
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    """List every metric that moved past ``threshold`` (a fraction) in the bad direction."""
+
+    regressions: list[str] = []
+    for name, result in current.get("scenarios", {}).items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            now, before = result.get(metric), reference.get(metric)
+            if not now or not before:
+                continue
+            change = now / before - 1
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            if worse:
+                regressions.append(f"{name}.{metric}: {before} -> {now} ({change:+.1%})")
+    return regressions
+
+
+def _metadata(database_url: str) -> dict[str, Any]:
+    import sqlalchemy
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "database": database_url.split("://", 1)[0],
+    }
+
+
+def _format_table(results: list[ScenarioResult]) -> str:
+    header = f"{'scenario':<20} {'files':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows/s':>11} {'rss MB':>8} {'rt/file':>8}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.name:<20} {result.files:>5} {result.p50_ms:>9.2f} {result.p95_ms:>9.2f} "
+            f"{result.p99_ms:>9.2f} {result.rows_per_sec:>11.0f} {result.peak_rss_mb:>8.1f} "
+            f"{result.db_round_trips_per_file:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run; repeat for several (default: all).",
+    )
+    parser.add_argument("--files", type=int, help="Override the number of timed files per scenario.")
+    parser.add_argument("--seed", type=int, help="Override the payload seed.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous --output file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed relative change before a metric counts as a regression (default 0.10).",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run scenarios in this process (faster, but peak RSS accumulates).",
+    )
+    args = parser.parse_args(argv)
+
+    results: list[ScenarioResult] = []
+    for name in args.scenario or list(SCENARIOS):
+        scenario = SCENARIOS[name]
+        if args.files is not None:
+            scenario = replace(scenario, files=args.files)
+        if args.seed is not None:
+            scenario = replace(scenario, spec=replace(scenario.spec, seed=args.seed))
+        runner = run_scenario if args.in_process else run_isolated
+        results.append(runner(scenario, args.database_url))
+
+    print(_format_table(results))
+    report = {
+        "meta": _metadata(args.database_url),
+        "scenarios": {result.name: asdict(result) for result in results},
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.baseline is not None:
+        regressions = compare_results(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nno regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
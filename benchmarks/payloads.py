@@ -0,0 +1,144 @@
+"""Deterministic synthetic wafer payloads for the ingest benchmarks."""
+
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+
+WAFER_DIAMETER_MM = 300.0
+
+_VALUE_TYPES = ("AVG", "STD", "MIN", "MAX", "MEDIAN", "P05", "P95", "RANGE")
+
+
+@dataclass(frozen=True, slots=True)
+class PayloadSpec:
+    """Shape of one generated ``MeasurementPipelineCreate`` payload.
+
+    ``duplicate_ratio`` is the share of files that reuse the identity
+    (directories + file name, hence ``file_hash``) of an earlier file, so
+    they exercise the replace/diff path instead of a fresh insert.
+    """
+
+    points: int = 10_000
+    items: int = 10
+    stat_value_types: int = 4
+    classes: int = 5
+    duplicate_ratio: float = 0.0
+    unmeasurable_ratio: float = 0.02
+    seed: int = 0
+
+
+def _value_type_names(count: int) -> list[str]:
+    return [_VALUE_TYPES[i] if i < len(_VALUE_TYPES) else f"VT{i}" for i in range(count)]
+
+
+def _wafer_sites(count: int) -> list[tuple[int, int]]:
+    """The ``count`` die sites closest to the centre of a square grid, row-major."""
+
+    if count <= 0:
+        return []
+    side = max(math.ceil(math.sqrt(count * 4 / math.pi)) + 2, 1)
+    centre = (side - 1) / 2
+    sites = sorted(
+        ((x, y) for x in range(side) for y in range(side)),
+        key=lambda site: ((site[0] - centre) ** 2 + (site[1] - centre) ** 2, site),
+    )[:count]
+    return sorted(sites)
+
+
+def _file_identity(index: int, run_tag: str) -> dict[str, Any]:
+    return {
+        "file_path": f"/data/line_{index % 4}/img/lot_{index // 25:04d}/wafer_{run_tag}_{index:05d}.csv",
+        "parent_dir_2": f"line_{index % 4}",
+        "parent_dir_1": "img",
+        "parent_dir_0": f"lot_{run_tag}_{index // 25:04d}",
+        "file_name": f"wafer_{run_tag}_{index:05d}.csv",
+        "node_name": f"node{index % 4}",
+        "module_name": f"module{index % 3}",
+        "version_name": "v1",
+    }
+
+
+def generate_payloads(spec: PayloadSpec, files: int, run_tag: str = "bench") -> Iterator[dict[str, Any]]:
+    """Yield ``files`` JSON-ready payloads; the same arguments give the same payloads."""
+
+    rng = random.Random(spec.seed)
+    items = [
+        {
+            "class_name": f"ITEM_{item:03d}",
+            "measure_item_key": "CD_TOP" if item % 2 == 0 else "CD_BOTTOM",
+            "metric_type": {"name": "CD", "unit": "nm"},
+        }
+        for item in range(max(spec.items, 1))
+    ]
+    per_item = spec.points // len(items)
+    extra = spec.points - per_item * len(items)
+    site_cache: dict[int, list[tuple[int, int]]] = {}
+    value_types = _value_type_names(spec.stat_value_types)
+    identities: list[int] = []
+
+    for index in range(files):
+        if identities and rng.random() < spec.duplicate_ratio:
+            identity = rng.choice(identities)
+        else:
+            identity = index
+            identities.append(identity)
+
+        raw: list[dict[str, Any]] = []
+        stats: list[dict[str, Any]] = []
+        for item_index, item in enumerate(items):
+            count = per_item + (1 if item_index < extra else 0)
+            sites = site_cache.get(count)
+            if sites is None:
+                sites = site_cache[count] = _wafer_sites(count)
+            side = max((max(x for x, _ in sites) + 1) if sites else 1, 1)
+            pitch = WAFER_DIAMETER_MM / side
+            centre = (side - 1) / 2
+            base = 40.0 + item_index * 0.5
+            values: list[float] = []
+            for x, y in sites:
+                radius = math.hypot(x - centre, y - centre) / max(centre, 1)
+                value = base + 1.5 * radius * radius + rng.gauss(0.0, 0.3)
+                measurable = rng.random() >= spec.unmeasurable_ratio
+                if measurable:
+                    values.append(value)
+                raw.append(
+                    {
+                        "item": item,
+                        "measurable": measurable,
+                        "x_index": x,
+                        "y_index": y,
+                        "x_0": round(x * pitch, 3),
+                        "y_0": round(y * pitch, 3),
+                        "x_1": round((x + 1) * pitch, 3),
+                        "y_1": round((y + 1) * pitch, 3),
+                        "value": round(value, 4),
+                    }
+                )
+            if value_types:
+                mean = sum(values) / len(values) if values else 0.0
+                stats.append(
+                    {
+                        "item": item,
+                        "values": [
+                            {"value_type_name": name, "value": round(mean + rng.gauss(0.0, 0.1), 4)}
+                            for name in value_types
+                        ],
+                    }
+                )
+
+        yield {
+            "file": {
+                **_file_identity(identity, run_tag),
+                "post_time": f"2026-01-{1 + index % 28:02d}T{index % 24:02d}:00:00",
+                "processing_ms": rng.randint(200, 3000),
+                "status": "OK",
+            },
+            "raw_measurements": raw,
+            "stat_measurements": stats,
+            "class_counts": {f"CLASS_{c}": rng.randint(0, 500) for c in range(spec.classes)},
+        }
@@ -0,0 +1,128 @@
+"""Let the MySQL-flavoured schema and upserts run on SQLite for local benchmarks.
+
+Only what the ingest path needs: MySQL-only column types compile to their
+SQLite equivalents, the auto-increment ``id`` of the partitioned tables'
+``(id, post_date)`` keys becomes the rowid (the key itself a ``UNIQUE``
+constraint, since SQLite cannot auto-increment a composite key),
+``INSERT ... ON DUPLICATE KEY UPDATE`` becomes ``INSERT ... ON CONFLICT DO
+UPDATE`` (``VALUES(col)`` -> ``excluded.col``), and ``LEAST``/``GREATEST``
+are registered as SQL functions. String columns get an approximation of
+``utf8mb4_unicode_ci`` (case- and accent-insensitive, trailing spaces
+ignored) so unique keys and lookups match names the way MySQL does. Absolute numbers
+on SQLite say little about MySQL; the stand-in exists so regressions in the
+Python side of ingest show up without a database server.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Any
+
+from sqlalchemy import Column, PrimaryKeyConstraint, String, event, literal, literal_column
+from sqlalchemy.dialects.mysql import BIGINT, LONGBLOB
+from sqlalchemy.dialects.mysql.dml import OnDuplicateClause
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import ClauseElement, ColumnClause
+
+
+@compiles(BIGINT, "sqlite")
+def _compile_bigint(type_: BIGINT, compiler: Any, **kw: Any) -> str:
+    # INTEGER keeps "INTEGER PRIMARY KEY" rowid aliasing, i.e. autoincrement.
+    return "INTEGER"
+
+
+@compiles(LONGBLOB, "sqlite")
+def _compile_longblob(type_: LONGBLOB, compiler: Any, **kw: Any) -> str:
+    return "BLOB"
+
+
+MYSQL_COLLATION = "utf8mb4_unicode_ci"
+
+
+@compiles(String, "sqlite")
+def _compile_string(type_: String, compiler: Any, **kw: Any) -> str:
+    return f"{compiler.visit_string(type_, **kw)} COLLATE {MYSQL_COLLATION}"
+
+
+def _collation_key(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold().rstrip(" ")
+
+
+def _compare_unicode_ci(left: str, right: str) -> int:
+    left_key, right_key = _collation_key(left), _collation_key(right)
+    return (left_key > right_key) - (left_key < right_key)
+
+
+def _is_composite_autoincrement(column: Column) -> bool:
+    return column.autoincrement is True and column.primary_key and len(column.table.primary_key) > 1
+
+
+@compiles(CreateColumn, "sqlite")
+def _compile_create_column(element: CreateColumn, compiler: Any, **kw: Any) -> str:
+    column = element.element
+    if _is_composite_autoincrement(column):
+        return f"{compiler.preparer.format_column(column)} INTEGER PRIMARY KEY"
+    return compiler.visit_create_column(element, **kw)
+
+
+@compiles(PrimaryKeyConstraint, "sqlite")
+def _compile_primary_key(constraint: PrimaryKeyConstraint, compiler: Any, **kw: Any) -> str:
+    if any(_is_composite_autoincrement(column) for column in constraint.columns):
+        columns = ", ".join(compiler.preparer.format_column(column) for column in constraint.columns)
+        return f"UNIQUE ({columns})"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
+
+
+@compiles(OnDuplicateClause, "sqlite")
+def _compile_on_duplicate(clause: OnDuplicateClause, compiler: Any, **kw: Any) -> str:
+    inserted = clause.inserted_alias
+
+    def to_excluded(element: Any) -> Any:
+        if isinstance(element, ColumnClause) and element.table is inserted:
+            return literal_column(f"excluded.{compiler.preparer.quote(element.name)}")
+        return None
+
+    assignments = []
+    for name, value in clause.update.items():
+        key = name if isinstance(name, str) else name.name
+        if not isinstance(value, ClauseElement):
+            value = literal(value)
+        value = visitors.replacement_traverse(value, {}, to_excluded)
+        assignments.append(
+            f"{compiler.preparer.quote(key)} = {compiler.process(value.self_group(), **kw)}"
+        )
+    return "ON CONFLICT DO UPDATE SET " + ", ".join(assignments)
+
+
+def _least(*args: Any) -> Any:
+    return None if any(arg is None for arg in args) else min(args)
+
+
+def _greatest(*args: Any) -> Any:
+    return None if any(arg is None for arg in args) else max(args)
+
+
+def create_standin_engine(url: str = "sqlite+aiosqlite:///:memory:") -> AsyncEngine:
+    """Async SQLite engine with foreign keys on and the MySQL helpers installed."""
+
+    db_engine = create_async_engine(url)
+
+    @event.listens_for(db_engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.create_function("least", -1, _least, deterministic=True)
+        dbapi_connection.create_function("greatest", -1, _greatest, deterministic=True)
+        # The aiosqlite adapter has no create_collation; register it on the
+        # sqlite3 connection from aiosqlite's own thread.
+        driver = dbapi_connection.driver_connection
+        dbapi_connection.await_(
+            driver._execute(driver._conn.create_collation, MYSQL_COLLATION, _compare_unicode_ci)
+        )
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return db_engine
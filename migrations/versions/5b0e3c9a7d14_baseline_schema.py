@@ -0,0 +1,384 @@
+"""Baseline schema from sql/create_db.sql
+
+The tables of sql/create_db.sql at the time migrations were introduced.
+Databases created earlier from sql/create_db.sql (with the directory path and
+closure backfills applied) are adopted with ``alembic stamp 5b0e3c9a7d14``
+instead of running this revision.
+
+Revision ID: 5b0e3c9a7d14
+Revises:
+Create Date: 2026-10-17 09:00:00
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "5b0e3c9a7d14"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of the DDL; later schema changes get their own revisions. The
+# monthly partitions listed here are only the initial layout: later months
+# are split out of pmax by app.core.retention, not by migrations.
+_TABLES: tuple[tuple[str, str], ...] = (
+    (
+        "measurement_nodes",
+        """
+CREATE TABLE measurement_nodes (
+  id   BIGINT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(128) NOT NULL,
+  UNIQUE KEY uk_nodes_name (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "measurement_modules",
+        """
+CREATE TABLE measurement_modules (
+  id   BIGINT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(128) NOT NULL,
+  UNIQUE KEY uk_modules_name (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "measurement_versions",
+        """
+CREATE TABLE measurement_versions (
+  id   BIGINT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(128) NOT NULL,
+  UNIQUE KEY uk_versions_name (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "measurement_directories",
+        """
+CREATE TABLE measurement_directories (
+  id        BIGINT AUTO_INCREMENT PRIMARY KEY,
+  parent_id BIGINT NULL,
+  name      VARCHAR(255) NOT NULL,
+  path      TEXT NOT NULL,
+  CONSTRAINT fk_directories_parent
+    FOREIGN KEY (parent_id) REFERENCES measurement_directories(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  UNIQUE KEY uk_directories_parent_name (parent_id, name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "measurement_directory_closure",
+        """
+CREATE TABLE measurement_directory_closure (
+  ancestor_id   BIGINT NOT NULL,
+  descendant_id BIGINT NOT NULL,
+  depth         INT NOT NULL,
+  PRIMARY KEY (ancestor_id, descendant_id),
+  KEY idx_directory_closure_descendant (descendant_id, depth),
+  CONSTRAINT fk_closure_ancestor
+    FOREIGN KEY (ancestor_id) REFERENCES measurement_directories(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_closure_descendant
+    FOREIGN KEY (descendant_id) REFERENCES measurement_directories(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "measurement_files",
+        """
+CREATE TABLE measurement_files (
+  id             BIGINT AUTO_INCREMENT PRIMARY KEY,
+  post_time      DATETIME(6) NOT NULL,
+  post_date      DATE AS (DATE(post_time)) STORED,
+  file_path      TEXT NOT NULL,
+  file_name      VARCHAR(255) NOT NULL,
+  node_id        BIGINT NULL,
+  module_id      BIGINT NULL,
+  version_id     BIGINT NULL,
+  directory_id   BIGINT NULL,
+  file_hash      CHAR(64) NULL,
+  processing_ms  INT NULL,
+  status         ENUM('OK','FAIL') NOT NULL DEFAULT 'OK',
+  raw_storage    ENUM('rows','blob') NOT NULL DEFAULT 'rows',
+  created_at     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  CONSTRAINT fk_files_node
+    FOREIGN KEY (node_id) REFERENCES measurement_nodes(id)
+    ON DELETE SET NULL ON UPDATE CASCADE,
+  CONSTRAINT fk_files_module
+    FOREIGN KEY (module_id) REFERENCES measurement_modules(id)
+    ON DELETE SET NULL ON UPDATE CASCADE,
+  CONSTRAINT fk_files_version
+    FOREIGN KEY (version_id) REFERENCES measurement_versions(id)
+    ON DELETE SET NULL ON UPDATE CASCADE,
+  CONSTRAINT fk_files_directory
+    FOREIGN KEY (directory_id) REFERENCES measurement_directories(id)
+    ON DELETE SET NULL ON UPDATE CASCADE,
+  UNIQUE KEY uk_measurement_files_hash (file_hash),
+  KEY idx_files_post_time (post_time),
+  KEY idx_files_node_time (node_id, post_time),
+  KEY idx_files_module_time (module_id, post_time),
+  KEY idx_files_version_time (version_id, post_time),
+  KEY idx_files_directory_time (directory_id, post_time),
+  KEY idx_files_status_time (status, post_time),
+  KEY idx_files_date_module (post_date, module_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "measurement_metric_types",
+        """
+CREATE TABLE measurement_metric_types (
+  id        BIGINT AUTO_INCREMENT PRIMARY KEY,
+  name      VARCHAR(64) NOT NULL,
+  unit      VARCHAR(32) NULL,
+  is_active TINYINT(1) NOT NULL DEFAULT 1,
+  UNIQUE KEY uk_metric_name (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "measurement_items",
+        """
+CREATE TABLE measurement_items (
+  id              BIGINT AUTO_INCREMENT PRIMARY KEY,
+  class_name      VARCHAR(64) NOT NULL,
+  measure_item_key VARCHAR(64) NOT NULL,
+  metric_type_id  BIGINT NOT NULL,
+  is_active       TINYINT(1) NOT NULL DEFAULT 1,
+  CONSTRAINT fk_items_metric_type
+    FOREIGN KEY (metric_type_id) REFERENCES measurement_metric_types(id)
+    ON DELETE RESTRICT ON UPDATE CASCADE,
+  UNIQUE KEY uk_item_class_key (class_name, measure_item_key, metric_type_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "raw_measurement_records",
+        """
+CREATE TABLE raw_measurement_records (
+  id             BIGINT AUTO_INCREMENT,
+  file_id        BIGINT NOT NULL,
+  item_id        BIGINT NOT NULL,
+  post_date      DATE NOT NULL,
+  measurable     TINYINT(1) NOT NULL DEFAULT 1,
+  x_index        INT NOT NULL,
+  y_index        INT NOT NULL,
+  x_0            DOUBLE NOT NULL,
+  y_0            DOUBLE NOT NULL,
+  x_1            DOUBLE NOT NULL,
+  y_1            DOUBLE NOT NULL,
+  value          DOUBLE NOT NULL,
+  PRIMARY KEY (id, post_date),
+  UNIQUE KEY uk_raw_file_item_xy (file_id, item_id, x_index, y_index, post_date),
+  KEY idx_raw_item (item_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+PARTITION BY RANGE COLUMNS(post_date) (
+  PARTITION p000000 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION pmax VALUES LESS THAN (MAXVALUE)
+)
+""",
+    ),
+    (
+        "raw_measurement_blobs",
+        """
+CREATE TABLE raw_measurement_blobs (
+  file_id          BIGINT NOT NULL,
+  item_id          BIGINT NOT NULL,
+  codec            VARCHAR(8) NOT NULL,
+  point_count      INT NOT NULL,
+  measurable_count INT NOT NULL,
+  value_min        DOUBLE NOT NULL,
+  value_max        DOUBLE NOT NULL,
+  checksum         VARCHAR(64) NOT NULL,
+  payload          LONGBLOB NOT NULL,
+  PRIMARY KEY (file_id, item_id),
+  CONSTRAINT fk_raw_blob_file
+    FOREIGN KEY (file_id) REFERENCES measurement_files(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_raw_blob_item
+    FOREIGN KEY (item_id) REFERENCES measurement_items(id)
+    ON DELETE RESTRICT ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "stat_measurements",
+        """
+CREATE TABLE stat_measurements (
+  id             BIGINT AUTO_INCREMENT,
+  file_id        BIGINT NOT NULL,
+  item_id        BIGINT NOT NULL,
+  post_date      DATE NOT NULL,
+  PRIMARY KEY (id, post_date),
+  UNIQUE KEY uk_stat_file_item (file_id, item_id, post_date),
+  KEY idx_stat_item (item_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+PARTITION BY RANGE COLUMNS(post_date) (
+  PARTITION p000000 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION pmax VALUES LESS THAN (MAXVALUE)
+)
+""",
+    ),
+    (
+        "stat_value_types",
+        """
+CREATE TABLE stat_value_types (
+  id        BIGINT AUTO_INCREMENT PRIMARY KEY,
+  name      VARCHAR(32) NOT NULL,
+  is_active TINYINT(1) NOT NULL DEFAULT 1,
+  UNIQUE KEY uk_stat_value_type_name (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "stat_measurement_values",
+        """
+CREATE TABLE stat_measurement_values (
+  stat_measurement_id BIGINT NOT NULL,
+  value_type_id       BIGINT NOT NULL,
+  post_date           DATE NOT NULL,
+  value               DOUBLE NOT NULL,
+  PRIMARY KEY (stat_measurement_id, value_type_id, post_date),
+  KEY idx_stat_values_type (value_type_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+PARTITION BY RANGE COLUMNS(post_date) (
+  PARTITION p000000 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION pmax VALUES LESS THAN (MAXVALUE)
+)
+""",
+    ),
+    (
+        "classes",
+        """
+CREATE TABLE classes (
+  id        BIGINT AUTO_INCREMENT PRIMARY KEY,
+  name      VARCHAR(64) NOT NULL,
+  is_active TINYINT(1) NOT NULL DEFAULT 1,
+  UNIQUE KEY uk_classes_name (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "file_class_counts",
+        """
+CREATE TABLE file_class_counts (
+  file_id   BIGINT NOT NULL,
+  class_id  BIGINT NOT NULL,
+  cnt       INT    NOT NULL,
+  PRIMARY KEY (file_id, class_id),
+  CONSTRAINT fk_fcc_file  FOREIGN KEY (file_id) REFERENCES measurement_files(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_fcc_class FOREIGN KEY (class_id) REFERENCES classes(id)
+    ON DELETE RESTRICT ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "file_summaries",
+        """
+CREATE TABLE file_summaries (
+  file_id           BIGINT NOT NULL PRIMARY KEY,
+  raw_points        BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  measurable_points BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  item_count        INT NOT NULL DEFAULT 0,
+  stat_sets         INT NOT NULL DEFAULT 0,
+  value_min         DOUBLE NULL,
+  value_max         DOUBLE NULL,
+  value_avg         DOUBLE NULL,
+  CONSTRAINT fk_file_summaries_file FOREIGN KEY (file_id) REFERENCES measurement_files(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "file_item_summaries",
+        """
+CREATE TABLE file_item_summaries (
+  file_id           BIGINT NOT NULL,
+  item_id           BIGINT NOT NULL,
+  raw_points        BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  measurable_points BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  value_min         DOUBLE NULL,
+  value_max         DOUBLE NULL,
+  value_avg         DOUBLE NULL,
+  value_stddev      DOUBLE NULL,
+  PRIMARY KEY (file_id, item_id),
+  CONSTRAINT fk_file_item_summaries_file FOREIGN KEY (file_id) REFERENCES measurement_files(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_file_item_summaries_item FOREIGN KEY (item_id) REFERENCES measurement_items(id)
+    ON DELETE RESTRICT ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+    (
+        "stat_trend_rollups",
+        """
+CREATE TABLE stat_trend_rollups (
+  granularity   VARCHAR(8) NOT NULL,
+  item_id       BIGINT NOT NULL,
+  value_type_id BIGINT NOT NULL,
+  node_id       BIGINT NOT NULL DEFAULT 0,
+  module_id     BIGINT NOT NULL DEFAULT 0,
+  bucket_start  DATETIME NOT NULL,
+  value_count   BIGINT NOT NULL DEFAULT 0,
+  value_sum     DOUBLE NOT NULL DEFAULT 0,
+  value_sumsq   DOUBLE NOT NULL DEFAULT 0,
+  value_min     DOUBLE NULL,
+  value_max     DOUBLE NULL,
+  PRIMARY KEY (granularity, item_id, value_type_id, node_id, module_id, bucket_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+""",
+    ),
+)
+
+
+def upgrade() -> None:
+    for _, ddl in _TABLES:
+        op.execute(ddl)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(_TABLES):
+        op.execute(f"DROP TABLE IF EXISTS {name}")
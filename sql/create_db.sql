@@ -15,9 +15,13 @@ USE measure_system;
 -- =========================================
 -- 1) 기존 테이블 삭제 (역순)
 -- =========================================
+DROP TABLE IF EXISTS stat_trend_rollups;
+DROP TABLE IF EXISTS file_item_summaries;
+DROP TABLE IF EXISTS file_summaries;
 DROP TABLE IF EXISTS file_class_counts;
 DROP TABLE IF EXISTS stat_measurement_values;
 DROP TABLE IF EXISTS stat_measurements;
+DROP TABLE IF EXISTS raw_measurement_blobs;
 DROP TABLE IF EXISTS raw_measurement_records;
 DROP TABLE IF EXISTS measurement_items;
 DROP TABLE IF EXISTS stat_value_types;
@@ -57,6 +61,7 @@ CREATE TABLE measurement_directories (
   id        BIGINT AUTO_INCREMENT PRIMARY KEY,
   parent_id BIGINT NULL,
   name      VARCHAR(255) NOT NULL,
+  path      TEXT NOT NULL,                -- 최상위부터 자신까지 "line_a/img/wafer" (생성 시 1회 기록)
 
   CONSTRAINT fk_directories_parent
     FOREIGN KEY (parent_id) REFERENCES measurement_directories(id)
@@ -65,6 +70,25 @@ CREATE TABLE measurement_directories (
   UNIQUE KEY uk_directories_parent_name (parent_id, name)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- 디렉터리 클로저 테이블: 모든 (조상, 자손) 쌍과 거리(depth, 자기 자신은 0)
+--   - 디렉터리 생성 시 애플리케이션이 함께 기록
+--   - 특정 디렉터리 하위 파일 조회 = ancestor_id 조건 + directory_id 조인 1회
+CREATE TABLE measurement_directory_closure (
+  ancestor_id   BIGINT NOT NULL,
+  descendant_id BIGINT NOT NULL,
+  depth         INT NOT NULL,
+
+  PRIMARY KEY (ancestor_id, descendant_id),
+  KEY idx_directory_closure_descendant (descendant_id, depth),
+
+  CONSTRAINT fk_closure_ancestor
+    FOREIGN KEY (ancestor_id) REFERENCES measurement_directories(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_closure_descendant
+    FOREIGN KEY (descendant_id) REFERENCES measurement_directories(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 -- =========================================
 -- 3) 측정 파일(인퍼런스 단위)
 -- =========================================
@@ -84,6 +108,7 @@ CREATE TABLE measurement_files (
   file_hash      CHAR(64) NULL,                        -- parent_dir_0(가장 가까움)/1/2 + file_name SHA-256
   processing_ms  INT NULL,
   status         ENUM('OK','FAIL') NOT NULL DEFAULT 'OK',
+  raw_storage    ENUM('rows','blob') NOT NULL DEFAULT 'rows',  -- raw 저장 방식 (행 / 아이템별 blob)
   created_at     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
 
   CONSTRAINT fk_files_node
@@ -99,7 +124,16 @@ CREATE TABLE measurement_files (
     FOREIGN KEY (directory_id) REFERENCES measurement_directories(id)
     ON DELETE SET NULL ON UPDATE CASCADE,
 
-  UNIQUE KEY uk_measurement_files_hash (file_hash)
+  UNIQUE KEY uk_measurement_files_hash (file_hash),
+  -- 목록 조회용: 필터 컬럼 + post_time (InnoDB 보조 인덱스에는 PK(id)가 붙으므로
+  -- (post_time, id) keyset 페이지가 인덱스만으로 결정됨)
+  KEY idx_files_post_time (post_time),
+  KEY idx_files_node_time (node_id, post_time),
+  KEY idx_files_module_time (module_id, post_time),
+  KEY idx_files_version_time (version_id, post_time),
+  KEY idx_files_directory_time (directory_id, post_time),
+  KEY idx_files_status_time (status, post_time),
+  KEY idx_files_date_module (post_date, module_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- =========================================
@@ -134,14 +168,26 @@ CREATE TABLE measurement_items (
   UNIQUE KEY uk_item_class_key (class_name, measure_item_key, metric_type_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- =========================================
+-- =========================================
+-- Raw/통계 테이블은 post_date 월 단위 RANGE 파티션
+--   - 파티션 테이블은 FK를 가질 수 없고 모든 UNIQUE 키에 파티션 컬럼이
+--     포함되어야 하므로, 부모 파일의 post_date를 비정규화해서 보관하고
+--     자식 행 삭제는 애플리케이션이 명시적으로 수행한다.
+--   - 보존 기간이 지난 파티션 DROP 및 미래 파티션 추가는
+--     app/core/retention.py (python -m app.core.retention) 가 담당한다.
+--   - 아래 p000000..p202612 목록은 초기 레이아웃일 뿐이다. 스키마 생성 직후
+--     python -m app.core.retention 을 한 번 실행하면 PARTITION_MONTHS_AHEAD
+--     개월 앞까지의 월 파티션이 pmax에서 분리된다.
 -- =========================================
 -- =========================================
 -- 3-C) Raw 측정 데이터 (파일 × 포지션 × 샘플)
 -- =========================================
 CREATE TABLE raw_measurement_records (
-  id             BIGINT AUTO_INCREMENT PRIMARY KEY,
+  id             BIGINT AUTO_INCREMENT,
   file_id        BIGINT NOT NULL,
   item_id        BIGINT NOT NULL,
+  post_date      DATE NOT NULL,                          -- measurement_files.post_date 복제 (파티션 키)
   measurable     TINYINT(1) NOT NULL DEFAULT 1,
   x_index        INT NOT NULL,
   y_index        INT NOT NULL,
@@ -151,35 +197,85 @@ CREATE TABLE raw_measurement_records (
   y_1            DOUBLE NOT NULL,
   value          DOUBLE NOT NULL,
 
-  CONSTRAINT fk_raw_file
+  PRIMARY KEY (id, post_date),
+  UNIQUE KEY uk_raw_file_item_xy (file_id, item_id, x_index, y_index, post_date),
+  KEY idx_raw_item (item_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+PARTITION BY RANGE COLUMNS(post_date) (
+  PARTITION p000000 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION pmax VALUES LESS THAN (MAXVALUE)
+);
+
+-- =========================================
+-- 3-C2) Raw 측정 데이터 blob (파일 × 아이템)
+--   - raw_storage='blob' 파일은 포인트를 행 대신 아이템별 압축 컬럼 blob으로 저장
+--   - payload: measurable/x_index/y_index/x_0/y_0/x_1/y_1/value 리틀엔디언
+--     컬럼을 바이트 셔플 후 codec(zlib|zstd)으로 압축 (app/core/raw_blobs.py)
+--   - point_count/measurable_count/value_min/value_max 로 디코딩 없이 필터링
+-- =========================================
+CREATE TABLE raw_measurement_blobs (
+  file_id          BIGINT NOT NULL,
+  item_id          BIGINT NOT NULL,
+  codec            VARCHAR(8) NOT NULL,
+  point_count      INT NOT NULL,
+  measurable_count INT NOT NULL,
+  value_min        DOUBLE NOT NULL,
+  value_max        DOUBLE NOT NULL,
+  checksum         VARCHAR(64) NOT NULL,                 -- 비압축 payload sha256 (diff 비교용)
+  payload          LONGBLOB NOT NULL,
+
+  PRIMARY KEY (file_id, item_id),
+
+  CONSTRAINT fk_raw_blob_file
     FOREIGN KEY (file_id) REFERENCES measurement_files(id)
     ON DELETE CASCADE ON UPDATE CASCADE,
 
-  CONSTRAINT fk_raw_item
+  CONSTRAINT fk_raw_blob_item
     FOREIGN KEY (item_id) REFERENCES measurement_items(id)
-    ON DELETE RESTRICT ON UPDATE CASCADE,
-
-  UNIQUE KEY uk_raw_file_item_xy (file_id, item_id, x_index, y_index)
+    ON DELETE RESTRICT ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- =========================================
 -- 3-D) 통계 측정 헤더 (파일 × 포지션)
 -- =========================================
 CREATE TABLE stat_measurements (
-  id             BIGINT AUTO_INCREMENT PRIMARY KEY,
+  id             BIGINT AUTO_INCREMENT,
   file_id        BIGINT NOT NULL,
   item_id        BIGINT NOT NULL,
-
-  CONSTRAINT fk_stat_file
-    FOREIGN KEY (file_id) REFERENCES measurement_files(id)
-    ON DELETE CASCADE ON UPDATE CASCADE,
-
-  CONSTRAINT fk_stat_item
-    FOREIGN KEY (item_id) REFERENCES measurement_items(id)
-    ON DELETE RESTRICT ON UPDATE CASCADE,
-
-  UNIQUE KEY uk_stat_file_item (file_id, item_id)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+  post_date      DATE NOT NULL,                          -- 파티션 키
+
+  PRIMARY KEY (id, post_date),
+  UNIQUE KEY uk_stat_file_item (file_id, item_id, post_date),
+  KEY idx_stat_item (item_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+PARTITION BY RANGE COLUMNS(post_date) (
+  PARTITION p000000 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION pmax VALUES LESS THAN (MAXVALUE)
+);
 
 -- =========================================
 -- =========================================
@@ -200,18 +296,28 @@ CREATE TABLE stat_value_types (
 CREATE TABLE stat_measurement_values (
   stat_measurement_id BIGINT NOT NULL,
   value_type_id       BIGINT NOT NULL,
+  post_date           DATE NOT NULL,                     -- 파티션 키
   value               DOUBLE NOT NULL,
 
-  CONSTRAINT fk_stat_values_header
-    FOREIGN KEY (stat_measurement_id) REFERENCES stat_measurements(id)
-    ON DELETE CASCADE ON UPDATE CASCADE,
-
-  CONSTRAINT fk_stat_values_type
-    FOREIGN KEY (value_type_id) REFERENCES stat_value_types(id)
-    ON DELETE RESTRICT ON UPDATE CASCADE,
-
-  PRIMARY KEY (stat_measurement_id, value_type_id)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+  PRIMARY KEY (stat_measurement_id, value_type_id, post_date),
+  KEY idx_stat_values_type (value_type_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+PARTITION BY RANGE COLUMNS(post_date) (
+  PARTITION p000000 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION pmax VALUES LESS THAN (MAXVALUE)
+);
 
 -- =========================================
 -- 4) Object Detection 클래스 마스터
@@ -241,5 +347,63 @@ CREATE TABLE file_class_counts (
     ON DELETE RESTRICT ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- =========================================
+-- 6) 파일 요약 (인제스트 트랜잭션에서 함께 기록)
+--   - 대시보드가 raw_measurement_records 를 GROUP BY 하지 않도록
+--     파일/항목 단위 집계를 미리 저장
+-- =========================================
+CREATE TABLE file_summaries (
+  file_id           BIGINT NOT NULL PRIMARY KEY,
+  raw_points        BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  measurable_points BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  item_count        INT NOT NULL DEFAULT 0,
+  stat_sets         INT NOT NULL DEFAULT 0,
+  value_min         DOUBLE NULL,                       -- measurable 포인트 기준
+  value_max         DOUBLE NULL,
+  value_avg         DOUBLE NULL,
+
+  CONSTRAINT fk_file_summaries_file FOREIGN KEY (file_id) REFERENCES measurement_files(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE file_item_summaries (
+  file_id           BIGINT NOT NULL,
+  item_id           BIGINT NOT NULL,
+  raw_points        BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  measurable_points BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  value_min         DOUBLE NULL,
+  value_max         DOUBLE NULL,
+  value_avg         DOUBLE NULL,
+  value_stddev      DOUBLE NULL,                       -- 모표준편차
+
+  PRIMARY KEY (file_id, item_id),
+
+  CONSTRAINT fk_file_item_summaries_file FOREIGN KEY (file_id) REFERENCES measurement_files(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_file_item_summaries_item FOREIGN KEY (item_id) REFERENCES measurement_items(id)
+    ON DELETE RESTRICT ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- =========================================
+-- 7) 통계 값 트렌드 롤업 (시간/일 버킷)
+--   - 인제스트 시 count/sum/sumsq/min/max 누적, 재인제스트 시 이전 기여분 차감
+--   - node_id/module_id 미지정 파일은 0 으로 저장 (PK 유지 목적, FK 없음)
+-- =========================================
+CREATE TABLE stat_trend_rollups (
+  granularity   VARCHAR(8) NOT NULL,                   -- 'hour' | 'day'
+  item_id       BIGINT NOT NULL,
+  value_type_id BIGINT NOT NULL,
+  node_id       BIGINT NOT NULL DEFAULT 0,
+  module_id     BIGINT NOT NULL DEFAULT 0,
+  bucket_start  DATETIME NOT NULL,
+  value_count   BIGINT NOT NULL DEFAULT 0,
+  value_sum     DOUBLE NOT NULL DEFAULT 0,
+  value_sumsq   DOUBLE NOT NULL DEFAULT 0,
+  value_min     DOUBLE NULL,
+  value_max     DOUBLE NULL,
+
+  PRIMARY KEY (granularity, item_id, value_type_id, node_id, module_id, bucket_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 -- 필요 시
 -- SET FOREIGN_KEY_CHECKS = 1;
@@ -0,0 +1,13 @@
+-- measurement_directory_closure 도입 이전 DB용 1회 생성
+-- (sql/create_db.sql의 CREATE TABLE measurement_directory_closure 먼저 실행,
+--  이후에는 디렉터리 생성 시 애플리케이션이 기록)
+INSERT INTO measurement_directory_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE closure AS (
+    SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth
+    FROM measurement_directories
+    UNION ALL
+    SELECT closure.ancestor_id, child.id, closure.depth + 1
+    FROM closure
+    JOIN measurement_directories child ON child.parent_id = closure.descendant_id
+)
+SELECT ancestor_id, descendant_id, depth FROM closure;
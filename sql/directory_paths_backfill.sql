@@ -0,0 +1,20 @@
+-- measurement_directories.path 도입 이전 DB용 1회 마이그레이션
+-- (이후에는 디렉터리 생성 시 애플리케이션이 기록)
+ALTER TABLE measurement_directories ADD COLUMN path TEXT NULL AFTER name;
+
+UPDATE measurement_directories d
+JOIN (
+    WITH RECURSIVE tree AS (
+        SELECT id, CAST(name AS CHAR(4096)) AS path
+        FROM measurement_directories
+        WHERE parent_id IS NULL
+        UNION ALL
+        SELECT child.id, CONCAT(tree.path, '/', child.name)
+        FROM measurement_directories child
+        JOIN tree ON child.parent_id = tree.id
+    )
+    SELECT id, path FROM tree
+) resolved ON resolved.id = d.id
+SET d.path = resolved.path;
+
+ALTER TABLE measurement_directories MODIFY COLUMN path TEXT NOT NULL;
@@ -1,30 +1,19 @@
-WITH RECURSIVE directory_path AS (
-    SELECT
-        d.id,
-        d.parent_id,
-        d.name,
-        CAST(d.name AS CHAR(1024)) AS full_path
-    FROM measurement_directories d
-    WHERE d.parent_id IS NULL
-    UNION ALL
-    SELECT
-        child.id,
-        child.parent_id,
-        child.name,
-        CONCAT(directory_path.full_path, '/', child.name) AS full_path
-    FROM measurement_directories child
-    JOIN directory_path ON directory_path.id = child.parent_id
-)
+-- 특정 디렉터리(예: line_a/img) 하위의 모든 파일
+-- measurement_directory_closure 조인 1회로 하위 트리 전체를 찾으므로 재귀 CTE가 필요 없음
 SELECT
     mf.id AS file_id,
     mf.file_name,
-    directory_path.full_path AS directory_path,
+    d.path AS directory_path,
+    c.depth AS depth_below_root,
     mn.name AS node,
     mm.name AS module,
     mv.name AS version
-FROM measurement_files mf
-LEFT JOIN directory_path ON directory_path.id = mf.directory_id
+FROM measurement_directories root
+JOIN measurement_directory_closure c ON c.ancestor_id = root.id
+JOIN measurement_files mf           ON mf.directory_id = c.descendant_id
+JOIN measurement_directories d      ON d.id = mf.directory_id
 LEFT JOIN measurement_nodes   mn ON mn.id = mf.node_id
 LEFT JOIN measurement_modules mm ON mm.id = mf.module_id
 LEFT JOIN measurement_versions mv ON mv.id = mf.version_id
-ORDER BY directory_path.full_path, mf.file_name;
+WHERE root.path = 'line_a/img'
+ORDER BY d.path, mf.file_name;
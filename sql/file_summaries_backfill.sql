@@ -0,0 +1,38 @@
+-- file_summaries 도입 이전에 적재된 파일의 요약을 1회 생성
+-- (이후에는 인제스트 트랜잭션에서 자동 갱신)
+INSERT INTO file_item_summaries (
+    file_id, item_id, raw_points, measurable_points,
+    value_min, value_max, value_avg, value_stddev
+)
+SELECT
+    rmr.file_id,
+    rmr.item_id,
+    COUNT(*),
+    SUM(rmr.measurable),
+    MIN(CASE WHEN rmr.measurable THEN rmr.value END),
+    MAX(CASE WHEN rmr.measurable THEN rmr.value END),
+    AVG(CASE WHEN rmr.measurable THEN rmr.value END),
+    STDDEV_POP(CASE WHEN rmr.measurable THEN rmr.value END)
+FROM raw_measurement_records rmr
+LEFT JOIN file_summaries fs ON fs.file_id = rmr.file_id
+WHERE fs.file_id IS NULL
+GROUP BY rmr.file_id, rmr.item_id;
+
+INSERT INTO file_summaries (
+    file_id, raw_points, measurable_points, item_count, stat_sets,
+    value_min, value_max, value_avg
+)
+SELECT
+    mf.id,
+    COALESCE(SUM(fis.raw_points), 0),
+    COALESCE(SUM(fis.measurable_points), 0),
+    COUNT(fis.item_id),
+    (SELECT COUNT(*) FROM stat_measurements sm WHERE sm.file_id = mf.id),
+    MIN(fis.value_min),
+    MAX(fis.value_max),
+    SUM(fis.value_avg * fis.measurable_points) / NULLIF(SUM(fis.measurable_points), 0)
+FROM measurement_files mf
+LEFT JOIN file_item_summaries fis ON fis.file_id = mf.id
+LEFT JOIN file_summaries fs ON fs.file_id = mf.id
+WHERE fs.file_id IS NULL
+GROUP BY mf.id;
@@ -15,7 +15,7 @@ SELECT
     rmr.y_1,
     rmr.value
 FROM raw_measurement_records rmr
-JOIN measurement_files mf      ON mf.id = rmr.file_id
+JOIN measurement_files mf      ON mf.id = rmr.file_id AND mf.post_date = rmr.post_date
 JOIN measurement_items mi      ON mi.id = rmr.item_id
 JOIN measurement_metric_types mmt ON mmt.id = mi.metric_type_id
 ORDER BY mf.id, mi.id, rmr.y_index, rmr.x_index;
@@ -11,6 +11,6 @@ FROM stat_measurements sm
 JOIN measurement_files mf      ON mf.id = sm.file_id
 JOIN measurement_items mi      ON mi.id = sm.item_id
 JOIN measurement_metric_types mmt ON mmt.id = mi.metric_type_id
-JOIN stat_measurement_values smv ON smv.stat_measurement_id = sm.id
+JOIN stat_measurement_values smv ON smv.stat_measurement_id = sm.id AND smv.post_date = sm.post_date
 JOIN stat_value_types svt    ON svt.id = smv.value_type_id
 ORDER BY mf.id, mi.id, svt.name;
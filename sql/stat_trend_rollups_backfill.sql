@@ -0,0 +1,49 @@
+-- stat_trend_rollups 도입 이전에 적재된 파일의 기여분을 롤업에 1회 반영
+-- (이후에는 인제스트 트랜잭션에서 자동 갱신)
+--   - 기존 파일을 재인제스트하면 이전 기여분을 차감하므로, 롤업에 없는 파일이
+--     남아 있으면 버킷 값이 어긋난다. 도입 전부터 데이터가 있던 DB는 반드시 실행
+--   - 더하지 않고 stat 값이 남아 있는 날짜의 버킷을 원본에서 다시 집계하므로
+--     여러 번 실행해도 안전하다. retention으로 stat 파티션이 DROP된 과거 버킷은 유지
+--   - 실행 중 들어온 인제스트의 기여분은 유실될 수 있으므로 인제스트를 멈추고 실행
+SET @rollup_since = (SELECT MIN(post_date) FROM stat_measurements);
+
+DELETE FROM stat_trend_rollups
+WHERE bucket_start >= @rollup_since;
+
+INSERT INTO stat_trend_rollups (
+    granularity, item_id, value_type_id, node_id, module_id, bucket_start,
+    value_count, value_sum, value_sumsq, value_min, value_max
+)
+SELECT
+    v.granularity,
+    v.item_id,
+    v.value_type_id,
+    v.node_id,
+    v.module_id,
+    v.bucket_start,
+    COUNT(*),
+    SUM(v.value),
+    SUM(v.value * v.value),
+    MIN(v.value),
+    MAX(v.value)
+FROM (
+    SELECT
+        b.granularity,
+        sm.item_id,
+        smv.value_type_id,
+        COALESCE(mf.node_id, 0) AS node_id,
+        COALESCE(mf.module_id, 0) AS module_id,
+        CASE b.granularity
+            WHEN 'hour' THEN CAST(DATE_FORMAT(mf.post_time, '%Y-%m-%d %H:00:00') AS DATETIME)
+            ELSE CAST(DATE(mf.post_time) AS DATETIME)
+        END AS bucket_start,
+        smv.value
+    FROM stat_measurement_values smv
+    JOIN stat_measurements sm
+      ON sm.id = smv.stat_measurement_id
+     AND sm.post_date = smv.post_date
+    JOIN measurement_files mf ON mf.id = sm.file_id
+    CROSS JOIN (SELECT 'hour' AS granularity UNION ALL SELECT 'day') b
+    WHERE sm.post_date >= @rollup_since
+) v
+GROUP BY v.granularity, v.item_id, v.value_type_id, v.node_id, v.module_id, v.bucket_start;
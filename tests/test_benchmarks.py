@@ -0,0 +1,30 @@
+"""Unit tests for the benchmark payload generator and baseline comparison."""
+
+from app.schemas import MeasurementPipelineCreate
+from benchmarks.ingest import compare_results
+from benchmarks.payloads import PayloadSpec, generate_payloads
+
+
+def test_generated_payloads_are_valid_and_deterministic() -> None:
+    spec = PayloadSpec(points=103, items=4, stat_value_types=3, classes=2, duplicate_ratio=0.5, seed=7)
+    first = list(generate_payloads(spec, 20, "t"))
+    assert first == list(generate_payloads(spec, 20, "t"))
+
+    payload = MeasurementPipelineCreate.model_validate(first[0])
+    assert len(payload.raw_measurements) == 103
+    assert len(payload.stat_measurements) == 4
+    assert all(len(entry.values) == 3 for entry in payload.stat_measurements)
+    sites = {(raw.item.class_name, raw.x_index, raw.y_index) for raw in payload.raw_measurements}
+    assert len(sites) == 103
+
+    names = [entry["file"]["file_name"] for entry in first]
+    assert 0 < len(names) - len(set(names)) < 20
+
+
+def test_compare_results_flags_only_regressions_past_threshold() -> None:
+    baseline = {"scenarios": {"s": {"p95_ms": 100.0, "rows_per_sec": 1000.0, "peak_rss_mb": 50.0}}}
+    current = {"scenarios": {"s": {"p95_ms": 109.0, "rows_per_sec": 850.0, "peak_rss_mb": 40.0}}}
+    regressions = compare_results(current, baseline, 0.10)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("s.rows_per_sec")
+    assert compare_results({"scenarios": {"new": {"p95_ms": 1.0}}}, baseline, 0.10) == []
@@ -0,0 +1,51 @@
+"""Re-ingest of an unchanged file in ``?mode=diff`` against the SQLite stand-in."""
+
+import asyncio
+import copy
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core import dimension_cache, get_session
+from app.main import app
+from app.models import Base
+from benchmarks.payloads import PayloadSpec, generate_payloads
+from benchmarks.sqlite_standin import create_standin_engine
+
+
+def test_identical_reingest_in_diff_mode_changes_nothing(tmp_path) -> None:
+    spec = PayloadSpec(points=40, items=3, stat_value_types=2, classes=2, duplicate_ratio=0.0, seed=3)
+    (payload,) = generate_payloads(spec, 1, "diff")
+    edited = copy.deepcopy(payload)
+    edited["stat_measurements"][0]["values"][0]["value"] += 1.0
+
+    async def scenario() -> list[dict]:
+        db_engine = create_standin_engine(f"sqlite+aiosqlite:///{tmp_path / 'diff.db'}")
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(db_engine, expire_on_commit=False)
+
+        async def override_session():
+            async with session_maker() as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_session
+        dimension_cache.invalidate()
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                results = []
+                for body in (payload, payload, edited):
+                    response = await client.post("/measurement-results/", params={"mode": "diff"}, json=body)
+                    assert response.status_code == 201, response.text
+                    results.append(response.json())
+                return results
+        finally:
+            app.dependency_overrides.clear()
+            dimension_cache.invalidate()
+            await db_engine.dispose()
+
+    first, second, third = asyncio.run(scenario())
+    rows = first["raw_records"] + first["stat_measurements"] * (1 + spec.stat_value_types) + len(payload["class_counts"])
+    assert second["changes"] == {"unchanged": rows, "updated": 0, "inserted": 0, "deleted": 0}
+    # The edited value's header is no longer unchanged either.
+    assert third["changes"] == {"unchanged": rows - 2, "updated": 1, "inserted": 0, "deleted": 0}
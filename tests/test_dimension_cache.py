@@ -0,0 +1,30 @@
+"""Unit tests for the shared dimension cache."""
+
+from app.core.cache import DimensionCache
+
+
+def test_lru_eviction_and_counters() -> None:
+    cache = DimensionCache(max_size=2)
+    cache.put("nodes", "A", 1)
+    cache.put("nodes", "B", 2)
+    assert cache.get("nodes", "A") == 1
+    cache.put("nodes", "C", 3)
+
+    assert cache.get("nodes", "B") is None
+    assert cache.get("nodes", "A") == 1
+    assert cache.stats()["namespaces"]["nodes"] == {"hits": 2, "misses": 1}
+
+
+def test_scope_publishes_created_ids_only_after_commit() -> None:
+    cache = DimensionCache(max_size=10)
+    scope = cache.scope()
+    scope.put("classes", "P1", 7, created=True)
+    assert scope.get("classes", "P1") == 7
+    assert cache.get("classes", "P1") is None
+
+    scope.discard()
+    assert cache.get("classes", "P1") is None
+
+    scope.put("classes", "P1", 7, created=True)
+    scope.publish()
+    assert cache.get("classes", "P1") == 7
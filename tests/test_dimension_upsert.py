@@ -0,0 +1,128 @@
+"""Tests for batch dimension resolution under concurrent ingests."""
+
+import asyncio
+import sqlite3
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.routers import measurement_results
+from app.core.cache import DimensionCache
+from app.models import Base, MeasurementDirectory, MeasurementDirectoryClosure, MeasurementNode
+from benchmarks.sqlite_standin import MYSQL_COLLATION, _compare_unicode_ci, create_standin_engine
+
+
+def test_resolves_a_key_committed_after_the_snapshot(tmp_path, monkeypatch) -> None:
+    select_ids = measurement_results._select_dimension_ids
+    reads: list[bool] = []
+
+    async def scenario() -> None:
+        db_engine = create_standin_engine(f"sqlite+aiosqlite:///{tmp_path / 'dims.db'}")
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async def snapshot_select(session, table, key_columns, keys, locking=False):
+            reads.append(locking)
+            if locking:
+                return await select_ids(session, table, key_columns, keys, locking=True)
+            # Another worker commits the node after this transaction's
+            # snapshot, so a plain read still reports it missing.
+            async with db_engine.begin() as other:
+                await other.execute(MeasurementNode.__table__.insert().values(name="NODE-a"))
+            return {}
+
+        monkeypatch.setattr(measurement_results, "_select_dimension_ids", snapshot_select)
+        try:
+            async with AsyncSession(db_engine) as session:
+                resolved = await measurement_results._resolve_dimension_ids(
+                    session, MeasurementNode, ("name",), ["NODE-a"], DimensionCache(max_size=10).scope()
+                )
+                await session.commit()
+            async with AsyncSession(db_engine) as session:
+                rows = (await session.execute(select(MeasurementNode.id, MeasurementNode.name))).all()
+        finally:
+            await db_engine.dispose()
+
+        assert reads == [False, True]
+        assert rows == [(resolved["NODE-a"], "NODE-a")]
+
+    asyncio.run(scenario())
+
+
+def test_resolves_keys_equal_only_under_the_column_collation(tmp_path) -> None:
+    async def scenario() -> None:
+        db_engine = create_standin_engine(f"sqlite+aiosqlite:///{tmp_path / 'dims.db'}")
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(MeasurementNode.__table__.insert(), [{"name": "cafe"}, {"name": "abc"}])
+        try:
+            async with AsyncSession(db_engine) as session:
+                resolved = await measurement_results._resolve_dimension_ids(
+                    session, MeasurementNode, ("name",), ["café", "abc ", "CAFE"], DimensionCache(max_size=10).scope()
+                )
+                await session.commit()
+            async with AsyncSession(db_engine) as session:
+                rows = dict((await session.execute(select(MeasurementNode.name, MeasurementNode.id))).tuples().all())
+        finally:
+            await db_engine.dispose()
+
+        assert resolved == {"café": rows["cafe"], "abc ": rows["abc"], "CAFE": rows["cafe"]}
+        assert len(rows) == 2
+
+    asyncio.run(scenario())
+
+
+def test_reuses_a_directory_committed_after_the_lookup(tmp_path) -> None:
+    db_path = tmp_path / "dirs.db"
+
+    async def scenario() -> None:
+        db_engine = create_standin_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(db_engine) as session:
+            root_id = await measurement_results._get_or_create_directory_path(
+                session, ["line_a"], DimensionCache(max_size=10).scope()
+            )
+            await session.commit()
+
+        competitor: list[int] = []
+
+        def commit_competitor(conn, cursor, statement, parameters, context, executemany) -> None:
+            # Another ingest commits line_a/img right after this one found it
+            # missing, so the insert below collides on uk_directories_parent_name.
+            if competitor or "FROM measurement_directories" not in statement or "img" not in parameters:
+                return
+            with sqlite3.connect(db_path) as other:
+                other.create_collation(MYSQL_COLLATION, _compare_unicode_ci)
+                directory_id = other.execute(
+                    "INSERT INTO measurement_directories (parent_id, name, path) VALUES (?, 'img', 'line_a/img')",
+                    (root_id,),
+                ).lastrowid
+                other.executemany(
+                    "INSERT INTO measurement_directory_closure (ancestor_id, descendant_id, depth) VALUES (?, ?, ?)",
+                    [(root_id, directory_id, 1), (directory_id, directory_id, 0)],
+                )
+            competitor.append(directory_id)
+
+        event.listen(db_engine.sync_engine, "after_cursor_execute", commit_competitor)
+        try:
+            async with AsyncSession(db_engine) as session:
+                resolved = await measurement_results._get_or_create_directory_path(
+                    session, ["img", "line_a"], DimensionCache(max_size=10).scope()
+                )
+                await session.commit()
+            async with AsyncSession(db_engine) as session:
+                directories = (await session.execute(select(func.count()).select_from(MeasurementDirectory))).scalar()
+                closure_rows = (
+                    await session.execute(
+                        select(func.count()).where(MeasurementDirectoryClosure.descendant_id == resolved)
+                    )
+                ).scalar()
+        finally:
+            await db_engine.dispose()
+
+        assert resolved == competitor[0]
+        assert directories == 2
+        assert closure_rows == 2
+
+    asyncio.run(scenario())
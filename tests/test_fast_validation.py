@@ -0,0 +1,77 @@
+"""Tests for the opt-in fast ``MeasurementPipelineCreate`` validator."""
+
+import copy
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import MeasurementPipelineCreate
+from app.schemas.fast import RawPoint, validate_pipeline_fast
+
+_ITEM = {"class_name": "P1", "measure_item_key": "CD_TOP", "metric_type": {"name": "CD", "unit": "nm"}}
+
+
+def _payload() -> dict:
+    return {
+        "file": {
+            "post_time": "2026-01-05T08:00:00",
+            "file_path": "/data/line_a/img/lot_1/wafer.csv",
+            "parent_dir_0": "lot_1",
+            "parent_dir_1": "img",
+            "file_name": "wafer.csv",
+        },
+        "raw_measurements": [
+            {"item": copy.deepcopy(_ITEM), "x_index": i, "y_index": 0, "x_0": 1, "y_0": 2.5, "x_1": 3, "y_1": 4, "value": i / 2}
+            for i in range(4)
+        ],
+        "stat_measurements": [{"item": copy.deepcopy(_ITEM), "values": [{"value_type_name": "AVG", "value": 1.0}]}],
+        "class_counts": {"P1": 4},
+    }
+
+
+def _point_fields(point) -> tuple:
+    return (point.item, point.measurable, point.x_index, point.y_index, point.x_0, point.y_0, point.x_1, point.y_1, point.value)
+
+
+def test_fast_points_match_model_and_share_item_links() -> None:
+    data = _payload()
+    data["raw_measurements"][3]["x_index"] = "3"  # needs lax coercion, handled by pydantic
+    expected = MeasurementPipelineCreate.model_validate(copy.deepcopy(data))
+    payload = validate_pipeline_fast(data)
+
+    assert [_point_fields(p) for p in payload.raw_measurements] == [_point_fields(p) for p in expected.raw_measurements]
+    assert all(type(p.x_0) is float for p in payload.raw_measurements)
+    assert isinstance(payload.raw_measurements[0], RawPoint)
+    assert payload.raw_measurements[0].item is payload.raw_measurements[1].item
+    assert payload.file == expected.file
+    assert payload.stat_measurements == expected.stat_measurements
+
+
+def test_fast_errors_keep_model_locations() -> None:
+    data = _payload()
+    data["file"]["post_time"] = "not a time"
+    data["raw_measurements"][1]["x_index"] = 1.5
+    data["raw_measurements"][2]["value"] = "abc"
+    del data["raw_measurements"][3]["item"]["metric_type"]["name"]
+
+    with pytest.raises(ValidationError) as expected:
+        MeasurementPipelineCreate.model_validate(copy.deepcopy(data))
+    with pytest.raises(ValidationError) as fast:
+        validate_pipeline_fast(data)
+
+    def summary(exc):
+        return [(err["type"], err["loc"]) for err in exc.value.errors(include_url=False)]
+
+    assert summary(fast) == summary(expected)
+    assert ("int_from_float", ("raw_measurements", 1, "x_index")) in summary(fast)
+
+
+def test_fast_path_hands_out_of_range_ints_to_the_model() -> None:
+    data = _payload()
+    data["raw_measurements"][0]["y_1"] = 10**400
+
+    with pytest.raises(ValidationError) as expected:
+        MeasurementPipelineCreate.model_validate(copy.deepcopy(data))
+    with pytest.raises(ValidationError) as fast:
+        validate_pipeline_fast(data)
+    assert fast.value.errors(include_url=False) == expected.value.errors(include_url=False)
@@ -0,0 +1,25 @@
+"""Unit tests for the in-process file lock manager."""
+
+import asyncio
+
+import pytest
+
+from app.core.locks import LocalFileLockManager, LockTimeoutError
+
+
+def test_local_locks_serialise_same_key_and_time_out() -> None:
+    async def scenario() -> None:
+        locks = LocalFileLockManager(stripes=8, timeout=0.05)
+        async with locks.hold("file:a", "file:b"):
+            with pytest.raises(LockTimeoutError):
+                async with locks.hold("file:b"):
+                    pass
+        async with locks.hold("file:b"):
+            pass
+
+        stats = locks.stats()
+        assert stats["backend"] == "local"
+        assert stats["acquired"] == 2
+        assert stats["timeouts"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,28 @@
+"""Unit tests for the ingest-time file summary builder."""
+
+import math
+import statistics
+
+from app.api.routers.measurement_results import _FileSummaryBuilder
+
+
+def test_summary_matches_direct_statistics() -> None:
+    rows = [
+        {"item_id": 1, "value": 1.0, "measurable": True},
+        {"item_id": 1, "value": 4.0, "measurable": True},
+        {"item_id": 1, "value": 999.0, "measurable": False},
+        {"item_id": 2, "value": -2.0, "measurable": False},
+    ]
+    summary = _FileSummaryBuilder()
+    assert list(summary.observe(rows)) == rows
+
+    item_row = summary.items[1].as_row(file_id=7, item_id=1)
+    assert (item_row["raw_points"], item_row["measurable_points"]) == (3, 2)
+    assert item_row["value_avg"] == 2.5
+    assert math.isclose(item_row["value_stddev"], statistics.pstdev([1.0, 4.0]))
+    assert summary.items[2].as_row(file_id=7, item_id=2)["value_min"] is None
+
+    file_row = summary.file_row(file_id=7, stat_sets=3)
+    assert file_row["raw_points"] == 4
+    assert file_row["item_count"] == 2
+    assert (file_row["value_min"], file_row["value_max"]) == (1.0, 4.0)
@@ -0,0 +1,61 @@
+"""Tests for the durable asynchronous ingest spool."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.spool import IngestSpool, SpoolFullError
+
+
+def test_spool_lifecycle_and_backpressure(tmp_path) -> None:
+    spool = IngestSpool(tmp_path / "jobs.sqlite3", max_depth=1)
+
+    async def scenario() -> None:
+        job_id = await spool.enqueue('{"file": {}}', "replace")
+        with pytest.raises(SpoolFullError):
+            await spool.enqueue("{}", "replace")
+
+        job = await spool.claim()
+        assert job is not None and job.id == job_id and job.status == "running"
+        assert await spool.claim() is None
+        assert await spool.requeue_running() == 1
+
+        job = await spool.claim()
+        await spool.complete(job.id, '{"ok": true}')
+        stored = await spool.get(job_id)
+        assert stored.status == "done"
+        assert stored.result == '{"ok": true}'
+        assert stored.payload is None
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        spool.close()
+
+
+def test_settled_jobs_are_purged_after_the_retention(tmp_path) -> None:
+    spool = IngestSpool(tmp_path / "jobs.sqlite3", max_depth=10, retention=60.0)
+
+    async def scenario() -> None:
+        done_id = await spool.enqueue("{}", "replace")
+        failed_id = await spool.enqueue("{}", "replace")
+        queued_id = await spool.enqueue("{}", "replace")
+        await spool.complete((await spool.claim()).id, "{}")
+        await spool.fail((await spool.claim()).id, "boom")
+        assert await spool.purge_settled() == 0
+
+        # Age only the done job past the retention.
+        stale = (datetime.now(timezone.utc) - timedelta(seconds=120)).isoformat()
+        await spool._run(
+            lambda conn: conn.execute("UPDATE ingest_jobs SET updated_at = ? WHERE id = ?", (stale, done_id))
+        )
+        assert await spool.purge_settled() == 1
+        assert await spool.get(done_id) is None
+        assert (await spool.get(failed_id)).status == "failed"
+        assert (await spool.get(queued_id)).status == "queued"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        spool.close()
@@ -0,0 +1,37 @@
+"""Tests for orjson decoding and the bounded 422 log extraction."""
+
+import json
+import math
+
+import orjson
+import pytest
+
+from app.core import json_loads
+from app.main import _body_preview, _extract_file_path_from_body
+
+
+def test_json_loads_falls_back_for_stdlib_only_input() -> None:
+    assert json_loads(b'{"a": [1, 2.5]}') == {"a": [1, 2.5]}
+    assert math.isnan(json_loads(b"[NaN]")[0])
+    assert json_loads(memoryview(b"[-Infinity]")) == [-math.inf]
+
+
+def test_json_loads_reports_orjson_errors_for_malformed_input() -> None:
+    with pytest.raises(orjson.JSONDecodeError) as excinfo:
+        json_loads(b'{"a": 1,}')
+    assert isinstance(excinfo.value, json.JSONDecodeError)
+    assert (excinfo.value.msg, excinfo.value.pos) == ("unexpected end of data", 9)
+
+
+def test_file_path_and_preview_come_from_a_bounded_prefix() -> None:
+    head = b'{"file": {"file_path": "/data/\\u00fcml\\"x.csv"}, "raw_measurements": ['
+    body = head + b"0," * 1_000_000
+    assert _extract_file_path_from_body(body) == '/data/üml"x.csv'
+
+    preview = _body_preview(body)
+    assert preview.startswith('{"file": ')
+    assert preview.endswith("...(truncated)")
+    assert len(preview) == 512 + len("...(truncated)")
+
+    late = b'{"raw_measurements": [' + b"0," * 100_000 + b'0], "file": {"file_path": "/late.csv"}}'
+    assert _extract_file_path_from_body(late) is None
@@ -0,0 +1,55 @@
+"""Tests for NDJSON stream splitting and the streaming ingest endpoint."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routers.measurement_results import _iter_ndjson_lines
+from app.core.config import settings
+from app.main import app
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _collect(*parts: bytes, max_line_bytes: int | None = None) -> list[tuple[int, bytes]]:
+    return [line async for line in _iter_ndjson_lines(_chunks(*parts), max_line_bytes)]
+
+
+def test_lines_split_across_chunks_keep_numbering() -> None:
+    lines = asyncio.run(_collect(b'{"a": 1}\n{"b"', b': 2}\n\n{"c": 3}'))
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+def test_overlong_line_is_rejected_before_its_newline() -> None:
+    assert asyncio.run(_collect(b'{"a": 1}\n{"b": 2}', max_line_bytes=8)) == [(1, b'{"a": 1}'), (2, b'{"b": 2}')]
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(_collect(b'{"a": 1}\n{"b": ', b'"0123456789"', max_line_bytes=8))
+    assert excinfo.value.status_code == 413
+    assert excinfo.value.detail == "NDJSON line 2 exceeds 8 bytes"
+
+
+def test_stream_rejects_an_overlong_line(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "stream_max_line_bytes", 16)
+
+    async def post() -> int:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/measurement-results/stream", content=b'{"file": {"file_path": "/x"}}')
+        return response.status_code
+
+    assert asyncio.run(post()) == 413
+
+
+def test_stream_rejects_blob_storage(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "raw_storage", "blob")
+
+    async def post() -> int:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/measurement-results/stream", content=b'{"file": {}}\n')
+        return response.status_code
+
+    assert asyncio.run(post()) == 503
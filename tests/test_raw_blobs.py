@@ -0,0 +1,43 @@
+"""Unit tests for the compressed raw point blob encoding."""
+
+import pytest
+
+from app.core.raw_blobs import DuplicateRawPointError, RawBlobBuilder, decode_raw_blob
+
+
+def _row(x_index: int, y_index: int, value: float, measurable: bool = True) -> dict:
+    return {
+        "item_id": 7,
+        "measurable": measurable,
+        "x_index": x_index,
+        "y_index": y_index,
+        "x_0": x_index * 0.5,
+        "y_0": y_index * 0.5,
+        "x_1": x_index * 0.5 + 0.5,
+        "y_1": y_index * 0.5 + 0.5,
+        "value": value,
+    }
+
+
+def test_blob_round_trip_sorts_points_and_keeps_metadata() -> None:
+    builder = RawBlobBuilder()
+    assert builder.extend([_row(1, 0, 3.5), _row(0, 1, -2.0, measurable=False), _row(0, 0, 1.25)]) == 3
+
+    [(item_id, blob)] = list(builder.encode("zlib", 6))
+    assert item_id == 7
+    assert (blob.point_count, blob.measurable_count) == (3, 2)
+    assert (blob.value_min, blob.value_max) == (-2.0, 3.5)
+
+    columns = decode_raw_blob(blob.payload, blob.codec, blob.point_count)
+    assert list(columns.points()) == [
+        (True, 0, 0, 0.0, 0.0, 0.5, 0.5, 1.25),
+        (False, 0, 1, 0.0, 0.5, 0.5, 1.0, -2.0),
+        (True, 1, 0, 0.5, 0.0, 1.0, 0.5, 3.5),
+    ]
+
+
+def test_blob_rejects_duplicate_positions() -> None:
+    builder = RawBlobBuilder()
+    builder.extend([_row(2, 3, 1.0), _row(2, 3, 2.0)])
+    with pytest.raises(DuplicateRawPointError):
+        list(builder.encode("zlib", 6))
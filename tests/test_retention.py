@@ -0,0 +1,17 @@
+"""Unit tests for partition retention date arithmetic."""
+
+from datetime import date
+
+from app.core.retention import _add_months, partition_name, retention_cutoff
+
+
+def test_retention_cutoff_keeps_whole_months() -> None:
+    assert retention_cutoff(date(2026, 3, 17), 0) is None
+    assert retention_cutoff(date(2026, 3, 17), 3) == date(2025, 12, 1)
+    assert retention_cutoff(date(2026, 1, 1), 1) == date(2025, 12, 1)
+
+
+def test_month_arithmetic_and_partition_names() -> None:
+    assert _add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert _add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+    assert partition_name(date(2026, 7, 1)) == "p202607"
@@ -9,6 +9,19 @@ def test_router_contains_expected_paths() -> None:
     paths = {route.path for route in router.routes if isinstance(route, APIRoute)}
     assert "/health" in paths
     assert "/measurement-results/" in paths
+    assert "/measurement-results/stream" in paths
+    assert "/measurement-results/columnar" in paths
+    assert "/measurement-results/batch" in paths
+    assert "/measurement-results/jobs/{job_id}" in paths
+    assert "/measurement-results/{file_id}/raw" in paths
+    assert "/measurement-results/overview" in paths
+    assert "/measurement-results/files" in paths
+    assert "/trends" in paths
+    assert "/measurement-results/{file_id}/items/{item_id}/grid" in paths
+    assert "/health/dimension-cache" in paths
+    assert "/health/locks" in paths
+    assert "/health/db-pool" in paths
+    assert "/metrics" in paths
 
 
 def test_routes_have_tags() -> None:
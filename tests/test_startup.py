@@ -0,0 +1,36 @@
+"""Tests for the start-up schema revision check."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.startup import SchemaRevisionError, check_schema_revision, expected_revisions
+
+
+def test_migrations_have_a_single_head() -> None:
+    assert len(expected_revisions()) == 1
+
+
+def test_revision_check_needs_the_head_revision() -> None:
+    async def scenario() -> None:
+        db_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        try:
+            with pytest.raises(SchemaRevisionError, match="alembic_version is missing"):
+                await check_schema_revision(db_engine)
+
+            async with db_engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+                await conn.execute(text("INSERT INTO alembic_version VALUES ('0000stale')"))
+            with pytest.raises(SchemaRevisionError, match="does not match"):
+                await check_schema_revision(db_engine)
+
+            (head,) = expected_revisions()
+            async with db_engine.begin() as conn:
+                await conn.execute(text("UPDATE alembic_version SET version_num = :head"), {"head": head})
+            assert await check_schema_revision(db_engine) == {head}
+        finally:
+            await db_engine.dispose()
+
+    asyncio.run(scenario())